@@ -0,0 +1,207 @@
+"""
+Бенчмарк накладных расходов декоратора @strict (Задача 1).
+
+Для каждого типового случая (короткие функции, именованные аргументы,
+много параметров, аннотации контейнеров) сравнивает время вызова
+функции без декоратора и с @strict в разных режимах и выводит
+накладные расходы в наносекундах на вызов. Результаты можно сохранить
+в JSON и сравнить с эталоном, а также задать абсолютный предел расходов,
+чтобы регрессия производительности декоратора не попала в production.
+
+Запуск:
+    python benchmark.py
+    python benchmark.py --json baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 1.5 --max-overhead 2000
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from solution import strict
+
+
+def _sum_two(a: int, b: int) -> int:
+    return a + b
+
+
+def _concat_strings(s1: str, s2: str) -> str:
+    return s1 + s2
+
+
+def _keyword_only(*, name: str, count: int, ratio: float) -> str:
+    return name
+
+
+def _many_params(a: int, b: int, c: int, d: int, e: int,
+                 f: str, g: str, h: float, i: float, j: bool) -> int:
+    return a
+
+
+def _containers(values: List[int], weights: Dict[str, float]) -> int:
+    return len(values)
+
+
+# Случаи: имя -> (функция без декоратора, позиционные и именованные аргументы)
+CASES = {
+    'sum_two': (_sum_two, (1, 2), {}),
+    'concat_strings': (_concat_strings, ("hello", "world"), {}),
+    'keyword_only': (_keyword_only, (), {'name': "x", 'count': 3, 'ratio': 0.5}),
+    'many_params': (_many_params, (1, 2, 3, 4, 5, "f", "g", 1.0, 2.0, True), {}),
+    'containers': (_containers, (list(range(100)), {str(i): float(i) for i in range(10)}), {}),
+}
+
+# Конфигурации декоратора: имя -> параметры strict
+CONFIGS = {
+    'off': {'mode': 'off'},
+    'full': {'mode': 'full'},
+    'sampled:100': {'mode': 'sampled', 'n': 100},
+    'first:1': {'mode': 'first', 'n': 1},
+    'exact': {'mode': 'full', 'exact': True},
+    'metrics': {'mode': 'full', 'metrics': True},
+}
+
+
+def time_calls(func: Callable, args: tuple, kwargs: dict, number: int, repeat: int = 5) -> float:
+    """
+    Замеряет время одного вызова как лучшее из repeat серий по number вызовов.
+
+    Returns:
+        Время одного вызова в наносекундах (с учетом накладных расходов цикла,
+        которые одинаковы для всех сравниваемых функций)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in itertools.repeat(None, number):
+            func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best / number * 1e9
+
+
+def run_benchmark(cases: List[str], configs: List[str], number: int = 100000,
+                  repeat: int = 5) -> List[Dict]:
+    """
+    Сравнивает вызовы без декоратора и с @strict для всех сочетаний.
+
+    Args:
+        cases: Имена случаев из CASES
+        configs: Имена конфигураций из CONFIGS
+        number: Количество вызовов в одной серии
+        repeat: Количество серий (берется лучшая)
+
+    Returns:
+        Список записей с полями case, config, plain_ns, strict_ns, overhead_ns
+    """
+    records = []
+    for case in cases:
+        func, args, kwargs = CASES[case]
+        plain_ns = time_calls(func, args, kwargs, number, repeat)
+        for config in configs:
+            decorated = strict(func, **CONFIGS[config])
+            if decorated(*args, **kwargs) != func(*args, **kwargs):
+                raise AssertionError(f"{case}/{config}: decorated result differs")
+            strict_ns = time_calls(decorated, args, kwargs, number, repeat)
+            records.append({
+                'case': case,
+                'config': config,
+                'plain_ns': plain_ns,
+                'strict_ns': strict_ns,
+                'overhead_ns': strict_ns - plain_ns,
+            })
+    return records
+
+
+def find_regressions(records: List[Dict], baseline: Optional[List[Dict]] = None,
+                     tolerance: float = 1.5, noise_ns: float = 50.0,
+                     max_overhead_ns: Optional[float] = None) -> List[str]:
+    """
+    Ищет превышения накладных расходов.
+
+    Args:
+        records: Текущие результаты run_benchmark
+        baseline: Эталонные результаты run_benchmark (None - не сравнивать)
+        tolerance: Допустимое отношение текущих расходов к эталонным
+        noise_ns: Абсолютный допуск на шум измерений, нс
+        max_overhead_ns: Абсолютный предел расходов на вызов, нс (None - нет)
+
+    Returns:
+        Описания регрессий (пустой список, если регрессий нет)
+    """
+    expected = {(r['case'], r['config']): r for r in baseline or []}
+    regressions = []
+    for record in records:
+        name = f"{record['case']}/{record['config']}"
+        overhead = record['overhead_ns']
+        if max_overhead_ns is not None and overhead > max_overhead_ns:
+            regressions.append(f"{name}: {overhead:.0f} ns/call exceeds limit {max_overhead_ns:.0f} ns")
+            continue
+        reference = expected.get((record['case'], record['config']))
+        if reference is not None and overhead > reference['overhead_ns'] * tolerance + noise_ns:
+            regressions.append(
+                f"{name}: {overhead:.0f} ns/call vs baseline {reference['overhead_ns']:.0f} ns"
+            )
+    return regressions
+
+
+def print_report(records: List[Dict]) -> None:
+    """Выводит время вызова без декоратора, с @strict и их разницу для каждой конфигурации."""
+    print(f"{'case':<16} {'config':<12} {'plain, ns':>10} {'strict, ns':>11} {'overhead, ns':>13}")
+    for record in records:
+        print(f"{record['case']:<16} {record['config']:<12} {record['plain_ns']:>10.1f} "
+              f"{record['strict_ns']:>11.1f} {record['overhead_ns']:>13.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Замеряет накладные расходы @strict и сравнивает их с эталоном.
+
+    Returns:
+        1, если расходы какой-либо конфигурации выросли относительно
+        --baseline или превысили --max-overhead, иначе 0
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк накладных расходов @strict")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--configs', nargs='+', choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="сохранить расходы по случаям и конфигурациям в JSON")
+    parser.add_argument('--baseline', help="JSON с эталонными расходами (из --json)")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="допустимый рост расходов относительно эталона, раз")
+    parser.add_argument('--noise', type=float, default=50.0,
+                        help="абсолютный допуск на шум при сравнении с эталоном, нс")
+    parser.add_argument('--max-overhead', type=float,
+                        help="абсолютный предел накладных расходов на вызов, нс")
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.cases, args.configs, number=args.number, repeat=args.repeat)
+    print_report(records)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(records, file, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    if baseline is not None or args.max_overhead is not None:
+        regressions = find_regressions(records, baseline, args.tolerance, args.noise,
+                                       args.max_overhead)
+        if regressions:
+            print("\nНакладные расходы @strict выросли:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nНакладные расходы @strict в допустимых пределах")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,60 +5,1113 @@
 типам, объявленным в аннотациях функции.
 """
 
+import collections.abc
 import inspect
-from functools import wraps
+import itertools
+import logging
+import operator
+import os
+import time
+import types
+import typing
+from functools import partial, wraps
 
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для проверки массивов в validate_rows
+    np = None
 
-def strict(func):
+
+# Режимы проверки: off - без проверок (функция не оборачивается),
+# full - каждый вызов, sampled - каждый N-й вызов, first - первые N вызовов
+MODES = ('off', 'full', 'sampled', 'first')
+
+# Переменная окружения с режимом по умолчанию: off, full, sampled:N, first:N
+STRICT_MODE_ENV = 'STRICT_MODE'
+
+# Реакция на нарушение: raise - бросить TypeError, log - записать
+# предупреждение в лог и продолжить вызов (для постепенного включения)
+VIOLATION_ACTIONS = ('raise', 'log')
+
+logger = logging.getLogger(__name__)
+
+
+class _StrictSettings:
+    """Режим проверки и его параметр N."""
+    
+    __slots__ = ('mode', 'n')
+    
+    def __init__(self, mode='full', n=1):
+        if mode not in MODES:
+            raise ValueError(f"Unknown strict mode '{mode}', expected one of: {', '.join(MODES)}")
+        if n < 1:
+            raise ValueError(f"Strict mode parameter must be positive, got {n}")
+        self.mode = mode
+        self.n = n
+
+
+def _parse_mode(value):
     """
-    Декоратор для проверки соответствия типов аргументов функции их аннотациям.
+    Разбирает режим из строки вида 'full', 'sampled:100' или 'first:1000'.
+    
+    Returns:
+        Объект _StrictSettings
+        
+    Raises:
+        ValueError: При неизвестном режиме или некорректном N
+    """
+    mode, _, n = value.strip().lower().partition(':')
+    try:
+        return _StrictSettings(mode, int(n) if n else 1)
+    except ValueError as e:
+        raise ValueError(f"Invalid {STRICT_MODE_ENV} value '{value}': {e}") from None
+
+
+_settings = _parse_mode(os.environ.get(STRICT_MODE_ENV, 'full'))
+
+
+def set_strict_mode(mode, n=1):
+    """
+    Устанавливает глобальный режим проверки во время работы.
+    
+    Режим 'off' действует на функции, декорированные позже, - они
+    не оборачиваются вовсе; уже обернутые функции при 'off' пропускают
+    проверки. Остальные режимы сразу применяются ко всем функциям,
+    декорированным без явного mode.
     
     Args:
-        func: Декорируемая функция с аннотациями типов
+        mode: Один из MODES
+        n: Частота выборки для 'sampled' или количество вызовов для 'first'
+    """
+    new_settings = _StrictSettings(mode, n)
+    _settings.mode, _settings.n = new_settings.mode, new_settings.n
+
+
+def get_strict_mode():
+    """Возвращает текущий глобальный режим проверки в виде (mode, n)."""
+    return _settings.mode, _settings.n
+
+
+# Параметры компиляции проверок:
+#   max_items - сколько первых элементов контейнера проверять (None - все)
+#   max_depth - глубина проверки вложенных контейнеров (None - без ограничения)
+#   exact - сравнивать точный тип type(value) is T (bool не принимается за int)
+#   numeric_tower - принимать int для float и int/float для complex
+_ValidatorOptions = collections.namedtuple(
+    '_ValidatorOptions', ['max_items', 'max_depth', 'exact', 'numeric_tower']
+)
+_DEFAULT_OPTIONS = _ValidatorOptions(None, None, False, False)
+
+# Числовая башня PEP 484: какие типы дополнительно принимаются вместо данного
+_NUMERIC_TOWER = {float: (int,), complex: (int, float)}
+
+# Кэш скомпилированных проверок: (аннотация, параметры) -> функция
+_validator_cache = {}
+
+# Контейнеры, элементы которых можно проверить без изменения объекта
+# (итераторы и генераторы при проверке были бы израсходованы)
+_COLLECTION_ORIGINS = (
+    list, set, frozenset, collections.deque,
+    collections.abc.Collection, collections.abc.Sequence,
+    collections.abc.MutableSequence, collections.abc.Set,
+    collections.abc.MutableSet,
+)
+_MAPPING_ORIGINS = (
+    dict, collections.defaultdict, collections.OrderedDict,
+    collections.abc.Mapping, collections.abc.MutableMapping,
+)
+_UNION_TYPES = (typing.Union,) + ((types.UnionType,) if hasattr(types, 'UnionType') else ())
+
+
+def _type_name(annotation):
+    """Возвращает читаемое имя аннотации: int, List[int], Optional[str]."""
+    if isinstance(annotation, type) and not typing.get_args(annotation):
+        return annotation.__name__
+    return repr(annotation).replace('typing.', '')
+
+
+def _type_error(param_name, expected_type, value):
+    """Формирует исключение о несоответствии типа аргумента."""
+    return TypeError(
+        f"Argument '{param_name}' must be of type "
+        f"{_type_name(expected_type)}, got {type(value).__name__}"
+    )
+
+
+def _value_error(kind, expected_type, value):
+    """Формирует исключение о несоответствии типа результата или элемента."""
+    return TypeError(
+        f"{kind} must be of type {_type_name(expected_type)}, got {type(value).__name__}"
+    )
+
+
+def _accept_any(value):
+    """Проверка, которая принимает любое значение."""
+    return True
+
+
+def _instance_validator(cls):
+    """
+    Проверка isinstance(value, cls) в виде связанного метода метакласса.
+    
+    Метод type.__instancecheck__ вызывается напрямую, без промежуточной
+    функции на Python, поэтому проверка простого класса стоит как isinstance.
+    """
+    return type(cls).__instancecheck__.__get__(cls, type(cls))
+
+
+def _class_validator(cls, options):
+    """Проверка простого класса с учетом политик exact и numeric_tower."""
+    accepted = (cls,)
+    if options.numeric_tower:
+        accepted += _NUMERIC_TOWER.get(cls, ())
+    return _types_validator(accepted, options)
+
+
+def _exact_validator(accepted):
+    """
+    Проверка type(value) in accepted для политики exact.
+    
+    Множество допустимых типов сохраняется в атрибуте exact_types: по нему
+    проверки контейнеров сравнивают типы элементов целиком на уровне C
+    (frozenset.issuperset(map(type, ...))), без вызова функции на Python
+    для каждого элемента.
+    """
+    accepted = frozenset(accepted)
+    
+    def validate(value):
+        return type(value) in accepted
+    
+    validate.exact_types = accepted
+    return validate
+
+
+def _exact_items(validator):
+    """Возвращает frozenset.issuperset точных типов проверки или None."""
+    exact_types = getattr(validator, 'exact_types', None)
+    return None if exact_types is None else exact_types.issuperset
+
+
+def _types_validator(accepted, options):
+    """Проверка принадлежности значения одному из простых классов accepted."""
+    if options.exact:
+        return _exact_validator(accepted)
+    if len(accepted) == 1:
+        return _instance_validator(accepted[0])
+    return lambda value: isinstance(value, accepted)
+
+
+def _items_validator(container_type, item_validator, max_items):
+    """Проверка контейнера и не более max_items его элементов."""
+    exact_items = _exact_items(item_validator)
+    if exact_items is not None:
+        def validate_exact(value):
+            return (isinstance(value, container_type)
+                    and exact_items(map(type, itertools.islice(value, max_items))))
+        return validate_exact
+    
+    def validate(value):
+        return (isinstance(value, container_type)
+                and all(map(item_validator, itertools.islice(value, max_items))))
+    return validate
+
+
+def _build_validator(annotation, options):
+    """Строит функцию проверки значения для одной аннотации."""
+    if annotation is typing.Any or annotation is object or isinstance(annotation, (str, typing.TypeVar)):
+        # Неразрешенные строковые аннотации и TypeVar не проверяем
+        return _accept_any
+    if annotation is None or annotation is type(None):
+        return lambda value: value is None
+    
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    
+    if origin is None:
+        if isinstance(annotation, type):
+            return _class_validator(annotation, options)
+        return _accept_any
+    
+    if origin is typing.Annotated:
+        return _compile_validator(args[0], options)
+    
+    if origin in _UNION_TYPES:
+        if all(isinstance(arg, type) and not typing.get_args(arg) for arg in args):
+            accepted = args
+            if options.numeric_tower:
+                accepted += tuple(extra for arg in args for extra in _NUMERIC_TOWER.get(arg, ()))
+            return _types_validator(tuple(dict.fromkeys(accepted)), options)
+        validators = tuple(_compile_validator(arg, options) for arg in args)
+        return lambda value: any(validator(value) for validator in validators)
+    
+    if origin is typing.Literal:
+        # Сравниваем и тип, чтобы Literal[1] не принимал True
+        allowed = tuple((type(arg), arg) for arg in args)
+        return lambda value: (type(value), value) in allowed
+    
+    if origin is type:
+        bound = args[0] if args and isinstance(args[0], type) else object
+        return lambda value: isinstance(value, type) and issubclass(value, bound)
+    
+    if origin is collections.abc.Callable:
+        return callable
+    
+    if not isinstance(origin, type):
+        return _accept_any
+    
+    # Глубже max_depth проверяем только тип самого контейнера
+    if not args or options.max_depth == 0:
+        return _instance_validator(origin)
+    nested = options._replace(
+        max_depth=None if options.max_depth is None else options.max_depth - 1
+    )
+    max_items = options.max_items
+    
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _items_validator(tuple, _compile_validator(args[0], nested), max_items)
+        if args == ((),):
+            args = ()
+        validators = tuple(_compile_validator(arg, nested) for arg in args)
+        return lambda value: (
+            isinstance(value, tuple) and len(value) == len(validators)
+            and all(validator(item) for validator, item in zip(validators, value))
+        )
+    
+    if issubclass(origin, _MAPPING_ORIGINS) and len(args) == 2:
+        key_validator = _compile_validator(args[0], nested)
+        value_validator = _compile_validator(args[1], nested)
+        exact_keys, exact_values = _exact_items(key_validator), _exact_items(value_validator)
+        if exact_keys is not None and exact_values is not None:
+            return lambda value: (
+                isinstance(value, origin)
+                and exact_keys(map(type, itertools.islice(value.keys(), max_items)))
+                and exact_values(map(type, itertools.islice(value.values(), max_items)))
+            )
+        return lambda value: (
+            isinstance(value, origin)
+            and all(key_validator(key) and value_validator(item)
+                    for key, item in itertools.islice(value.items(), max_items))
+        )
+    
+    if issubclass(origin, _COLLECTION_ORIGINS) and len(args) == 1:
+        return _items_validator(origin, _compile_validator(args[0], nested), max_items)
+    
+    return _instance_validator(origin)
+
+
+def _compile_validator(annotation, options=_DEFAULT_OPTIONS):
+    """
+    Превращает аннотацию в функцию проверки значения value -> bool.
+    
+    Поддерживаются обычные классы, Any, None, Optional и Union (включая
+    X | Y), Literal, Annotated, Type, Callable, кортежи, списки, множества,
+    словари и их абстрактные аналоги из collections.abc. Результат
+    кэшируется, поэтому каждая аннотация компилируется один раз.
+    
+    Args:
+        annotation: Аннотация типа
+        options: Параметры компиляции (_ValidatorOptions)
         
     Returns:
-        Обертка функции с проверкой типов
+        Функция, возвращающая True, если значение соответствует аннотации
+    """
+    key = (annotation, options)
+    try:
+        return _validator_cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Нехэшируемая аннотация: компилируем без кэша
+        return _build_validator(annotation, options)
+    
+    validator = _build_validator(annotation, options)
+    _validator_cache[key] = validator
+    return validator
+
+
+def _get_annotations(func):
+    """Возвращает аннотации функции с разрешенными строковыми ссылками."""
+    try:
+        return typing.get_type_hints(func, include_extras=True)
+    except Exception:
+        # Ссылки на еще не определенные имена оставляем как есть
+        return dict(func.__annotations__)
+
+
+# Скомпилированные проверки вызова:
+#   positional - кортеж (позиция, имя, аннотация, проверка) для аннотированных
+#       позиционных параметров по возрастанию позиции
+#   positional_count - количество позиционных параметров (до *args)
+#   var_positional - (имя, аннотация, проверка) для элементов *args или None
+#   keyword - словарь имя -> (аннотация, проверка) для аннотированных
+#       параметров, которые можно передать по имени
+#   keyword_names - имена всех параметров, которые можно передать по имени
+#   var_keyword - (имя, аннотация, проверка) для значений **kwargs или None
+#   defaults - кортеж (имя, аннотация, проверка, значение по умолчанию)
+#   return_annotation - аннотация результата или None
+_CallChecks = collections.namedtuple('_CallChecks', [
+    'positional', 'positional_count', 'var_positional', 'keyword', 'keyword_names',
+    'var_keyword', 'defaults', 'return_annotation',
+])
+
+
+def _compile_checks(func, options=_DEFAULT_OPTIONS):
+    """
+    Разбирает сигнатуру и аннотации функции один раз при декорировании.
+    
+    Учитываются все виды параметров: только позиционные, обычные,
+    *args, только именованные и **kwargs. Аннотация *args и **kwargs
+    относится к каждому элементу, как в PEP 484.
+    
+    Args:
+        func: Функция с аннотациями типов
+        options: Параметры компиляции проверок (_ValidatorOptions)
         
-    Raises:
-        TypeError: При несоответствии типов аргументов аннотациям
+    Returns:
+        Объект _CallChecks
     """
+    annotations = _get_annotations(func)
+    positional = []
+    positional_count = 0
+    var_positional = var_keyword = None
+    keyword = {}
+    keyword_names = set()
+    defaults = []
     
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        # Получаем аннотации типов из функции
-        annotations = func.__annotations__
+    for name, parameter in inspect.signature(func).parameters.items():
+        kind = parameter.kind
+        check = None
+        if name in annotations:
+            check = (annotations[name], _compile_validator(annotations[name], options))
         
-        # Получаем сигнатуру функции для извлечения имен параметров
-        sig = inspect.signature(func)
-        param_names = list(sig.parameters.keys())
+        if kind is inspect.Parameter.VAR_POSITIONAL:
+            var_positional = check and (name,) + check
+            continue
+        if kind is inspect.Parameter.VAR_KEYWORD:
+            var_keyword = check and (name,) + check
+            continue
         
+        if kind is not inspect.Parameter.KEYWORD_ONLY:
+            if check is not None:
+                positional.append((positional_count, name) + check)
+            positional_count += 1
+        if kind is not inspect.Parameter.POSITIONAL_ONLY:
+            keyword_names.add(name)
+            if check is not None:
+                keyword[name] = check
+        # None по умолчанию считается неявным Optional
+        if (check is not None and parameter.default is not inspect.Parameter.empty
+                and parameter.default is not None):
+            defaults.append((name,) + check + (parameter.default,))
+    
+    return _CallChecks(tuple(positional), positional_count, var_positional, keyword,
+                       frozenset(keyword_names), var_keyword, tuple(defaults),
+                       annotations.get('return'))
+
+
+# Аннотации результата генераторов: тип -> позиции (элемент, результат) в аргументах
+_GENERATOR_RESULTS = {
+    collections.abc.Generator: (0, 2),
+    collections.abc.Iterator: (0, None),
+    collections.abc.Iterable: (0, None),
+    collections.abc.AsyncGenerator: (0, None),
+    collections.abc.AsyncIterator: (0, None),
+    collections.abc.AsyncIterable: (0, None),
+}
+
+
+def _generator_checks(return_annotation, options):
+    """
+    Разбирает аннотацию генератора вида Generator[Y, S, R] или Iterator[Y].
+    
+    Returns:
+        Кортеж (yield_check, return_check), где каждый элемент -
+        пара (аннотация, проверка) или None
+    """
+    positions = _GENERATOR_RESULTS.get(typing.get_origin(return_annotation))
+    args = typing.get_args(return_annotation)
+    if positions is None or not args:
+        return None, None
+    
+    checks = []
+    for position in positions:
+        if position is None or position >= len(args):
+            checks.append(None)
+        else:
+            annotation = args[position]
+            checks.append((annotation, _compile_validator(annotation, options)))
+    return tuple(checks)
+
+
+def _checked_generator(generator, yield_check, return_check, violation):
+    """
+    Оборачивает генератор, проверяя каждый элемент по мере выдачи.
+    
+    Значения send() и исключения throw() передаются исходному генератору,
+    поэтому поток не материализуется и поведение генератора сохраняется.
+    Нарушения передаются обработчику violation обертки.
+    """
+    try:
+        item = next(generator)
+        while True:
+            if yield_check is not None and not yield_check[1](item):
+                violation('yield', yield_check[0], item, "Yielded value")
+            try:
+                sent = yield item
+            except GeneratorExit:
+                generator.close()
+                raise
+            except BaseException as error:
+                item = generator.throw(error)
+            else:
+                item = generator.send(sent)
+    except StopIteration as stop:
+        result = stop.value
+    if return_check is not None and not return_check[1](result):
+        violation('return', return_check[0], result, "Return value")
+    return result
+
+
+async def _checked_async_generator(generator, yield_check, violation):
+    """Асинхронный аналог _checked_generator для async-генераторов."""
+    try:
+        item = await generator.__anext__()
+        while True:
+            if yield_check is not None and not yield_check[1](item):
+                violation('yield', yield_check[0], item, "Yielded value")
+            try:
+                sent = yield item
+            except GeneratorExit:
+                await generator.aclose()
+                raise
+            except BaseException as error:
+                item = await generator.athrow(error)
+            else:
+                item = await generator.asend(sent)
+    except StopAsyncIteration:
+        return
+
+
+class _FunctionMetrics:
+    """
+    Счетчики одной функции: проверенные и пропущенные вызовы, время
+    проверок и нарушения по (параметр, тип значения).
+    
+    Счетчики - обычные атрибуты без блокировок: под GIL возможна потеря
+    единичных инкрементов при гонке, что допустимо для метрик.
+    
+    Время проверок аргументов и результата замеряется не у каждого вызова,
+    а у каждого TIMING_SAMPLE-го проверенного, и умножается на TIMING_SAMPLE:
+    остальные вызовы стоят одного инкремента счетчика. Проверки элементов
+    генератора замеряются так же - у каждого TIMING_SAMPLE-го элемента.
+    """
+    
+    __slots__ = ('checked', 'skipped', 'nanoseconds', 'violations')
+    
+    TIMING_SAMPLE = 16
+    
+    def __init__(self):
+        self.checked = 0
+        self.skipped = 0
+        self.nanoseconds = 0
+        self.violations = collections.Counter()
+    
+    def add_sample(self, nanoseconds):
+        """Добавляет время проверок замеренного вызова с учетом выборки."""
+        self.nanoseconds += nanoseconds * self.TIMING_SAMPLE
+    
+    def timed(self, check):
+        """Оборачивает проверку элементов генератора, замеряя ее выборочно."""
+        perf_counter_ns = time.perf_counter_ns
+        counter = itertools.count()
+        timing_sample = self.TIMING_SAMPLE
+        
+        def timed_check(value):
+            if next(counter) % timing_sample:
+                return check(value)
+            started = perf_counter_ns()
+            result = check(value)
+            self.add_sample(perf_counter_ns() - started)
+            return result
+        
+        return timed_check
+
+
+# Метрики функций, декорированных с metrics=True: имя функции -> счетчики
+_metrics = {}
+
+
+def _register_metrics(func):
+    """Возвращает счетчики функции, общие для одноименных функций модуля."""
+    name = f"{func.__module__}.{func.__qualname__}"
+    return _metrics.setdefault(name, _FunctionMetrics())
+
+
+def get_strict_metrics():
+    """
+    Возвращает снимок метрик функций, декорированных с metrics=True.
+    
+    Returns:
+        Словарь имя функции -> {'calls': все вызовы, 'checked': проверенные
+        вызовы, 'violations': всего нарушений, 'check_seconds': оценка
+        суммарного времени проверок по выборке вызовов,
+        'violations_by_parameter': {параметр: {тип: число}}}.
+        Нарушения результата учитываются под параметром 'return',
+        элементов генератора - под 'yield'
+    """
+    snapshot = {}
+    for name, stats in _metrics.items():
+        by_parameter = {}
+        for (param_name, type_name), count in stats.violations.items():
+            by_parameter.setdefault(param_name, {})[type_name] = count
+        snapshot[name] = {
+            'calls': stats.checked + stats.skipped,
+            'checked': stats.checked,
+            'violations': sum(stats.violations.values()),
+            'check_seconds': stats.nanoseconds / 1e9,
+            'violations_by_parameter': by_parameter,
+        }
+    return snapshot
+
+
+def _prometheus_label(value):
+    """Экранирует значение метки в текстовом формате Prometheus."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export_prometheus_metrics():
+    """
+    Возвращает метрики в текстовом формате Prometheus (exposition format).
+    
+    Returns:
+        Строка со счетчиками strict_calls_total, strict_checked_calls_total,
+        strict_check_seconds_total (оценка по выборке, см. _FunctionMetrics)
+        и strict_violations_total
+    """
+    families = (
+        ('strict_calls_total', "Calls of @strict functions",
+         lambda stats: stats.checked + stats.skipped),
+        ('strict_checked_calls_total', "Calls of @strict functions with type checks",
+         lambda stats: stats.checked),
+        ('strict_check_seconds_total', "Time spent checking types, seconds (sampled estimate)",
+         lambda stats: stats.nanoseconds / 1e9),
+    )
+    lines = []
+    for metric, help_text, value in families:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, stats in _metrics.items():
+            lines.append(f'{metric}{{function="{_prometheus_label(name)}"}} {value(stats)}')
+    
+    lines.append("# HELP strict_violations_total Type violations by parameter and value type")
+    lines.append("# TYPE strict_violations_total counter")
+    for name, stats in _metrics.items():
+        for (param_name, type_name), count in stats.violations.items():
+            lines.append(
+                f'strict_violations_total{{function="{_prometheus_label(name)}",'
+                f'parameter="{_prometheus_label(param_name)}",'
+                f'type="{_prometheus_label(type_name)}"}} {count}'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def reset_strict_metrics():
+    """Обнуляет метрики всех функций, не отключая их сбор."""
+    for stats in _metrics.values():
+        stats.__init__()
+
+
+# Состояние вызова, которое before_call обертки передает check_result
+_SKIPPED, _CHECKED, _TIMED = 'skipped', 'checked', 'timed'
+
+
+def _wrap_function(func, settings, options, metrics=False, on_violation='raise'):
+    """
+    Строит обертку с проверкой типов для одной функции.
+    
+    Если у функции нет аннотаций, возвращается сама функция. Решение о
+    проверке вызова, проверка аргументов и результата общие для обычных,
+    async и генераторных функций (before_call и check_result); без метрик
+    и с on_violation='raise' они не содержат лишних действий.
+    """
+    checks = _compile_checks(func, options)
+    positional_checks = checks.positional
+    positional_count = checks.positional_count
+    var_positional = checks.var_positional
+    keyword_checks = checks.keyword
+    keyword_names = checks.keyword_names
+    var_keyword = checks.var_keyword
+    return_annotation = checks.return_annotation
+    if (not positional_checks and not keyword_checks and var_positional is None
+            and var_keyword is None and return_annotation is None):
+        return func
+    
+    call_counter = itertools.count()
+    stats = _register_metrics(func) if metrics else None
+    
+    def should_check():
+        """Решает, проверять ли текущий вызов в режимах sampled и first."""
+        if settings.mode == 'sampled':
+            checked = next(call_counter) % settings.n == 0
+        else:
+            checked = settings.mode == 'first' and next(call_counter) < settings.n
+        if not checked and stats is not None:
+            stats.skipped += 1
+        return checked
+    
+    def violation(param_name, expected_type, value, kind=None):
+        """Учитывает нарушение и бросает TypeError или пишет его в лог."""
+        if kind is None:
+            error = _type_error(param_name, expected_type, value)
+        else:
+            error = _value_error(kind, expected_type, value)
+        if stats is not None:
+            stats.violations[param_name, type(value).__name__] += 1
+        if on_violation == 'raise':
+            raise error
+        logger.warning("%s: %s", func.__qualname__, error)
+    
+    def check_arguments(args, kwargs):
+        """Проверяет аргументы вызова по скомпилированным проверкам."""
         # Проверяем позиционные аргументы
-        for i, arg in enumerate(args):
-            if i < len(param_names):
-                param_name = param_names[i]
-                if param_name in annotations:
-                    expected_type = annotations[param_name]
-                    if not isinstance(arg, expected_type):
-                        raise TypeError(
-                            f"Argument '{param_name}' must be of type "
-                            f"{expected_type.__name__}, got {type(arg).__name__}"
-                        )
-        
-        # Проверяем именованные аргументы
-        for param_name, arg in kwargs.items():
-            if param_name in annotations:
-                expected_type = annotations[param_name]
-                if not isinstance(arg, expected_type):
-                    raise TypeError(
-                        f"Argument '{param_name}' must be of type "
-                        f"{expected_type.__name__}, got {type(arg).__name__}"
-                    )
-        
-        return func(*args, **kwargs)
+        arg_count = len(args)
+        for index, param_name, expected_type, validator in positional_checks:
+            if index >= arg_count:
+                break
+            arg = args[index]
+            # Совпадение точного типа с аннотацией-классом проверять не нужно
+            if type(arg) is not expected_type and not validator(arg):
+                violation(param_name, expected_type, arg)
+        
+        # Проверяем элементы *args
+        if var_positional is not None and arg_count > positional_count:
+            param_name, expected_type, validator = var_positional
+            for arg in itertools.islice(args, positional_count, None):
+                if type(arg) is not expected_type and not validator(arg):
+                    violation(param_name, expected_type, arg)
+        
+        # Проверяем именованные аргументы; лишние имена относятся к **kwargs
+        if kwargs:
+            for param_name, arg in kwargs.items():
+                check = keyword_checks.get(param_name)
+                if check is None:
+                    if var_keyword is None or param_name in keyword_names:
+                        continue
+                    check = var_keyword[1:]
+                if type(arg) is not check[0] and not check[1](arg):
+                    violation(param_name, check[0], arg)
+    
+    # Значения по умолчанию проверяем один раз, при декорировании
+    for param_name, expected_type, validator, default in checks.defaults:
+        if not validator(default):
+            violation(param_name, expected_type, default,
+                      f"Default value of argument '{param_name}'")
+    
+    return_validator = None
+    if return_annotation is not None:
+        return_validator = _compile_validator(return_annotation, options)
+    
+    perf_counter_ns = time.perf_counter_ns
+    timing_sample = _FunctionMetrics.TIMING_SAMPLE
+    
+    def before_call(args, kwargs):
+        """
+        Решает, проверять ли вызов, и проверяет его аргументы.
+        
+        Returns:
+            _SKIPPED, _CHECKED или _TIMED - время проверок этого вызова
+            замеряется для метрик (см. _FunctionMetrics)
+        """
+        if settings.mode != 'full' and not should_check():
+            return _SKIPPED
+        if stats is not None:
+            stats.checked += 1
+            if stats.checked % timing_sample == 1:
+                started = perf_counter_ns()
+                check_arguments(args, kwargs)
+                stats.add_sample(perf_counter_ns() - started)
+                return _TIMED
+        check_arguments(args, kwargs)
+        return _CHECKED
+    
+    def check_result(result, state):
+        """Проверяет результат вызова, аргументы которого проверил before_call."""
+        if state is _TIMED:
+            started = perf_counter_ns()
+        # Как и для аргументов, точное совпадение типа с классом не проверяем
+        valid = type(result) is return_annotation or return_validator(result)
+        if state is _TIMED:
+            stats.add_sample(perf_counter_ns() - started)
+        if not valid:
+            violation('return', return_annotation, result, "Return value")
+        return result
+    
+    if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        yield_check, generator_return_check = _generator_checks(return_annotation, options)
+        if stats is not None:
+            yield_check, generator_return_check = (
+                check and (check[0], stats.timed(check[1]))
+                for check in (yield_check, generator_return_check)
+            )
+        is_async = inspect.isasyncgenfunction(func)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if before_call(args, kwargs) is _SKIPPED:
+                return func(*args, **kwargs)
+            if is_async:
+                return _checked_async_generator(func(*args, **kwargs), yield_check, violation)
+            return _checked_generator(func(*args, **kwargs), yield_check,
+                                      generator_return_check, violation)
+    
+    elif inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            state = before_call(args, kwargs)
+            result = await func(*args, **kwargs)
+            if state is _SKIPPED or return_validator is None:
+                return result
+            return check_result(result, state)
+    
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            state = before_call(args, kwargs)
+            result = func(*args, **kwargs)
+            if state is _SKIPPED or return_validator is None:
+                return result
+            return check_result(result, state)
+    
+    wrapper.__strict__ = True
+    wrapper.__strict_checks__ = checks
+    return wrapper
+
+
+# Общая статистика декорирования: количество функций и затраченное время
+_decoration_stats = {'functions': 0, 'seconds': 0.0}
+
+
+def get_decoration_stats():
+    """
+    Возвращает суммарную статистику декорирования @strict с момента импорта.
+    
+    Returns:
+        Словарь с ключами functions (сколько функций обернуто), seconds
+        (сколько времени заняла компиляция проверок) и validators
+        (размер общего кэша скомпилированных проверок типов)
+    """
+    return dict(_decoration_stats, validators=len(_validator_cache))
+
+
+def _strict_class(cls, **options):
+    """
+    Применяет @strict ко всем методам класса, включая staticmethod,
+    classmethod и методы доступа свойств. Параметры self и cls
+    не аннотированы и поэтому не проверяются.
+    """
+    for name, member in list(vars(cls).items()):
+        if isinstance(member, staticmethod):
+            wrapped = staticmethod(strict(member.__func__, **options))
+        elif isinstance(member, classmethod):
+            wrapped = classmethod(strict(member.__func__, **options))
+        elif isinstance(member, property):
+            wrapped = property(
+                *(strict(accessor, **options) if accessor is not None else None
+                  for accessor in (member.fget, member.fset, member.fdel)),
+                doc=member.__doc__
+            )
+        elif inspect.isfunction(member):
+            wrapped = strict(member, **options)
+        else:
+            continue
+        setattr(cls, name, wrapped)
+    return cls
+
+
+def strict(func=None, *, mode=None, n=1, max_items=None, max_depth=None,
+           exact=False, numeric_tower=False, metrics=False, on_violation='raise'):
+    """
+    Декоратор для проверки соответствия типов аргументов функции их аннотациям.
+    
+    Сигнатура и аннотации разбираются один раз при декорировании, поэтому
+    на каждый вызов приходится только несколько проверок isinstance.
+    Кроме обычных классов поддерживаются аннотации typing (List[int],
+    Optional[str], dict[str, float], Literal и др.). Проверяется и результат:
+    для async def - значение после await, для генераторов - каждый
+    выданный элемент по мере итерации (Iterator[Y], Generator[Y, S, R]).
+    Аргументы сопоставляются с параметрами всех видов (только позиционные,
+    *args, только именованные, **kwargs) без Signature.bind на каждый вызов;
+    аннотированные значения по умолчанию проверяются при декорировании.
+    Используется как @strict или @strict(mode='sampled', n=100).
+    Примененный к классу, оборачивает все его методы.
+    
+    Args:
+        func: Декорируемая функция с аннотациями типов или класс
+        mode: Режим проверки этой функции (см. MODES); по умолчанию
+            используется глобальный режим (set_strict_mode, STRICT_MODE)
+        n: Параметр режима mode
+        max_items: Сколько первых элементов контейнеров проверять
+            (None - все); ограничивает время проверки больших списков
+        max_depth: Глубина проверки вложенных контейнеров (None - полная)
+        exact: Требовать точного совпадения типа (type(value) is T): bool
+            не принимается за int, подклассы не принимаются
+        numeric_tower: Принимать int вместо float и int/float вместо complex
+        metrics: Собирать метрики вызовов, нарушений и времени проверок
+            (см. get_strict_metrics, export_prometheus_metrics)
+        on_violation: Реакция на нарушение (см. VIOLATION_ACTIONS): 'raise'
+            бросает TypeError, 'log' пишет предупреждение в лог и
+            продолжает выполнение
+        
+    Returns:
+        Обертка функции с проверкой типов (в режиме 'off' - сама функция)
+        
+    Raises:
+        TypeError: При несоответствии типов аргументов или результата аннотациям
+        ValueError: При неизвестном значении on_violation
+    """
+    if on_violation not in VIOLATION_ACTIONS:
+        raise ValueError(
+            f"Unknown on_violation '{on_violation}', expected one of: {', '.join(VIOLATION_ACTIONS)}"
+        )
+    options = {'mode': mode, 'n': n, 'max_items': max_items, 'max_depth': max_depth,
+               'exact': exact, 'numeric_tower': numeric_tower,
+               'metrics': metrics, 'on_violation': on_violation}
+    if func is None:
+        return partial(strict, **options)
+    if inspect.isclass(func):
+        return _strict_class(func, **options)
     
+    settings = _settings if mode is None else _StrictSettings(mode, n)
+    if settings.mode == 'off' or getattr(func, '__strict__', False):
+        return func
+    
+    started = time.perf_counter()
+    wrapper = _wrap_function(
+        func, settings, _ValidatorOptions(max_items, max_depth, exact, numeric_tower),
+        metrics, on_violation
+    )
+    _decoration_stats['functions'] += 1
+    _decoration_stats['seconds'] += time.perf_counter() - started
     return wrapper
 
 
+def strict_module(module, **options):
+    """
+    Применяет @strict ко всем функциям и классам, определенным в модуле.
+    
+    Проверки всех функций компилируются за один проход с общим кэшем
+    проверок типов, поэтому одинаковые аннотации компилируются один раз.
+    Импортированные из других модулей объекты и уже обернутые функции
+    пропускаются.
+    
+    Args:
+        module: Объект модуля
+        **options: Параметры strict (mode, n, max_items, max_depth,
+            exact, numeric_tower, metrics, on_violation)
+        
+    Returns:
+        Отчет: количество обернутых функций (functions) и классов
+        (classes), время декорирования в секундах (seconds) и размер
+        общего кэша проверок (validators)
+    """
+    started = time.perf_counter()
+    functions = classes = 0
+    
+    for name, member in list(vars(module).items()):
+        if getattr(member, '__module__', None) != module.__name__:
+            continue
+        if inspect.isclass(member):
+            strict(member, **options)
+            classes += 1
+        elif inspect.isfunction(member) and not getattr(member, '__strict__', False):
+            wrapped = strict(member, **options)
+            if wrapped is not member:
+                setattr(module, name, wrapped)
+                functions += 1
+    
+    return {
+        'functions': functions,
+        'classes': classes,
+        'seconds': time.perf_counter() - started,
+        'validators': len(_validator_cache),
+    }
+
+
+def _row_violation(checks, args, kwargs):
+    """
+    Находит первое нарушение в одном наборе аргументов, не бросая исключений.
+    
+    Returns:
+        Тройка (имя параметра, аннотация, значение) или None
+    """
+    arg_count = len(args)
+    for index, param_name, expected_type, validator in checks.positional:
+        if index >= arg_count:
+            break
+        if not validator(args[index]):
+            return param_name, expected_type, args[index]
+    
+    if checks.var_positional is not None:
+        param_name, expected_type, validator = checks.var_positional
+        for arg in itertools.islice(args, checks.positional_count, None):
+            if not validator(arg):
+                return param_name, expected_type, arg
+    
+    for param_name, arg in kwargs.items():
+        check = checks.keyword.get(param_name)
+        if check is None:
+            if checks.var_keyword is None or param_name in checks.keyword_names:
+                continue
+            check = checks.var_keyword[1:]
+        if not check[1](arg):
+            return param_name, check[0], arg
+    return None
+
+
+def _is_type_only(annotation):
+    """Зависит ли результат проверки только от type(value) (простые классы и их Union)."""
+    if annotation is typing.Any or annotation is object:
+        return True
+    if isinstance(annotation, type):
+        return not typing.get_args(annotation)
+    if typing.get_origin(annotation) in _UNION_TYPES:
+        return all(_is_type_only(arg) for arg in typing.get_args(annotation))
+    return False
+
+
+def _column_failures(check, values, failures):
+    """
+    Проверяет столбец значений одного параметра и дополняет failures.
+    
+    Для аннотаций, зависящих только от типа, проверяется по одному значению
+    каждого встреченного типа, а строки ищутся только при наличии ошибок.
+    """
+    param_name, expected_type, validator = check
+    if _is_type_only(expected_type):
+        samples = dict(zip(map(type, values), values))
+        bad_types = {value_type for value_type, value in samples.items() if not validator(value)}
+        if not bad_types:
+            return
+        failed = map(bad_types.__contains__, map(type, values))
+    else:
+        failed = (not valid for valid in map(validator, values))
+    rows = itertools.compress(range(len(values)), failed)
+    
+    for index in rows:
+        if index not in failures:
+            failures[index] = str(_type_error(param_name, expected_type, values[index]))
+
+
+def _array_failures(check, column, failures):
+    """
+    Проверяет столбец массива numpy. Все элементы столбца с логическим или
+    числовым dtype превращаются (tolist) в значения одного типа Python,
+    поэтому для аннотаций, зависящих только от типа, достаточно одного элемента.
+    Остальные dtype (datetime64 и timedelta64, чьи элементы в зависимости
+    от единицы и NaT дают разные типы, строки, void и object) проверяются
+    по значениям.
+    """
+    if column.dtype.kind in 'biufc' and _is_type_only(check[1]):
+        sample = column[:1].tolist()
+        if sample and not check[2](sample[0]):
+            message = str(_type_error(check[0], check[1], sample[0]))
+            for index in range(len(column)):
+                failures.setdefault(index, message)
+        return
+    _column_failures(check, column.tolist(), failures)
+
+
+def _positional_column_checks(checks, width):
+    """Проверки столбцов 0..width-1 при передаче строки позиционно."""
+    by_index = {index: (name, annotation, validator)
+                for index, name, annotation, validator in checks.positional}
+    for index in range(width):
+        if index < checks.positional_count:
+            check = by_index.get(index)
+        else:
+            check = checks.var_positional
+        yield index, check
+
+
+def _keyword_column_check(checks, name):
+    """Проверка значения, переданного по имени name, или None."""
+    check = checks.keyword.get(name)
+    if check is not None:
+        return (name,) + check
+    if checks.var_keyword is not None and name not in checks.keyword_names:
+        return (name,) + checks.var_keyword[1:]
+    return None
+
+
+def validate_rows(func, rows, **options):
+    """
+    Проверяет пакет наборов аргументов функции за один проход, не бросая
+    исключений и не вызывая функцию.
+    
+    Строка - кортеж или список (позиционные аргументы) либо словарь
+    (именованные аргументы). Если все строки - кортежи или списки одной
+    длины, проверка идет по столбцам: для аннотаций из простых классов
+    проверяется по одному значению каждого типа в столбце. Двумерный
+    массив numpy проверяется по столбцам как позиционные аргументы,
+    структурированный массив - по именам полей; столбцы числовых и
+    строковых dtype проверяются за O(1), как значения после tolist().
+    Проверяются только типы, количество аргументов не проверяется.
+    
+    Args:
+        func: Функция с аннотациями или обертка @strict (используются
+            ее скомпилированные проверки)
+        rows: Итерируемый набор строк или массив numpy
+        **options: Параметры проверки strict (max_items, max_depth, exact,
+            numeric_tower); если заданы, проверки компилируются заново
+        
+    Returns:
+        Список пар (индекс строки, причина) по возрастанию индекса;
+        для каждой строки указывается первое нарушение
+        
+    Raises:
+        ValueError: При массиве numpy размерности, отличной от 2
+            (кроме структурированных массивов)
+    """
+    checks = getattr(func, '__strict_checks__', None)
+    if checks is None or options:
+        settings = dict(_DEFAULT_OPTIONS._asdict(), **options)
+        checks = _compile_checks(inspect.unwrap(func), _ValidatorOptions(**settings))
+    failures = {}
+    
+    if np is not None and isinstance(rows, np.ndarray):
+        if rows.dtype.names:
+            for name in rows.dtype.names:
+                check = _keyword_column_check(checks, name)
+                if check is not None:
+                    _array_failures(check, rows[name].reshape(-1), failures)
+        elif rows.ndim == 2:
+            for index, check in _positional_column_checks(checks, rows.shape[1]):
+                if check is not None:
+                    _array_failures(check, rows[:, index], failures)
+        else:
+            raise ValueError(f"Expected a 2-D or structured array, got {rows.ndim}-D array")
+        return sorted(failures.items())
+    
+    rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+    widths = set(map(len, rows)) if set(map(type, rows)) <= {tuple, list} else ()
+    if len(widths) == 1:
+        # Строки одинаковой длины: проверяем по столбцам
+        for index, check in _positional_column_checks(checks, widths.pop()):
+            if check is not None:
+                _column_failures(check, list(map(operator.itemgetter(index), rows)), failures)
+        return sorted(failures.items())
+    
+    for index, row in enumerate(rows):
+        if isinstance(row, dict):
+            violation = _row_violation(checks, (), row)
+        else:
+            violation = _row_violation(checks, row, {})
+        if violation is not None:
+            failures[index] = str(_type_error(*violation))
+    return sorted(failures.items())
+
+
 # Примеры использования
 @strict
 def sum_two(a: int, b: int) -> int:
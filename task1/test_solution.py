@@ -2,8 +2,19 @@
 Тесты для декоратора @strict (Задача 1).
 """
 
+import asyncio
+import logging
+import sys
+import types
 import pytest
-from solution import strict
+from typing import (Any, AsyncIterator, Dict, Generator, Iterator, List, Literal, Optional,
+                    Sequence, Tuple, Union)
+from unittest.mock import Mock, patch
+from benchmark import CASES, CONFIGS, find_regressions, run_benchmark
+from benchmark import main as benchmark_main
+from solution import (export_prometheus_metrics, get_decoration_stats, get_strict_metrics,
+                      get_strict_mode, np, reset_strict_metrics, set_strict_mode, strict,
+                      strict_module, validate_rows, _parse_mode)
 
 
 class TestStrictDecorator:
@@ -132,6 +143,853 @@ class TestStrictDecorator:
         
         with pytest.raises(TypeError):
             self.sum_two(1, b=2.5)
+    
+    def test_signature_inspected_once(self):
+        """Тест, что сигнатура разбирается только при декорировании."""
+        with patch('solution.inspect.signature', side_effect=AssertionError("called")):
+            assert self.sum_two(1, 2) == 3
+            assert self.sum_two(a=1, b=2) == 3
+            with pytest.raises(TypeError, match="must be of type int"):
+                self.sum_two(1, b="2")
+    
+    def test_unannotated_parameters(self):
+        """Тест, что параметры без аннотаций не проверяются."""
+        @strict
+        def partial_annotations(a, b: int, c):
+            return (a, b, c)
+        
+        assert partial_annotations("x", 2, 3.5) == ("x", 2, 3.5)
+        with pytest.raises(TypeError, match="Argument 'b'"):
+            partial_annotations("x", "2", 3.5)
+
+
+class TestStrictModes:
+    """Тесты режимов проверки @strict."""
+    
+    def teardown_method(self):
+        """Возвращает глобальный режим по умолчанию."""
+        set_strict_mode('full')
+    
+    def _count_failures(self, func, calls):
+        failures = 0
+        for _ in range(calls):
+            try:
+                func("1", 2)
+            except TypeError:
+                failures += 1
+        return failures
+    
+    def test_off_returns_original_function(self):
+        """Тест, что в режиме off функция не оборачивается."""
+        def sum_two(a: int, b: int) -> int:
+            return a + b
+        
+        assert strict(mode='off')(sum_two) is sum_two
+        
+        set_strict_mode('off')
+        assert strict(sum_two) is sum_two
+    
+    def test_sampled_mode(self):
+        """Тест проверки каждого N-го вызова."""
+        @strict(mode='sampled', n=10)
+        def pair(a: int, b: int) -> tuple:
+            return (a, b)
+        
+        assert self._count_failures(pair, 100) == 10
+    
+    def test_first_calls_mode(self):
+        """Тест проверки только первых N вызовов."""
+        @strict(mode='first', n=3)
+        def pair(a: int, b: int) -> tuple:
+            return (a, b)
+        
+        assert self._count_failures(pair, 10) == 3
+    
+    def test_runtime_switch(self):
+        """Тест переключения глобального режима во время работы."""
+        @strict
+        def sum_two(a: int, b: int) -> int:
+            return a + b
+        
+        set_strict_mode('off')
+        assert get_strict_mode() == ('off', 1)
+        assert sum_two("1", "2") == "12"
+        
+        set_strict_mode('full')
+        with pytest.raises(TypeError):
+            sum_two("1", "2")
+    
+    def test_parse_mode(self):
+        """Тест разбора значения переменной окружения STRICT_MODE."""
+        settings = _parse_mode('Sampled:100')
+        assert (settings.mode, settings.n) == ('sampled', 100)
+        assert _parse_mode('off').mode == 'off'
+        
+        with pytest.raises(ValueError, match="STRICT_MODE"):
+            _parse_mode('sometimes')
+        with pytest.raises(ValueError, match="STRICT_MODE"):
+            _parse_mode('first:0')
+
+
+class TestStrictGenerics:
+    """Тесты аннотаций typing в @strict."""
+    
+    def test_list_and_dict(self):
+        """Тест списков и словарей с параметрами."""
+        @strict
+        def total(values: List[int], weights: dict[str, float]) -> float:
+            return sum(values) * sum(weights.values())
+        
+        assert total([1, 2], {'a': 0.5}) == 1.5
+        with pytest.raises(TypeError, match=r"must be of type List\[int\], got list"):
+            total([1, "2"], {'a': 0.5})
+        with pytest.raises(TypeError, match=r"dict\[str, float\]"):
+            total([1, 2], {'a': 1})
+    
+    def test_optional_and_union(self):
+        """Тест Optional и Union."""
+        @strict
+        def describe(name: Optional[str], value: Union[int, str], extra: Optional[int] = None) -> str:
+            return f"{name}-{value}-{extra}"
+        
+        assert describe(None, 1) == "None-1-None"
+        assert describe("a", "b", 3) == "a-b-3"
+        with pytest.raises(TypeError, match="Argument 'name'"):
+            describe(1, 1)
+        with pytest.raises(TypeError, match="Argument 'value'"):
+            describe("a", 1.5)
+        with pytest.raises(TypeError, match="Argument 'extra'"):
+            describe("a", 1, "3")
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="X | Y появился в Python 3.10")
+    def test_pep604_union(self):
+        """Тест X | Y: аннотация вычисляется только при запуске теста."""
+        @strict
+        def describe(value: int | str, extra: int | None = None) -> str:
+            return f"{value}-{extra}"
+        
+        assert describe("a", 3) == "a-3"
+        with pytest.raises(TypeError, match="Argument 'value'"):
+            describe(1.5)
+        with pytest.raises(TypeError, match="Argument 'extra'"):
+            describe(1, "3")
+    
+    def test_literal_tuple_and_any(self):
+        """Тест Literal, кортежей и Any."""
+        @strict
+        def configure(level: Literal['low', 'high', 1], point: Tuple[int, str],
+                      rest: Tuple[float, ...], payload: Any) -> tuple:
+            return (level, point, rest, payload)
+        
+        assert configure('low', (1, 'a'), (1.0, 2.0), object())[0] == 'low'
+        assert configure(1, (1, 'a'), (), None)[0] == 1
+        with pytest.raises(TypeError, match="Argument 'level'"):
+            configure(True, (1, 'a'), (), None)
+        with pytest.raises(TypeError, match="Argument 'point'"):
+            configure('low', (1, 'a', 2), (), None)
+        with pytest.raises(TypeError, match="Argument 'rest'"):
+            configure('low', (1, 'a'), (1.0, 2), None)
+    
+    def test_nested_containers(self):
+        """Тест вложенных контейнеров и абстрактных типов."""
+        @strict
+        def flatten(rows: Sequence[List[int]]) -> list:
+            return [value for row in rows for value in row]
+        
+        assert flatten(([1], [2, 3])) == [1, 2, 3]
+        with pytest.raises(TypeError):
+            flatten([[1], [2, "3"]])
+    
+    def test_max_items_limits_checking(self):
+        """Тест проверки только первых K элементов большого списка."""
+        @strict(max_items=10)
+        def head(values: List[int]) -> int:
+            return values[0]
+        
+        assert head(list(range(1000)) + ["not checked"]) == 0
+        with pytest.raises(TypeError):
+            head([1, "2"] + list(range(1000)))
+    
+    def test_max_depth_limits_nesting(self):
+        """Тест ограничения глубины проверки вложенных контейнеров."""
+        @strict(max_depth=1)
+        def first_row(rows: List[List[int]]) -> list:
+            return rows[0]
+        
+        assert first_row([["not", "checked"]]) == ["not", "checked"]
+        with pytest.raises(TypeError):
+            first_row(["not a list"])
+
+
+class TestStrictReturnValues:
+    """Тесты проверки результата, async-функций и генераторов."""
+    
+    def test_return_value(self):
+        """Тест проверки возвращаемого значения."""
+        @strict
+        def parse(text: str) -> int:
+            return int(text) if text.isdigit() else text
+        
+        assert parse("42") == 42
+        with pytest.raises(TypeError, match="Return value must be of type int, got str"):
+            parse("abc")
+    
+    def test_async_function(self):
+        """Тест async-функции: аргументы и результат после await."""
+        @strict
+        async def fetch(count: int) -> List[int]:
+            await asyncio.sleep(0)
+            return list(range(count)) if count < 3 else ["many"]
+        
+        assert asyncio.iscoroutinefunction(fetch)
+        assert asyncio.run(fetch(2)) == [0, 1]
+        with pytest.raises(TypeError, match="Argument 'count'"):
+            asyncio.run(fetch("2"))
+        with pytest.raises(TypeError, match="Return value"):
+            asyncio.run(fetch(5))
+    
+    def test_generator_checked_lazily(self):
+        """Тест ленивой проверки элементов генератора."""
+        produced = []
+        
+        @strict
+        def numbers(limit: int) -> Iterator[int]:
+            for value in range(limit):
+                produced.append(value)
+                yield value
+            yield "end"
+        
+        stream = numbers(3)
+        assert next(stream) == 0
+        assert produced == [0]
+        assert next(stream) == 1
+        assert next(stream) == 2
+        with pytest.raises(TypeError, match="Yielded value must be of type int, got str"):
+            next(stream)
+        
+        with pytest.raises(TypeError, match="Argument 'limit'"):
+            numbers("3")
+    
+    def test_generator_send_and_return(self):
+        """Тест передачи send() и проверки результата генератора."""
+        @strict
+        def accumulate() -> Generator[int, int, str]:
+            total = 0
+            while total < 10:
+                total += yield total
+            return "done" if total < 100 else total
+        
+        stream = accumulate()
+        assert next(stream) == 0
+        assert stream.send(4) == 4
+        with pytest.raises(StopIteration) as stop:
+            stream.send(6)
+        assert stop.value.value == "done"
+        
+        stream = accumulate()
+        next(stream)
+        with pytest.raises(TypeError, match="Return value must be of type str"):
+            stream.send(500)
+    
+    def test_async_generator(self):
+        """Тест async-генератора."""
+        @strict
+        async def ticks(count: int) -> AsyncIterator[int]:
+            for value in range(count):
+                yield value
+            yield None
+        
+        async def collect():
+            items = []
+            async for item in ticks(2):
+                items.append(item)
+            return items
+        
+        with pytest.raises(TypeError, match="Yielded value"):
+            asyncio.run(collect())
+
+
+MODULE_SOURCE = """
+from typing import List
+
+
+def scale(values: List[int], factor: int) -> List[int]:
+    return [value * factor for value in values]
+
+
+def untyped(value):
+    return value
+
+
+class Counter:
+    def __init__(self, start: int):
+        self.value = start
+
+    def add(self, step: int) -> int:
+        self.value += step
+        return self.value
+"""
+
+
+class TestStrictClassesAndModules:
+    """Тесты применения @strict к классам и модулям."""
+    
+    def test_class_methods(self):
+        """Тест обычных, статических методов, методов класса и свойств."""
+        @strict
+        class Account:
+            def __init__(self, balance: int):
+                self._balance = balance
+            
+            def deposit(self, amount: int) -> int:
+                self._balance += amount
+                return self._balance
+            
+            @staticmethod
+            def validate(amount: int) -> bool:
+                return amount > 0
+            
+            @classmethod
+            def empty(cls, currency: str) -> "Account":
+                return cls(0)
+            
+            @property
+            def balance(self) -> int:
+                return self._balance
+            
+            @balance.setter
+            def balance(self, value: int):
+                self._balance = value
+        
+        account = Account(10)
+        assert account.deposit(5) == 15
+        assert Account.validate(1) is True
+        assert Account.empty("RUB").balance == 0
+        
+        with pytest.raises(TypeError, match="Argument 'balance'"):
+            Account("10")
+        with pytest.raises(TypeError, match="Argument 'amount'"):
+            account.deposit(1.5)
+        with pytest.raises(TypeError, match="Argument 'amount'"):
+            Account.validate("1")
+        with pytest.raises(TypeError, match="Argument 'currency'"):
+            Account.empty(1)
+        with pytest.raises(TypeError, match="Argument 'value'"):
+            account.balance = "20"
+    
+    def test_strict_module(self):
+        """Тест обертывания всех функций и классов модуля за один проход."""
+        module = types.ModuleType('strict_module_example')
+        sys.modules[module.__name__] = module
+        try:
+            exec(MODULE_SOURCE, module.__dict__)
+            untyped = module.untyped
+            
+            report = strict_module(module)
+            
+            assert report['functions'] == 1
+            assert report['classes'] == 1
+            assert report['seconds'] >= 0
+            assert module.untyped is untyped
+            assert module.scale([1, 2], 3) == [3, 6]
+            with pytest.raises(TypeError, match=r"List\[int\]"):
+                module.scale([1, "2"], 3)
+            with pytest.raises(TypeError, match="Argument 'step'"):
+                module.Counter(0).add("1")
+            
+            # Повторный вызов не оборачивает функции второй раз
+            assert strict_module(module)['functions'] == 0
+        finally:
+            del sys.modules[module.__name__]
+    
+    def test_decoration_stats(self):
+        """Тест суммарной статистики декорирования."""
+        before = get_decoration_stats()
+        
+        @strict
+        def identity(value: int) -> int:
+            return value
+        
+        after = get_decoration_stats()
+        assert after['functions'] == before['functions'] + 1
+        assert after['seconds'] >= before['seconds']
+        assert after['validators'] > 0
+
+
+class TestStrictTypePolicy:
+    """Тесты политики сопоставления типов (exact, numeric_tower)."""
+    
+    def test_default_accepts_subclasses(self):
+        """По умолчанию bool принимается за int, как и любой подкласс."""
+        @strict
+        def sum_two(a: int, b: int) -> int:
+            return a + b
+        
+        assert sum_two(True, False) == 1
+    
+    def test_exact_rejects_bool_and_subclasses(self):
+        """Тест режима exact: bool и подклассы int отклоняются."""
+        class MyInt(int):
+            pass
+        
+        @strict(exact=True)
+        def sum_two(a: int, b: int) -> int:
+            return a + b
+        
+        assert sum_two(1, 2) == 3
+        with pytest.raises(TypeError, match="Argument 'a'"):
+            sum_two(True, 2)
+        with pytest.raises(TypeError, match="Argument 'b'"):
+            sum_two(1, b=MyInt(2))
+    
+    def test_exact_nested_and_union(self):
+        """Режим exact применяется к элементам контейнеров и Union."""
+        @strict(exact=True)
+        def total(values: List[int], scale: Optional[int] = None) -> int:
+            return sum(values) * (scale or 1)
+        
+        assert total([1, 2], 2) == 6
+        assert total([1, 2], None) == 3
+        with pytest.raises(TypeError, match="Argument 'values'"):
+            total([1, True])
+        with pytest.raises(TypeError, match="Argument 'scale'"):
+            total([1], False)
+    
+    def test_exact_mapping_items_and_limits(self):
+        """Режим exact для ключей и значений словарей и с max_items."""
+        @strict(exact=True)
+        def weigh(weights: Dict[str, float]) -> Dict[str, float]:
+            return weights
+        
+        @strict(exact=True, max_items=2)
+        def first_two(values: List[int]) -> int:
+            return len(values)
+        
+        assert weigh({'a': 1.0}) == {'a': 1.0}
+        with pytest.raises(TypeError, match="Argument 'weights'"):
+            weigh({'a': 1})
+        with pytest.raises(TypeError, match="Argument 'weights'"):
+            weigh({b'a': 1.0})
+        assert first_two([1, 2, True]) == 3
+        with pytest.raises(TypeError, match="Argument 'values'"):
+            first_two([1, False])
+    
+    def test_numeric_tower(self):
+        """Тест numeric_tower: int принимается вместо float и complex."""
+        @strict
+        def half(x: float) -> float:
+            return x / 2
+        
+        @strict(numeric_tower=True)
+        def half_tower(x: float) -> float:
+            return x / 2
+        
+        @strict(numeric_tower=True)
+        def magnitude(z: complex, values: List[float]) -> float:
+            return abs(z) + sum(values)
+        
+        with pytest.raises(TypeError):
+            half(2)
+        assert half_tower(2) == 1.0
+        assert magnitude(3, [1, 2.5]) == 6.5
+        with pytest.raises(TypeError):
+            half_tower("2")
+    
+    def test_exact_with_numeric_tower(self):
+        """exact вместе с numeric_tower принимает int, но не bool."""
+        @strict(exact=True, numeric_tower=True)
+        def half(x: float) -> float:
+            return x / 2
+        
+        assert half(2) == 1.0
+        assert half(3.0) == 1.5
+        with pytest.raises(TypeError):
+            half(True)
+
+
+class TestStrictMetrics:
+    """Тесты метрик и режима on_violation='log'."""
+    
+    def teardown_method(self):
+        """Возвращает глобальный режим и обнуляет метрики."""
+        set_strict_mode('full')
+        reset_strict_metrics()
+    
+    @staticmethod
+    def _metrics_of(func):
+        """Метрики функции по ее полному имени."""
+        return get_strict_metrics()[f"{func.__module__}.{func.__qualname__}"]
+    
+    def test_calls_and_violations(self):
+        """Тест подсчета вызовов и нарушений по параметру и типу."""
+        @strict(metrics=True)
+        def sum_two(a: int, b: int) -> int:
+            return a + b
+        
+        sum_two(1, 2)
+        sum_two(3, b=4)
+        for args in (("1", 2), (1, "2"), (1, 2.5)):
+            with pytest.raises(TypeError):
+                sum_two(*args)
+        
+        metrics = self._metrics_of(sum_two)
+        assert metrics['calls'] == 5
+        assert metrics['checked'] == 5
+        assert metrics['violations'] == 3
+        assert metrics['check_seconds'] > 0
+        assert metrics['violations_by_parameter'] == {'a': {'str': 1},
+                                                      'b': {'str': 1, 'float': 1}}
+    
+    def test_timing_sampled_for_all_wrappers(self):
+        """Время проверок замеряется выборочно у обычных, async и генераторных функций."""
+        @strict(metrics=True)
+        def identity(value: int) -> int:
+            return value
+        
+        @strict(metrics=True)
+        async def async_identity(value: int) -> int:
+            return value
+        
+        @strict(metrics=True)
+        def repeat(value: int) -> Iterator[int]:
+            yield value
+        
+        for value in range(20):
+            assert identity(value) == value
+            assert asyncio.run(async_identity(value)) == value
+            assert list(repeat(value)) == [value]
+        
+        for func in (identity, async_identity, repeat):
+            metrics = self._metrics_of(func)
+            assert metrics['checked'] == 20
+            assert metrics['check_seconds'] > 0
+    
+    def test_yield_timing_sampled(self):
+        """Проверки элементов генератора замеряются выборочно, как и вызовы."""
+        clock = Mock(side_effect=range(0, 10 ** 6, 1000))
+        with patch('solution.time.perf_counter_ns', clock):
+            @strict(metrics=True)
+            def numbers(count: int) -> Iterator[int]:
+                yield from range(count)
+            
+            assert list(numbers(64)) == list(range(64))
+        
+        # Аргументы замеряются у первого вызова, элементы - у каждого 16-го
+        assert clock.call_count == 2 + 2 * 64 // 16
+        assert self._metrics_of(numbers)['check_seconds'] == 5 * 1000 * 16 / 1e9
+    
+    def test_skipped_calls_counted(self):
+        """В режиме sampled учитываются и непроверенные вызовы."""
+        @strict(mode='sampled', n=4, metrics=True)
+        def identity(value: int) -> int:
+            return value
+        
+        for value in range(8):
+            identity(value)
+        
+        metrics = self._metrics_of(identity)
+        assert metrics['calls'] == 8
+        assert metrics['checked'] == 2
+    
+    def test_without_metrics_not_registered(self):
+        """Функции без metrics=True в метриках не появляются."""
+        @strict
+        def identity(value: int) -> int:
+            return value
+        
+        identity(1)
+        assert not any(name.endswith('test_without_metrics_not_registered.<locals>.identity')
+                       for name in get_strict_metrics())
+    
+    def test_log_instead_of_raise(self, caplog):
+        """Тест режима on_violation='log': вызов выполняется, нарушение в логе."""
+        @strict(on_violation='log', metrics=True)
+        def double(value: int) -> int:
+            return value * 2
+        
+        with caplog.at_level(logging.WARNING, logger='solution'):
+            assert double("x") == "xx"
+        
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("Argument 'value' must be of type int, got str" in m for m in messages)
+        assert any("Return value must be of type int, got str" in m for m in messages)
+        assert self._metrics_of(double)['violations_by_parameter'] == {
+            'value': {'str': 1}, 'return': {'str': 1}
+        }
+    
+    def test_log_mode_generator(self, caplog):
+        """Нарушения элементов генератора в режиме log не прерывают итерацию."""
+        @strict(on_violation='log')
+        def numbers() -> Iterator[int]:
+            yield 1
+            yield "2"
+            yield 3
+        
+        with caplog.at_level(logging.WARNING, logger='solution'):
+            assert list(numbers()) == [1, "2", 3]
+        assert "Yielded value must be of type int, got str" in caplog.text
+    
+    def test_unknown_on_violation(self):
+        """Неизвестная реакция на нарушение отклоняется при декорировании."""
+        with pytest.raises(ValueError, match="on_violation"):
+            strict(on_violation='ignore')
+    
+    def test_prometheus_export(self):
+        """Тест текстового формата Prometheus."""
+        @strict(metrics=True)
+        def concat(s1: str, s2: str) -> str:
+            return s1 + s2
+        
+        concat("a", "b")
+        with pytest.raises(TypeError):
+            concat("a", 1)
+        
+        text = export_prometheus_metrics()
+        name = f"{concat.__module__}.{concat.__qualname__}"
+        assert "# TYPE strict_calls_total counter" in text
+        assert f'strict_calls_total{{function="{name}"}} 2' in text
+        assert (f'strict_violations_total{{function="{name}",parameter="s2",type="int"}} 1'
+                in text)
+        assert text.endswith("\n")
+
+
+class TestStrictBinding:
+    """Тесты сопоставления аргументов со всеми видами параметров."""
+    
+    def test_var_positional(self):
+        """Аннотация *args проверяется для каждого лишнего позиционного аргумента."""
+        @strict
+        def total(scale: float, *values: int) -> float:
+            return scale * sum(values)
+        
+        assert total(2.0) == 0
+        assert total(2.0, 1, 2, 3) == 12.0
+        with pytest.raises(TypeError, match="Argument 'values' must be of type int, got str"):
+            total(2.0, 1, "2")
+        with pytest.raises(TypeError, match="Argument 'scale'"):
+            total(1, 2)
+    
+    def test_var_keyword(self):
+        """Аннотация **kwargs проверяется для каждого лишнего именованного аргумента."""
+        @strict
+        def tag(name: str, **attrs: str) -> str:
+            return name + "".join(f" {k}={v}" for k, v in sorted(attrs.items()))
+        
+        assert tag("a", href="x") == "a href=x"
+        assert tag(name="a", id="1") == "a id=1"
+        with pytest.raises(TypeError, match="Argument 'width' must be of type str, got int"):
+            tag("img", width=10)
+        with pytest.raises(TypeError, match="Argument 'name'"):
+            tag(name=1)
+    
+    def test_keyword_only(self):
+        """Параметры после * проверяются только по имени."""
+        @strict
+        def connect(host: str, *args, port: int = 80, timeout: float) -> str:
+            return f"{host}:{port}"
+        
+        assert connect("h", "extra", 1, timeout=1.0) == "h:80"
+        with pytest.raises(TypeError, match="Argument 'port'"):
+            connect("h", port="80", timeout=1.0)
+        with pytest.raises(TypeError, match="Argument 'timeout'"):
+            connect("h", timeout="1")
+    
+    def test_positional_only(self):
+        """Имя параметра только для позиции, переданное по имени, уходит в **kwargs."""
+        @strict
+        def describe(value: int, /, **options: str) -> str:
+            return f"{value} {options}"
+        
+        assert describe(1, value="x") == "1 {'value': 'x'}"
+        with pytest.raises(TypeError, match="Argument 'value' must be of type str, got int"):
+            describe(1, value=2)
+        with pytest.raises(TypeError, match="Argument 'value' must be of type int"):
+            describe("1")
+    
+    def test_defaults_checked_at_decoration(self):
+        """Значения по умолчанию проверяются один раз, при декорировании."""
+        with pytest.raises(TypeError, match="Default value of argument 'retries' must be of type int, got str"):
+            @strict
+            def fetch(url: str, retries: int = "3") -> str:
+                return url
+        
+        # None по умолчанию допустим как неявный Optional
+        @strict
+        def fetch(url: str, timeout: float = None, retries: int = 3) -> str:
+            return url
+        
+        assert fetch("x") == "x"
+    
+    def test_default_violation_logged(self, caplog):
+        """В режиме log ошибка значения по умолчанию не мешает декорированию."""
+        with caplog.at_level(logging.WARNING, logger='solution'):
+            @strict(on_violation='log')
+            def scale(x: float, k: float = 1) -> float:
+                return x * k
+        
+        assert scale(2.0) == 2.0
+        assert "Default value of argument 'k'" in caplog.text
+    
+    @pytest.mark.skipif(np is None, reason="numpy не установлен")
+    def test_array_default(self):
+        """Значение по умолчанию с поэлементным == (массив numpy) не ломает декорирование."""
+        @strict
+        def norm(x: np.ndarray = np.zeros(3)) -> float:
+            return float(abs(x).sum())
+        
+        assert norm() == 0.0
+        assert norm(np.ones(2)) == 2.0
+        with pytest.raises(TypeError, match="Default value of argument 'x'"):
+            @strict
+            def broken(x: int = np.zeros(3)) -> int:
+                return 0
+
+
+class TestValidateRows:
+    """Тесты пакетной проверки наборов аргументов validate_rows."""
+    
+    def setup_method(self):
+        """Подготовка тестовой функции."""
+        @strict
+        def record(name: str, age: int, score: Optional[float] = None) -> str:
+            return name
+        
+        self.record = record
+    
+    def test_tuple_rows_column_path(self):
+        """Строки одной длины проверяются по столбцам без исключений."""
+        rows = [("a", 1, 0.5), ("b", "2", 1.0), ("c", 3, None), (4, 4, 1.5), ("e", 5, 1)]
+        assert validate_rows(self.record, rows) == [
+            (1, "Argument 'age' must be of type int, got str"),
+            (3, "Argument 'name' must be of type str, got int"),
+            (4, "Argument 'score' must be of type Optional[float], got int"),
+        ]
+    
+    def test_first_violation_per_row(self):
+        """Для строки указывается первое нарушение в порядке параметров."""
+        assert validate_rows(self.record, [(1, "x", "y")]) == [
+            (0, "Argument 'name' must be of type str, got int")
+        ]
+    
+    def test_mixed_rows(self):
+        """Словари, кортежи разной длины и генератор строк."""
+        rows = iter([{'name': "a", 'age': 1}, ("b", 2), {'name': "c", 'age': 3.0},
+                     ("d", 4, "high"), {'unknown': 1}])
+        assert validate_rows(self.record, rows) == [
+            (2, "Argument 'age' must be of type int, got float"),
+            (3, "Argument 'score' must be of type Optional[float], got str"),
+        ]
+    
+    def test_matches_wrapper_behaviour(self):
+        """Результат совпадает со строками, на которых обертка бросает TypeError."""
+        rows = [("a", 1), ("b", True), ("c", []), (None, 1), ("e", 2, [1.0])]
+        expected = []
+        for index, row in enumerate(rows):
+            try:
+                self.record(*row)
+            except TypeError as error:
+                expected.append((index, str(error)))
+        assert validate_rows(self.record, rows) == expected
+    
+    def test_plain_function_and_options(self):
+        """Недекорированная функция и параметры проверки strict."""
+        def add(a: int, b: int) -> int:
+            return a + b
+        
+        rows = [(1, 2), (True, 2)]
+        assert validate_rows(add, rows) == []
+        assert validate_rows(add, rows, exact=True) == [
+            (1, "Argument 'a' must be of type int, got bool")
+        ]
+        assert validate_rows(self.record, [("a", True)], exact=True)[0][0] == 0
+    
+    def test_variadic_and_generic_columns(self):
+        """Столбцы *args, **kwargs и аннотаций-контейнеров."""
+        def tag(values: List[int], *extra: str, **attrs: int) -> None:
+            pass
+        
+        rows = [([1, 2], "x"), ([1, "2"], "y"), ([3], 4)]
+        assert validate_rows(tag, rows) == [
+            (1, "Argument 'values' must be of type List[int], got list"),
+            (2, "Argument 'extra' must be of type str, got int"),
+        ]
+        assert validate_rows(tag, [{'values': [1], 'width': "1"}]) == [
+            (0, "Argument 'width' must be of type int, got str")
+        ]
+    
+    @pytest.mark.skipif(np is None, reason="numpy не установлен")
+    def test_numpy_arrays(self):
+        """Двумерные и структурированные массивы numpy проверяются по dtype."""
+        def add(a: int, b: float) -> float:
+            return a + b
+        
+        assert validate_rows(add, np.arange(6).reshape(3, 2)) == [
+            (index, "Argument 'b' must be of type float, got int") for index in range(3)
+        ]
+        assert validate_rows(add, np.ones((2, 2)))[0] == (
+            0, "Argument 'a' must be of type int, got float"
+        )
+        
+        objects = np.array([[1, 2.0], [1, "x"]], dtype=object)
+        assert validate_rows(add, objects) == [(1, "Argument 'b' must be of type float, got str")]
+        
+        structured = np.array([(1, 2.0), (3, 4.0)], dtype=[('b', 'f8'), ('a', 'i8')])
+        assert validate_rows(add, structured) == []
+        structured = np.array([(1.5, 2.0)], dtype=[('a', 'f8'), ('b', 'f8')])
+        assert validate_rows(add, structured) == [(0, "Argument 'a' must be of type int, got float")]
+        
+        with pytest.raises(ValueError, match="2-D"):
+            validate_rows(add, np.arange(3))
+    
+    @pytest.mark.skipif(np is None, reason="numpy не установлен")
+    def test_datetime64_columns(self):
+        """Столбцы datetime64 проверяются по значениям: NaT дает None."""
+        import datetime
+        
+        def log(day: datetime.date, stamp: int) -> None:
+            pass
+        
+        rows = np.array([('2020-01-01', '2020-01-01T00:00'), ('NaT', 'NaT')],
+                        dtype=[('day', 'datetime64[D]'), ('stamp', 'datetime64[ns]')])
+        assert validate_rows(log, rows) == [
+            (1, "Argument 'day' must be of type date, got NoneType")
+        ]
+        assert validate_rows(log, rows[:1]) == []
+
+
+class TestBenchmark:
+    """Тесты бенчмарка накладных расходов @strict."""
+    
+    def teardown_method(self):
+        """Обнуляет метрики, накопленные конфигурацией metrics."""
+        reset_strict_metrics()
+    
+    def test_run_benchmark_records(self):
+        """Все случаи и конфигурации дают записи с расходами на вызов."""
+        records = run_benchmark(list(CASES), list(CONFIGS), number=10, repeat=1)
+        assert len(records) == len(CASES) * len(CONFIGS)
+        for record in records:
+            assert record['overhead_ns'] == pytest.approx(record['strict_ns'] - record['plain_ns'])
+            assert record['plain_ns'] > 0
+    
+    def test_regression_detection(self):
+        """Тест обнаружения роста расходов и превышения абсолютного предела."""
+        records = [{'case': 'sum_two', 'config': 'full', 'plain_ns': 100.0,
+                    'strict_ns': 600.0, 'overhead_ns': 500.0}]
+        slower = [dict(records[0], strict_ns=1200.0, overhead_ns=1100.0)]
+        noisy = [dict(records[0], strict_ns=620.0, overhead_ns=520.0)]
+        
+        assert find_regressions(records, records) == []
+        assert find_regressions(noisy, records, tolerance=1.0, noise_ns=50) == []
+        assert len(find_regressions(slower, records, tolerance=1.5)) == 1
+        assert "exceeds limit" in find_regressions(records, max_overhead_ns=400)[0]
+    
+    def test_main_exit_code(self, capsys):
+        """Командная строка возвращает 1, если расходы превысили предел."""
+        argv = ['--cases', 'sum_two', '--configs', 'full', '--number', '10', '--repeat', '1']
+        assert benchmark_main(argv + ['--max-overhead', '-1']) == 1
+        assert "Накладные расходы @strict выросли" in capsys.readouterr().out
+        assert benchmark_main(argv + ['--max-overhead', '1e9']) == 0
 
 
 def run_manual_tests():
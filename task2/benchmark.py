@@ -0,0 +1,300 @@
+"""
+Микробенчмарк разбора страниц категории (Задача 2).
+
+Для каждой сохраненной страницы категории замеряет время разбора и
+пиковую память обоими способами из PARSERS (BeautifulSoup с html.parser
+и lxml) и проверяет, что они извлекают одинаковые названия статей и
+ссылку на следующую страницу. Пиковая память считается tracemalloc и
+включает только выделения Python: память дерева libxml2 в нее не входит.
+Без --pages страницы генерируются по seed: 200 статей и окружение,
+близкое по объему к настоящей странице Wikipedia.
+
+Сохранить настоящие страницы можно, например, так:
+    curl -o page1.html "https://ru.wikipedia.org/wiki/Категория:Животные_по_алфавиту"
+
+Запуск:
+    python benchmark.py
+    python benchmark.py --pages page1.html page2.html --repeat 10
+    python benchmark.py --json current.json --baseline baseline.json --tolerance 1.5
+    python benchmark.py --min-speedup 3
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from html import escape
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+from solution import PARSERS, WikipediaAnimalsParser
+
+
+CATEGORY = "Категория:Животные_по_алфавиту"
+ALPHABET = "АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ"
+SYLLABLES = ("ка", "ро", "ля", "ми", "ну", "шо", "ти", "зе", "гу", "ба", "да", "вей", "ок", "ан")
+
+
+def _random_title(rng: random.Random, letter: str) -> str:
+    words = [letter + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))]
+    for _ in range(rng.randint(0, 2)):
+        words.append("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return " ".join(words)
+
+
+def _links(rng: random.Random, count: int) -> str:
+    return "".join(
+        f'<li id="n-{i}"><a href="/wiki/{quote(title)}" title="{escape(title)}">'
+        f'<span>{escape(title)}</span></a></li>'
+        for i, title in enumerate(_random_title(rng, rng.choice(ALPHABET)) for _ in range(count))
+    )
+
+
+def generate_category_page(titles_count: int = 200, seed: int = 0) -> bytes:
+    """
+    Генерирует страницу категории в разметке MediaWiki.
+
+    Кроме блока #mw-pages со статьями, сгруппированными по буквам, и
+    ссылками навигации, страница содержит заголовок с таблицами стилей и
+    скриптами, боковое меню, подкатегории и подвал, как настоящая.
+
+    Args:
+        titles_count: Количество статей на странице
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        HTML страницы в UTF-8
+    """
+    rng = random.Random(seed)
+    titles = sorted(_random_title(rng, rng.choice(ALPHABET)) for _ in range(titles_count))
+
+    head = "".join(
+        f'<link rel="stylesheet" href="/w/load.php?lang=ru&amp;modules=skin.{i}&amp;only=styles">'
+        f'<script async src="/w/load.php?lang=ru&amp;modules=startup.{i}&amp;only=scripts"></script>'
+        for i in range(20)
+    )
+    config = json.dumps({f"wg{i}": _random_title(rng, "К") for i in range(200)}, ensure_ascii=False)
+
+    groups = {}
+    for title in titles:
+        groups.setdefault(title[0], []).append(title)
+    items = "".join(
+        f'<div class="mw-category-group"><h3>{letter}</h3><ul>'
+        + "".join(f'<li><a href="/wiki/{quote(title)}" title="{escape(title)}">{escape(title)}</a></li>'
+                  for title in group)
+        + '</ul></div>'
+        for letter, group in groups.items()
+    )
+    previous_href = f"/w/index.php?{urlencode({'title': CATEGORY, 'pageuntil': titles[0]})}#mw-pages"
+    next_href = f"/w/index.php?{urlencode({'title': CATEGORY, 'pagefrom': titles[-1]})}#mw-pages"
+    navigation = (f'(<a href="{escape(previous_href)}" title="{CATEGORY}">Предыдущая страница</a>) '
+                  f'(<a href="{escape(next_href)}" title="{CATEGORY}">Следующая страница</a>)')
+
+    body = (
+        '<!DOCTYPE html>\n<html class="client-nojs" lang="ru" dir="ltr"><head>'
+        f'<meta charset="UTF-8"><title>{CATEGORY} — Википедия</title>{head}'
+        f'<script>RLCONF={config};</script></head>'
+        '<body class="skin-vector mediawiki ltr ns-14 page-Категория_Животные_по_алфавиту">'
+        f'<div id="mw-panel"><nav><ul>{_links(rng, 150)}</ul></nav></div>'
+        '<div id="content" class="mw-body"><h1 id="firstHeading">Категория:Животные по алфавиту</h1>'
+        '<div id="bodyContent"><div id="mw-content-text" class="mw-body-content">'
+        '<div class="mw-parser-output"><p>Статьи о животных в алфавитном порядке.</p></div>'
+        f'<div id="mw-subcategories"><h2>Подкатегории</h2><ul>{_links(rng, 20)}</ul></div>'
+        '<div id="mw-pages"><h2>Страницы в категории «Животные по алфавиту»</h2>'
+        f'<p>Показано {titles_count} страниц из 47 312.</p>{navigation}'
+        f'<div lang="ru" dir="ltr" class="mw-content-ltr"><div class="mw-category">{items}</div></div>'
+        f'{navigation}</div></div>'
+        f'<div id="catlinks" class="catlinks"><ul>{_links(rng, 5)}</ul></div></div></div>'
+        f'<footer id="footer"><ul>{_links(rng, 40)}</ul></footer></body></html>'
+    )
+    return body.encode('utf-8')
+
+
+def load_pages(paths: List[str]) -> Dict[str, bytes]:
+    """Читает сохраненные страницы: имя файла -> HTML."""
+    pages = {}
+    for path in paths:
+        with open(path, 'rb') as file:
+            pages[os.path.basename(path)] = file.read()
+    return pages
+
+
+def parse_cost(parse: Callable[[bytes], object], content: bytes,
+               repeat: int = 5) -> Dict[str, float]:
+    """
+    Оценивает стоимость разбора одной страницы.
+
+    Время - лучший из repeat разборов (первые разборы прогревают кэши
+    регулярных выражений и парсеров). Пиковая память - объем объектов
+    Python, созданных за один разбор: для bs4 это все дерево страницы,
+    для lxml - только прокси-элементы и извлеченные строки.
+
+    Args:
+        parse: Функция разбора HTML страницы
+        content: HTML страницы
+        repeat: Количество разборов для замера времени
+
+    Returns:
+        Словарь с ключами seconds и peak_bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(content)
+        timings.append(time.perf_counter() - started)
+
+    # tracemalloc отслеживает каждый узел дерева bs4 и искажает время
+    # разбора в разы, поэтому память снимаем отдельным разбором
+    tracemalloc.start()
+    try:
+        parse(content)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_bytes': peak}
+
+
+def run_benchmark(pages: Dict[str, bytes], parsers: List[str], repeat: int = 5) -> List[Dict]:
+    """
+    Разбирает каждую страницу каждым способом.
+
+    Args:
+        pages: Страницы: имя -> HTML
+        parsers: Способы разбора из PARSERS
+        repeat: Количество замеров времени
+
+    Returns:
+        Список записей с полями page, parser, titles, seconds, peak_bytes
+
+    Raises:
+        AssertionError: Если способы разбора дали разные результаты
+    """
+    instances = {name: WikipediaAnimalsParser(html_parser=name) for name in parsers}
+    records = []
+    for page, content in pages.items():
+        reference = None
+        for name in parsers:
+            parse = instances[name]._parse_page
+            result = parse(content)
+            if reference is None:
+                reference = result
+            elif result != reference:
+                raise AssertionError(f"{page}: {name} result differs from {parsers[0]}")
+            record = {'page': page, 'parser': name, 'titles': len(result[0])}
+            record.update(parse_cost(parse, content, repeat=repeat))
+            records.append(record)
+    return records
+
+
+def find_regressions(records: List[Dict], baseline: Optional[List[Dict]] = None,
+                     tolerance: float = 1.5, min_speedup: Optional[float] = None) -> List[str]:
+    """
+    Проверяет, что разбор не замедлился и быстрый путь остался быстрым.
+
+    Args:
+        records: Текущие результаты run_benchmark
+        baseline: Эталонные результаты run_benchmark (None - не сравнивать)
+        tolerance: Допустимое отношение времени разбора страницы к эталонному
+        min_speedup: Минимальное ускорение lxml относительно bs4 на каждой
+            странице (None - не проверять)
+
+    Returns:
+        Описания регрессий (пустой список, если регрессий нет)
+    """
+    regressions = []
+    previous = {(r['page'], r['parser']): r for r in baseline or []}
+    for record in records:
+        name = f"{record['page']} ({record['parser']})"
+        reference = previous.get((record['page'], record['parser']))
+        if reference is None:
+            continue
+        if record['titles'] != reference['titles']:
+            regressions.append(f"{name}: {record['titles']} titles, "
+                               f"baseline found {reference['titles']}")
+        elif record['seconds'] > reference['seconds'] * tolerance:
+            regressions.append(f"{name}: parse took {record['seconds'] * 1000:.2f} ms, "
+                               f"baseline {reference['seconds'] * 1000:.2f} ms")
+
+    if min_speedup is not None:
+        by_page = {}
+        for record in records:
+            by_page.setdefault(record['page'], {})[record['parser']] = record['seconds']
+        for page, seconds in by_page.items():
+            if 'bs4' in seconds and 'lxml' in seconds:
+                speedup = seconds['bs4'] / seconds['lxml']
+                if speedup < min_speedup:
+                    regressions.append(f"{page}: lxml is only {speedup:.1f}x faster than bs4, "
+                                       f"expected at least {min_speedup:.1f}x")
+    return regressions
+
+
+def print_report(records: List[Dict]) -> None:
+    """Выводит по страницам число статей, время и память разбора и ускорение способов."""
+    print(f"{'page':<20} {'parser':<6} {'titles':>7} {'time, ms':>10} {'peak, KiB':>10} {'speedup':>8}")
+    reference = {}
+    for record in records:
+        base = reference.setdefault(record['page'], record['seconds'])
+        print(f"{record['page']:<20} {record['parser']:<6} {record['titles']:>7} "
+              f"{record['seconds'] * 1000:>10.3f} {record['peak_bytes'] / 1024:>10.1f} "
+              f"{base / record['seconds']:>7.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Разбирает страницы категории всеми способами и проверяет разбор.
+
+    Returns:
+        1, если разбор страницы замедлился или нашел другое число статей
+        относительно --baseline либо lxml быстрее bs4 меньше чем в
+        --min-speedup раз, иначе 0
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк разбора страниц категории")
+    parser.add_argument('--pages', nargs='+', help="сохраненные HTML страницы категории")
+    parser.add_argument('--generate', type=int, default=3,
+                        help="количество генерируемых страниц, если --pages не задан")
+    parser.add_argument('--parsers', nargs='+', choices=PARSERS, default=list(PARSERS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="сохранить замеры разбора страниц в JSON")
+    parser.add_argument('--baseline', help="JSON с эталонными замерами разбора (из --json)")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="допустимое замедление разбора страницы относительно эталона, раз")
+    parser.add_argument('--min-speedup', type=float,
+                        help="минимальное ускорение lxml относительно bs4 на каждой странице")
+    args = parser.parse_args(argv)
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = {f"generated-{seed}": generate_category_page(seed=seed)
+                 for seed in range(args.generate)}
+
+    records = run_benchmark(pages, args.parsers, repeat=args.repeat)
+    print_report(records)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(records, file, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    if baseline is not None or args.min_speedup is not None:
+        regressions = find_regressions(records, baseline, args.tolerance, args.min_speedup)
+        if regressions:
+            print("\nРазбор страниц категории ухудшился:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nРазбор страниц категории прошел проверки")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
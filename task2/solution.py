@@ -5,23 +5,306 @@
 и подсчитывает количество на каждую букву русского алфавита.
 """
 
+import argparse
+import asyncio
+import json
+import os
+import random
 import requests
+import sqlite3
+import tempfile
 from bs4 import BeautifulSoup
 import csv
 import re
-from urllib.parse import urljoin
+from urllib.parse import urlencode, urljoin
 import time
 import sys
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp нужен только для асинхронного режима
+    aiohttp = None
+
+try:
+    import lxml.html
+except ImportError:  # lxml нужен только для быстрого разбора страниц
+    lxml = None
+
+
+# Способы получения списка статей категории:
+#   html - разбор страниц категории (200 ссылок на страницу)
+#   api - MediaWiki API list=categorymembers (до 500 названий на запрос, JSON)
+BACKENDS = ('html', 'api')
+
+# Разбор HTML страниц категории:
+#   bs4 - BeautifulSoup с html.parser (строит полное дерево на Python)
+#   lxml - XPath по дереву libxml2, только ссылки #mw-pages за один проход
+PARSERS = ('bs4', 'lxml')
+
+# Постоянные параметры запроса list=categorymembers; cmtype=page соответствует
+# блоку #mw-pages страницы категории (без подкатегорий и файлов), а
+# sortkeyprefix нужен асинхронному обходу для границ диапазонов букв
+API_PARAMS = {
+    'action': 'query',
+    'list': 'categorymembers',
+    'cmtype': 'page',
+    'cmprop': 'title|sortkeyprefix',
+    'cmlimit': 'max',
+    'format': 'json',
+    'formatversion': '2',
+}
+
+# Коды ответа, при которых запрос повторяется: перегрузка и временные сбои
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Версия формата файла контрольной точки
+CHECKPOINT_VERSION = 1
+
+# Ссылки навигации по страницам категории («Предыдущая/Следующая страница»)
+# внутри #mw-pages, которые не являются статьями
+NAVIGATION_LINK = re.compile(r'[?&](pagefrom|pageuntil)=')
+
+# Тексты ссылки на следующую страницу категории в порядке приоритета
+NEXT_PAGE_PATTERNS = (r'следующие \d+', r'следующая страница', r'далее')
+NEXT_PAGE_TEXT = re.compile('|'.join(NEXT_PAGE_PATTERNS), re.IGNORECASE)
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов «ведро токенов» для asyncio.
+    
+    Токены пополняются со скоростью rate в секунду до capacity; каждый
+    запрос забирает один токен, а при пустом ведре ждет его появления.
+    Ожидающие обслуживаются по очереди, поэтому ограничение общее для
+    всех задач, использующих один объект.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Допустимое количество запросов в секунду
+            capacity: Максимальное количество запросов подряд без ожидания
+            
+        Raises:
+            ValueError: При неположительных rate или capacity
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = None
+    
+    async def acquire(self) -> None:
+        """Ждет, пока в ведре появится токен, и забирает его."""
+        if self._lock is None:
+            # Блокировку создаем внутри цикла событий (важно для Python 3.9)
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ResponseCache:
+    """
+    Дисковый кэш HTTP ответов в SQLite с условными запросами.
+    
+    Для каждого URL хранится тело ответа и его валидаторы ETag и
+    Last-Modified. Перед запросом кэш дает заголовки If-None-Match и
+    If-Modified-Since; если сервер ответил 304, тело берется с диска.
+    Ответы без валидаторов не сохраняются. Суммарный размер тел
+    ограничен max_bytes: при превышении вытесняются записи, к которым
+    дольше всего не обращались.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Args:
+            path: Путь к файлу базы SQLite
+            max_bytes: Максимальный суммарный размер сохраненных тел, байты
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "content BLOB NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+        # Порядковый номер обращения для вытеснения давно не использованных записей
+        last_access = self.connection.execute("SELECT MAX(accessed) FROM responses").fetchone()[0]
+        self._access_counter = (last_access or 0) + 1
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'bytes_saved': 0, 'evicted': 0}
+    
+    def _next_access(self) -> int:
+        access = self._access_counter
+        self._access_counter += 1
+        return access
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Возвращает заголовки условного запроса для URL.
+        
+        Args:
+            url: URL запроса
+            
+        Returns:
+            If-None-Match и/или If-Modified-Since, если ответ есть в кэше
+        """
+        self.stats['requests'] += 1
+        row = self.connection.execute(
+            "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        headers = {}
+        if row is not None:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def revalidated(self, url: str) -> Optional[bytes]:
+        """
+        Возвращает сохраненное тело после ответа 304 Not Modified.
+        
+        Args:
+            url: URL запроса
+            
+        Returns:
+            Тело ответа или None, если запись успела быть вытеснена
+        """
+        row = self.connection.execute(
+            "SELECT content FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute(
+            "UPDATE responses SET accessed = ? WHERE url = ?", (self._next_access(), url)
+        )
+        self.connection.commit()
+        self.stats['hits'] += 1
+        self.stats['bytes_saved'] += len(row[0])
+        return row[0]
+    
+    def store(self, url: str, headers, content: bytes) -> None:
+        """
+        Сохраняет полный ответ (200) вместе с валидаторами и вытесняет
+        старые записи, если превышен max_bytes.
+        
+        Args:
+            url: URL запроса
+            headers: Заголовки ответа (ETag, Last-Modified)
+            content: Тело ответа
+        """
+        self.stats['misses'] += 1
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not (etag or last_modified) or len(content) > self.max_bytes:
+            return
+        
+        self.connection.execute(
+            "INSERT OR REPLACE INTO responses (url, etag, last_modified, content, size, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, content, len(content), self._next_access()),
+        )
+        self._evict()
+        self.connection.commit()
+    
+    def _evict(self) -> None:
+        """Удаляет давно не использованные записи, пока размер больше max_bytes."""
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute(
+            "SELECT url, size FROM responses ORDER BY accessed"
+        ).fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            self.stats['evicted'] += 1
+    
+    def size(self) -> int:
+        """Суммарный размер сохраненных тел, байты."""
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def report(self) -> Dict[str, float]:
+        """
+        Возвращает статистику кэша за время работы.
+        
+        Returns:
+            Словарь с ключами requests, hits (ответы 304), misses (полные
+            ответы), hit_rate, bytes_saved, evicted и size (текущий размер)
+        """
+        requests_count = self.stats['requests']
+        return dict(self.stats,
+                    hit_rate=self.stats['hits'] / requests_count if requests_count else 0.0,
+                    size=self.size())
+    
+    def print_report(self) -> None:
+        """Выводит статистику кэша."""
+        report = self.report()
+        print(f"Кэш {self.path}: запросов {report['requests']}, "
+              f"не изменилось (304) {report['hits']} ({report['hit_rate']:.0%}), "
+              f"загружено {report['misses']}, сэкономлено {report['bytes_saved'] / 1024:.1f} КиБ, "
+              f"вытеснено {report['evicted']}, размер {report['size'] / 1024:.1f} КиБ")
+    
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self.connection.close()
 
 
 class WikipediaAnimalsParser:
     """Парсер для получения списка животных с Wikipedia."""
     
-    def __init__(self):
-        self.base_url = "https://ru.wikipedia.org"
-        self.start_url = "https://ru.wikipedia.org/wiki/Категория:Животные_по_алфавиту"
+    def __init__(self, backend: str = 'html', base_url: str = "https://ru.wikipedia.org",
+                 cache: Optional[ResponseCache] = None, html_parser: str = 'bs4'):
+        """
+        Args:
+            backend: Способ получения списка статей (см. BACKENDS)
+            base_url: Адрес Wikipedia (для тестов - адрес локального сервера)
+            cache: Дисковый кэш ответов с условными запросами (None - без кэша)
+            html_parser: Способ разбора HTML страниц категории (см. PARSERS)
+            
+        Raises:
+            ValueError: При неизвестном backend или html_parser
+            ImportError: Если для html_parser='lxml' не установлен lxml
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+        if html_parser not in PARSERS:
+            raise ValueError(f"Unknown html_parser '{html_parser}', "
+                             f"expected one of: {', '.join(PARSERS)}")
+        if html_parser == 'lxml' and lxml is None:
+            raise ImportError("html_parser='lxml' requires lxml: pip install lxml")
+        self.backend = backend
+        self.html_parser = html_parser
+        self.base_url = base_url
+        self.category = "Категория:Животные_по_алфавиту"
+        self.start_url = f"{base_url}/wiki/{self.category}"
+        self.api_url = f"{base_url}/w/api.php"
         self.russian_alphabet = "АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ"
+        self.cache = cache
+        
+        # Пауза между запросами для вежливости к серверу, секунды
+        self.request_delay = 1.0
+        
+        # Повтор запросов при временных ошибках: количество повторов, базовая
+        # и максимальная задержка экспоненциальной выдержки, секунды
+        self.max_retries = 5
+        self.retry_backoff = 1.0
+        self.retry_max_delay = 60.0
         
         # Настройка сессии
         self.session = requests.Session()
@@ -30,21 +313,43 @@ class WikipediaAnimalsParser:
                          '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
     
-    def get_animals_count(self, max_pages: int = 50) -> Dict[str, int]:
+    def get_animals_count(self, max_pages: int = 50, checkpoint: Optional[str] = None,
+                          resume: bool = False) -> Dict[str, int]:
         """
         Получает количество животных на каждую букву алфавита.
         
         Args:
             max_pages: Максимальное количество страниц для обработки
+                (с учетом страниц, обработанных до возобновления)
+            checkpoint: Путь к файлу контрольной точки; после каждой страницы
+                в него атомарно записываются URL продолжения, количество
+                страниц и накопленные счетчики
+            resume: Продолжить обход с контрольной точки checkpoint, если
+                файл существует
             
         Returns:
             Словарь с количеством животных для каждой буквы
+            
+        Raises:
+            ValueError: Если контрольная точка создана для другого backend
         """
         animals_count = {letter: 0 for letter in self.russian_alphabet}
         
-        current_url = self.start_url
+        if self.backend == 'api':
+            current_url = self._api_page_url()
+            process_page = self._process_api_page
+        else:
+            current_url = self.start_url
+            process_page = self._process_page
         page_count = 0
         
+        if resume and checkpoint and os.path.exists(checkpoint):
+            state = self._load_checkpoint(checkpoint)
+            current_url = state['next_url']
+            page_count = state['page_count']
+            animals_count.update(state['animals_count'])
+            print(f"Продолжаем с контрольной точки {checkpoint}: обработано страниц {page_count}")
+        
         print(f"Начинаем парсинг животных с Wikipedia...")
         print(f"Максимальное количество страниц: {max_pages}")
         
@@ -52,12 +357,16 @@ class WikipediaAnimalsParser:
             print(f"Обрабатываем страницу {page_count + 1}: {current_url}")
             
             try:
-                next_url = self._process_page(current_url, animals_count)
+                next_url = process_page(current_url, animals_count)
                 current_url = next_url
                 page_count += 1
                 
+                if checkpoint:
+                    self._save_checkpoint(checkpoint, current_url, page_count, animals_count)
+                
                 # Пауза между запросами для вежливости к серверу
-                time.sleep(1)
+                if current_url:
+                    time.sleep(self.request_delay)
                 
             except Exception as e:
                 print(f"Ошибка при обработке страницы {current_url}: {e}")
@@ -66,9 +375,211 @@ class WikipediaAnimalsParser:
         total_animals = sum(animals_count.values())
         print(f"\nПарсинг завершен. Обработано страниц: {page_count}")
         print(f"Всего найдено животных: {total_animals}")
+        if self.cache is not None:
+            self.cache.print_report()
         
         return animals_count
     
+    def _save_checkpoint(self, path: str, next_url: Optional[str], page_count: int,
+                         animals_count: Dict[str, int]) -> None:
+        """
+        Атомарно записывает состояние обхода: сначала во временный файл
+        в том же каталоге, затем os.replace поверх контрольной точки, поэтому
+        при сбое на диске остается либо старое, либо новое состояние.
+        
+        Args:
+            path: Путь к файлу контрольной точки
+            next_url: URL следующей страницы (None - обход завершен)
+            page_count: Количество обработанных страниц
+            animals_count: Накопленные счетчики
+        """
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'backend': self.backend,
+            'category': self.category,
+            'next_url': next_url,
+            'page_count': page_count,
+            'animals_count': animals_count,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(state, file, ensure_ascii=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    
+    def _load_checkpoint(self, path: str) -> Dict:
+        """
+        Читает контрольную точку и проверяет, что она относится к этому обходу.
+        
+        Args:
+            path: Путь к файлу контрольной точки
+            
+        Returns:
+            Состояние с ключами next_url, page_count, animals_count
+            
+        Raises:
+            ValueError: Если формат, backend или категория не совпадают
+        """
+        with open(path, encoding='utf-8') as file:
+            state = json.load(file)
+        expected = {'version': CHECKPOINT_VERSION, 'backend': self.backend,
+                    'category': self.category}
+        for key, value in expected.items():
+            if state.get(key) != value:
+                raise ValueError(
+                    f"Checkpoint {path} does not match this crawl: "
+                    f"{key} is {state.get(key)!r}, expected {value!r}"
+                )
+        return state
+    
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Задержка перед повтором: экспоненциальная выдержка с полным
+        разбросом (full jitter), не меньше Retry-After ответа сервера.
+        
+        Args:
+            attempt: Номер неудачной попытки, начиная с 0
+            response: Ответ сервера с временной ошибкой, если он был
+            
+        Returns:
+            Задержка в секундах
+        """
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_backoff * 2 ** attempt))
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.retry_max_delay))
+        return delay
+    
+    def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Выполняет GET запрос, повторяя его при временных ошибках.
+        
+        Повторяются ошибки соединения, таймауты и ответы TRANSIENT_STATUSES,
+        не более max_retries раз с экспоненциальной выдержкой и разбросом.
+        
+        Args:
+            url: URL запроса
+            headers: Дополнительные заголовки запроса
+            
+        Returns:
+            Успешный ответ
+            
+        Raises:
+            requests.RequestException: Если запрос не удался после всех повторов
+                или сервер вернул постоянную ошибку
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, timeout=10, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"  Ошибка соединения ({e}), повтор через {delay:.1f} с")
+            else:
+                if response.status_code not in TRANSIENT_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._retry_delay(attempt, response)
+                print(f"  Ответ {response.status_code}, повтор через {delay:.1f} с")
+            time.sleep(delay)
+    
+    def _fetch(self, url: str) -> bytes:
+        """
+        Возвращает тело ответа, используя кэш и условные запросы, если кэш задан.
+        
+        Если запись кэша вытеснена между условным запросом и ответом 304,
+        запрос один раз повторяется без условных заголовков.
+        
+        Args:
+            url: URL запроса
+            
+        Returns:
+            Тело ответа (из кэша, если сервер ответил 304 Not Modified)
+            
+        Raises:
+            requests.HTTPError: Если сервер ответил 304 на безусловный запрос
+        """
+        headers = self.cache.conditional_headers(url) if self.cache is not None else {}
+        response = self._get(url, headers)
+        if response.status_code == 304 and headers:
+            content = self.cache.revalidated(url)
+            if content is not None:
+                return content
+            # Запись вытеснена между запросом и ответом - запрашиваем без условий
+            response = self._get(url)
+        if response.status_code == 304:
+            raise requests.HTTPError(f"304 Not Modified for unconditional request: {url}",
+                                     response=response)
+        if self.cache is not None:
+            self.cache.store(url, response.headers, response.content)
+        return response.content
+    
+    async def _get_async(self, http, bucket: TokenBucket, url: str,
+                         headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Выполняет GET запрос через сессию aiohttp с общим ограничителем,
+        повторяя его при временных ошибках так же, как _get.
+        
+        Args:
+            http: Сессия aiohttp
+            bucket: Общий ограничитель частоты запросов
+            url: URL запроса
+            headers: Дополнительные заголовки запроса
+            
+        Returns:
+            Статус, заголовки и тело ответа
+            
+        Raises:
+            aiohttp.ClientError: Если запрос не удался после всех повторов
+                или сервер вернул постоянную ошибку
+            asyncio.TimeoutError: Если после всех повторов истек таймаут
+        """
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                async with http.get(url, headers=headers or {}) as response:
+                    if response.status not in TRANSIENT_STATUSES or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return response.status, response.headers, await response.read()
+                delay = self._retry_delay(attempt, response)
+                print(f"  Ответ {response.status}, повтор через {delay:.1f} с")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                print(f"  Ошибка соединения ({e}), повтор через {delay:.1f} с")
+            await asyncio.sleep(delay)
+    
+    async def _fetch_async(self, http, bucket: TokenBucket, url: str) -> bytes:
+        """
+        Асинхронный аналог _fetch для сессии aiohttp с общим ограничителем.
+        
+        Raises:
+            RuntimeError: Если сервер ответил 304 на безусловный запрос
+        """
+        headers = self.cache.conditional_headers(url) if self.cache is not None else {}
+        status, response_headers, content = await self._get_async(http, bucket, url, headers)
+        if status == 304 and headers:
+            cached = self.cache.revalidated(url)
+            if cached is not None:
+                return cached
+            # Запись вытеснена между запросом и ответом - запрашиваем без условий
+            status, response_headers, content = await self._get_async(http, bucket, url)
+        if status == 304:
+            raise RuntimeError(f"304 Not Modified for unconditional request: {url}")
+        if self.cache is not None:
+            self.cache.store(url, response_headers, content)
+        return content
+    
     def _process_page(self, url: str, animals_count: Dict[str, int]) -> Optional[str]:
         """
         Обрабатывает одну страницу категории.
@@ -80,35 +591,359 @@ class WikipediaAnimalsParser:
         Returns:
             URL следующей страницы или None, если следующей страницы нет
         """
-        response = self.session.get(url, timeout=10)
-        response.raise_for_status()
+        titles, next_link = self._parse_page(self._fetch(url))
+        
+        page_animals = self._count_titles(titles, animals_count)
+        print(f"  Найдено животных на странице: {page_animals}")
+        
+        return next_link
+    
+    def _parse_page(self, content: bytes) -> Tuple[List[str], Optional[str]]:
+        """
+        Извлекает из HTML страницы категории названия статей и ссылку дальше.
+        
+        Args:
+            content: HTML страницы категории
+            
+        Returns:
+            Кортеж (названия статей, URL следующей страницы или None)
+        """
+        entries, next_url = self._parse_page_entries(content)
+        return [title for title, _ in entries], next_url
+    
+    def _parse_page_entries(self, content: bytes) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Извлекает из HTML страницы категории статьи с буквой сортировки.
+        
+        Буква сортировки - заголовок группы <h3>, под которым MediaWiki
+        выводит статью (первая буква ключа сортировки, который может не
+        совпадать с названием); без заголовков - первая буква названия.
+        
+        Args:
+            content: HTML страницы категории
+            
+        Returns:
+            Кортеж (список пар (название, буква сортировки), URL следующей
+            страницы или None)
+        """
+        if self.html_parser == 'lxml':
+            return self._parse_page_entries_lxml(content)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser')
         
         # Находим контейнер с содержимым категории
         category_content = soup.find('div', {'id': 'mw-pages'})
         if not category_content:
             print("Не найден контейнер с содержимым категории")
-            return None
+            return [], None
         
-        # Находим все ссылки на статьи в категории
-        links = category_content.find_all('a', href=True)
+        # Находим все ссылки на статьи в категории, кроме ссылок навигации
+        entries = []
+        group = None
+        for element in category_content.find_all(['h3', 'a']):
+            if element.name == 'h3':
+                group = element.get_text().strip()[:1].upper() or None
+                continue
+            title = element.get_text().strip()
+            if title and element.has_attr('href') and not NAVIGATION_LINK.search(element['href']):
+                entries.append((title, group or title[0].upper()))
         
-        page_animals = 0
-        for link in links:
-            title = link.get_text().strip()
-            if title and len(title) > 0:
+        # Ищем ссылку на следующую страницу
+        return entries, self._find_next_page_link(soup)
+    
+    def _parse_page_entries_lxml(self, content: bytes) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Быстрый вариант _parse_page_entries на lxml.
+        
+        Дерево строит libxml2, а из него за один проход по ссылкам и
+        заголовкам групп #mw-pages берутся и статьи, и ссылка на следующую
+        страницу (на страницах категорий навигация находится внутри
+        #mw-pages), без повторного поиска по всему документу.
+        
+        Args:
+            content: HTML страницы категории
+            
+        Returns:
+            Кортеж (список пар (название, буква сортировки), URL следующей
+            страницы или None)
+        """
+        containers = []
+        if content.strip():
+            # Страницы Wikipedia всегда в UTF-8, кодировку не угадываем
+            root = lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+            containers = root.xpath('//div[@id="mw-pages"]')
+        if not containers:
+            print("Не найден контейнер с содержимым категории")
+            return [], None
+        
+        entries = []
+        group = None
+        next_url = None
+        for element in containers[0].iter('h3', 'a'):
+            text = element.text_content().strip()
+            if element.tag == 'h3':
+                group = text[:1].upper() or None
+                continue
+            href = element.get('href')
+            if href is None:
+                continue
+            if not NAVIGATION_LINK.search(href):
+                if text:
+                    entries.append((text, group or text[0].upper()))
+            elif next_url is None and NEXT_PAGE_TEXT.search(text):
+                next_url = urljoin(self.base_url, href)
+        return entries, next_url
+    
+    def _count_titles(self, titles: Iterable[str], animals_count: Dict[str, int]) -> int:
+        """
+        Добавляет названия статей к счетчикам по первой букве.
+        
+        Args:
+            titles: Названия статей
+            animals_count: Словарь для накопления результатов
+            
+        Returns:
+            Количество учтенных названий (начинающихся с русской буквы)
+        """
+        counted = 0
+        for title in titles:
+            title = title.strip()
+            if title:
                 first_char = title[0].upper()
-                if first_char in self.russian_alphabet:
+                if first_char in animals_count:
                     animals_count[first_char] += 1
-                    page_animals += 1
+                    counted += 1
+        return counted
+    
+    def _api_page_url(self, continuation: Optional[Dict[str, str]] = None) -> str:
+        """
+        Формирует URL запроса list=categorymembers.
         
-        print(f"  Найдено животных на странице: {page_animals}")
+        Args:
+            continuation: Параметры продолжения из поля continue
+                предыдущего ответа (cmcontinue, continue)
+                
+        Returns:
+            URL запроса к MediaWiki API
+        """
+        params = dict(API_PARAMS, cmtitle=self.category)
+        params.update(continuation or {})
+        return f"{self.api_url}?{urlencode(params)}"
+    
+    def _process_api_page(self, url: str, animals_count: Dict[str, int]) -> Optional[str]:
+        """
+        Обрабатывает один ответ MediaWiki API со списком статей категории.
         
-        # Ищем ссылку на следующую страницу
-        next_link = self._find_next_page_link(soup)
+        Args:
+            url: URL запроса (см. _api_page_url)
+            animals_count: Словарь для накопления результатов
+            
+        Returns:
+            URL запроса следующей порции или None, если категория пройдена
+            
+        Raises:
+            RuntimeError: Если API вернул ошибку
+        """
+        titles, next_url = self._parse_api_response(json.loads(self._fetch(url)))
+        page_animals = self._count_titles(titles, animals_count)
+        print(f"  Найдено животных в ответе API: {page_animals}")
         
-        return next_link
+        return next_url
+    
+    def _parse_api_response(self, data: Dict) -> Tuple[List[str], Optional[str]]:
+        """
+        Извлекает из ответа list=categorymembers названия статей и URL продолжения.
+        
+        Args:
+            data: Разобранный JSON ответа API
+            
+        Returns:
+            Кортеж (названия статей, URL следующей порции или None)
+            
+        Raises:
+            RuntimeError: Если API вернул ошибку
+        """
+        entries, next_url = self._parse_api_entries(data)
+        return [title for title, _ in entries], next_url
+    
+    def _parse_api_entries(self, data: Dict) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """
+        Извлекает из ответа list=categorymembers статьи с буквой сортировки.
+        
+        Буква сортировки - первая буква sortkeyprefix (префикса ключа
+        сортировки, заданного через DEFAULTSORT или в ссылке на категорию),
+        а если он пуст - первая буква названия.
+        
+        Returns:
+            Кортеж (список пар (название, буква сортировки), URL следующей
+            порции или None)
+            
+        Raises:
+            RuntimeError: Если API вернул ошибку
+        """
+        if 'error' in data:
+            raise RuntimeError(f"MediaWiki API error: {data['error'].get('info', data['error'])}")
+        
+        members = data.get('query', {}).get('categorymembers', [])
+        continuation = data.get('continue')
+        next_url = self._api_page_url(continuation) if continuation else None
+        entries = [(member['title'], (member.get('sortkeyprefix') or member['title'])[:1].upper())
+                   for member in members]
+        return entries, next_url
+    
+    def _parse_entries(self, content: bytes) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Разбирает ответ сервера в соответствии с backend (см. _parse_page_entries)."""
+        if self.backend == 'api':
+            return self._parse_api_entries(json.loads(content))
+        return self._parse_page_entries(content)
+    
+    def _shard_letters(self, shards: int) -> List[str]:
+        """
+        Делит алфавит на shards непрерывных диапазонов букв примерно
+        одинакового размера.
+        """
+        shards = max(1, min(shards, len(self.russian_alphabet)))
+        size, extra = divmod(len(self.russian_alphabet), shards)
+        groups = []
+        start = 0
+        for index in range(shards):
+            end = start + size + (1 if index < extra else 0)
+            groups.append(self.russian_alphabet[start:end])
+            start = end
+        return groups
+    
+    def _shard_start_url(self, letter: str) -> str:
+        """
+        URL первой страницы категории, начиная с буквы letter.
+        
+        Диапазон первой буквы алфавита начинается с начала категории, чтобы
+        не потерять статьи с ключом сортировки до нее (латиница, цифры).
+        """
+        if letter == self.russian_alphabet[0]:
+            return self._api_page_url() if self.backend == 'api' else self.start_url
+        if self.backend == 'api':
+            return self._api_page_url({'cmstartsortkeyprefix': letter})
+        return f"{self.start_url}?{urlencode({'from': letter})}"
+    
+    async def _crawl_shard(self, http, bucket: TokenBucket, letters: str,
+                           max_pages: int) -> Dict[str, int]:
+        """
+        Последовательно обходит страницы одного диапазона букв.
+        
+        Диапазоны заданы по ключу сортировки, а не по названию: обход
+        начинается со страницы from=<первая буква> и учитывает все статьи
+        до первой, чья буква сортировки относится к следующим диапазонам.
+        Статья, ключ сортировки которой не совпадает с названием
+        (DEFAULTSORT), учитывается ровно одним диапазоном - тем, где она
+        стоит в категории.
+        
+        Args:
+            http: Сессия aiohttp
+            bucket: Общий для всех диапазонов ограничитель частоты запросов
+            letters: Буквы диапазона
+            max_pages: Максимальное количество страниц диапазона
+            
+        Returns:
+            Словарь с количеством животных для каждой буквы алфавита
+            
+        Raises:
+            aiohttp.ClientError: Если страница не загрузилась после всех повторов
+            RuntimeError: Если сервер ответил 304 на безусловный запрос
+        """
+        counts = {letter: 0 for letter in self.russian_alphabet}
+        later_letters = set(self.russian_alphabet[self.russian_alphabet.index(letters[-1]) + 1:])
+        url = self._shard_start_url(letters[0])
+        page_count = 0
+        
+        while url and page_count < max_pages:
+            try:
+                content = await self._fetch_async(http, bucket, url)
+                entries, next_url = self._parse_entries(content)
+            except Exception as e:
+                print(f"Ошибка при обработке страницы {url}: {e}")
+                raise
+            
+            page_count += 1
+            url = next_url
+            
+            # Статьи следующих диапазонов считают они сами - диапазон пройден
+            end = next((index for index, (_, sort_letter) in enumerate(entries)
+                        if sort_letter in later_letters), None)
+            self._count_titles((title for title, _ in entries[:end]), counts)
+            if end is not None:
+                break
+        
+        print(f"  Буквы {letters[0]}-{letters[-1]}: страниц {page_count}, "
+              f"животных {sum(counts.values())}")
+        return counts
+    
+    async def get_animals_count_async(self, max_pages: int = 50, shards: Optional[int] = None,
+                                      concurrency: int = 4,
+                                      rate_limit: float = 5.0) -> Dict[str, int]:
+        """
+        Асинхронно получает количество животных на каждую букву алфавита.
+        
+        Категория делится на диапазоны букв ключа сортировки, каждый из
+        которых начинается со своей страницы (параметр from=, для API -
+        cmstartsortkeyprefix) и обходится последовательно, а диапазоны
+        обходятся параллельно. Статьи учитываются по первой букве названия,
+        поэтому результат совпадает с последовательным обходом и для статей,
+        ключ сортировки которых отличается от названия.
+        Все запросы проходят через общий ограничитель частоты и общий пул
+        соединений, поэтому нагрузка на сервер остается ограниченной.
+        Временные ошибки повторяются (см. _get_async); если диапазон все же
+        не удалось пройти, остальные диапазоны отменяются, а ошибка
+        передается дальше, чтобы не вернуть заниженные счетчики.
+        
+        Args:
+            max_pages: Максимальное количество страниц в одном диапазоне
+            shards: Количество диапазонов (по умолчанию - по одному на букву)
+            concurrency: Размер пула соединений
+            rate_limit: Общее ограничение частоты запросов в секунду
+            
+        Returns:
+            Словарь с количеством животных для каждой буквы
+            
+        Raises:
+            ImportError: Если не установлен aiohttp
+            aiohttp.ClientError: Если страница диапазона не загрузилась
+                после всех повторов
+        """
+        if aiohttp is None:
+            raise ImportError("get_animals_count_async requires aiohttp: pip install aiohttp")
+        
+        letter_groups = self._shard_letters(shards or len(self.russian_alphabet))
+        bucket = TokenBucket(rate_limit)
+        
+        print(f"Начинаем асинхронный парсинг: диапазонов {len(letter_groups)}, "
+              f"соединений {concurrency}, запросов в секунду {rate_limit}")
+        
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as http:
+            tasks = [asyncio.ensure_future(self._crawl_shard(http, bucket, letters, max_pages))
+                     for letters in letter_groups]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        
+        # Диапазоны не пересекаются по ключу сортировки, поэтому счетчики складываются
+        animals_count = {letter: 0 for letter in self.russian_alphabet}
+        for counts in results:
+            for letter, count in counts.items():
+                animals_count[letter] += count
+        
+        print(f"\nПарсинг завершен. Всего найдено животных: {sum(animals_count.values())}")
+        if self.cache is not None:
+            self.cache.print_report()
+        return animals_count
     
     def _find_next_page_link(self, soup: BeautifulSoup) -> Optional[str]:
         """
@@ -121,13 +956,7 @@ class WikipediaAnimalsParser:
             URL следующей страницы или None
         """
         # Ищем ссылки на следующую страницу
-        next_patterns = [
-            r'следующие \d+',
-            r'следующая страница',
-            r'далее'
-        ]
-        
-        for pattern in next_patterns:
+        for pattern in NEXT_PAGE_PATTERNS:
             next_links = soup.find_all('a', string=re.compile(pattern, re.IGNORECASE))
             if next_links:
                 return urljoin(self.base_url, next_links[0]['href'])
@@ -191,13 +1020,42 @@ class WikipediaAnimalsParser:
                 print(f"{letter}: {count}")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Основная функция для запуска парсинга."""
-    parser = WikipediaAnimalsParser()
+    arg_parser = argparse.ArgumentParser(description="Подсчет животных по буквам алфавита")
+    arg_parser.add_argument('--backend', choices=BACKENDS, default='html',
+                            help="способ получения списка статей категории")
+    arg_parser.add_argument('--html-parser', choices=PARSERS, default='bs4',
+                            help="способ разбора HTML страниц категории (lxml быстрее)")
+    arg_parser.add_argument('--max-pages', type=int, default=30)
+    arg_parser.add_argument('--checkpoint', help="файл контрольной точки последовательного обхода")
+    arg_parser.add_argument('--resume', action='store_true',
+                            help="продолжить обход с контрольной точки --checkpoint")
+    arg_parser.add_argument('--cache', help="файл SQLite для кэша ответов с условными запросами")
+    arg_parser.add_argument('--cache-size', type=int, default=100,
+                            help="максимальный размер кэша, МиБ")
+    arg_parser.add_argument('--async', dest='use_async', action='store_true',
+                            help="параллельный обход по диапазонам букв (требуется aiohttp)")
+    arg_parser.add_argument('--shards', type=int, help="количество диапазонов букв")
+    arg_parser.add_argument('--concurrency', type=int, default=4)
+    arg_parser.add_argument('--rate', type=float, default=5.0, help="запросов в секунду")
+    args = arg_parser.parse_args(argv)
+    
+    cache = ResponseCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    parser = WikipediaAnimalsParser(backend=args.backend, cache=cache,
+                                    html_parser=args.html_parser)
     
     try:
         # Получаем данные
-        animals_count = parser.get_animals_count(max_pages=30)
+        if args.use_async:
+            animals_count = asyncio.run(parser.get_animals_count_async(
+                max_pages=args.max_pages, shards=args.shards,
+                concurrency=args.concurrency, rate_limit=args.rate,
+            ))
+        else:
+            animals_count = parser.get_animals_count(max_pages=args.max_pages,
+                                                     checkpoint=args.checkpoint,
+                                                     resume=args.resume)
         
         # Выводим статистику
         parser.print_statistics(animals_count)
@@ -213,6 +1071,9 @@ def main():
     except Exception as e:
         print(f"Критическая ошибка: {e}")
         return {}
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
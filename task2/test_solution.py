@@ -3,10 +3,224 @@
 """
 
 import pytest
+import requests
 import csv
+import json
+import asyncio
+import hashlib
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
 from unittest.mock import Mock, patch, mock_open
-from solution import WikipediaAnimalsParser
+from solution import ResponseCache, TokenBucket, WikipediaAnimalsParser
+from benchmark import find_regressions, generate_category_page, run_benchmark
+from benchmark import main as benchmark_main
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class LocalServer:
+    """
+    Локальный HTTP сервер для тестов. Ответ на GET формирует метод
+    respond(path, params); все запросы сохраняются в requests.
+    
+    Успешные ответы получают ETag (хэш тела) и Last-Modified, а условные
+    запросы с совпадающим валидатором получают 304 без тела (если
+    conditional=True); их количество хранится в not_modified.
+    """
+    
+    LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+    
+    def __init__(self):
+        self.requests = []
+        self.conditional = True
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+    
+    @property
+    def url(self):
+        """Адрес сервера вида http://127.0.0.1:port."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+    
+    def respond(self, path, params):
+        """Возвращает ответ (status, headers, body) на запрос."""
+        raise NotImplementedError
+    
+    def _handler_class(self):
+        local_server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path, params = unquote(parts.path), dict(parse_qsl(parts.query))
+                local_server.requests.append((path, params))
+                status, headers, body = local_server.respond(path, params)
+                if status == 200 and local_server.conditional:
+                    headers = dict(headers, ETag=f'"{hashlib.md5(body).hexdigest()}"',
+                                   **{'Last-Modified': local_server.LAST_MODIFIED})
+                    if_none_match = self.headers.get('If-None-Match')
+                    if (if_none_match == headers['ETag'] or if_none_match is None and
+                            self.headers.get('If-Modified-Since') == headers['Last-Modified']):
+                        local_server.not_modified += 1
+                        status, body = 304, b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                         daemon=True).start()
+        return self
+    
+    def stop(self):
+        """Останавливает сервер и освобождает порт."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class FixtureServer(LocalServer):
+    """
+    Сервер, отвечающий записанными ответами из fixtures.
+    
+    Запрос сопоставляется с записью по пути и полному набору параметров
+    строки запроса; для остальных запросов возвращается 404.
+    """
+    
+    def __init__(self, *cassettes):
+        super().__init__()
+        self.interactions = []
+        for name in cassettes:
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as file:
+                self.interactions.extend(json.load(file)['interactions'])
+    
+    def find(self, path, params):
+        """Возвращает записанный ответ для запроса или None."""
+        for interaction in self.interactions:
+            request = interaction['request']
+            if request['path'] == path and request.get('params', {}) == params:
+                return interaction['response']
+        return None
+    
+    def respond(self, path, params):
+        response = self.find(path, params)
+        if response is None:
+            return 404, {}, b"not recorded"
+        if 'json' in response:
+            body = json.dumps(response['json'], ensure_ascii=False).encode('utf-8')
+        else:
+            body = response['body'].encode('utf-8')
+        return response['status'], response['headers'], body
+
+
+CATEGORY = "Категория:Животные_по_алфавиту"
+
+CATEGORY_TITLES = sorted([
+    "Tyrannosaurus rex", "Ёж обыкновенный",
+    "Аист", "Акула", "Антилопа", "Белка", "Бобр", "Волк", "Гепард", "Дельфин", "Енот",
+    "Жираф", "Заяц", "Ибис", "Йоркширский терьер", "Кит", "Коала", "Крокодил", "Лиса",
+    "Медведь", "Носорог", "Олень", "Пингвин", "Рысь", "Слон", "Собака", "Тигр", "Утка",
+    "Фламинго", "Хорёк", "Цапля", "Черепаха", "Шакал", "Щука", "Эму", "Юрок", "Ягуар", "Як",
+])
+
+
+class CategoryServer(LocalServer):
+    """
+    Сервер, формирующий страницы категории так же, как MediaWiki:
+    статьи упорядочены по ключу сортировки (sort_keys: название -> ключ,
+    по умолчанию ключ совпадает с названием) и сгруппированы под <h3> с
+    первой буквой ключа, page_size статей на страницу, вход с любой буквы
+    через from=, навигация по pagefrom= в блоке #mw-pages.
+    """
+    
+    def __init__(self, titles=CATEGORY_TITLES, page_size=5, sort_keys=None):
+        super().__init__()
+        self.set_titles(titles, sort_keys)
+        self.page_size = page_size
+    
+    def set_titles(self, titles, sort_keys=None):
+        """Задает статьи категории и их ключи сортировки."""
+        sort_keys = sort_keys or {}
+        self.entries = sorted((sort_keys.get(title, title), title) for title in titles)
+    
+    def respond(self, path, params):
+        if path == f"/wiki/{CATEGORY}":
+            start_key = params.get('from', '')
+        elif path == "/w/index.php" and params.get('title') == CATEGORY:
+            start_key = params.get('pagefrom', '')
+        else:
+            return 404, {}, b"not found"
+        
+        start = next((i for i, (key, _) in enumerate(self.entries) if key >= start_key),
+                     len(self.entries))
+        page = self.entries[start:start + self.page_size]
+        rest = self.entries[start + self.page_size:]
+        
+        navigation = ""
+        if rest:
+            href = f"/w/index.php?{urlencode({'title': CATEGORY, 'pagefrom': rest[0][0]})}#mw-pages"
+            navigation = f'(<a href="{escape(href)}" title="{CATEGORY}">Следующая страница</a>)'
+        groups = {}
+        for key, title in page:
+            groups.setdefault(key[0].upper(), []).append(title)
+        items = "".join(
+            f'<div class="mw-category-group"><h3>{letter}</h3><ul>'
+            + "".join(f'<li><a href="/wiki/{quote(title)}" title="{title}">{title}</a></li>'
+                      for title in group)
+            + '</ul></div>'
+            for letter, group in groups.items()
+        )
+        body = (
+            '<html><body><div id="mw-content-text">'
+            '<div id="mw-pages"><h2>Страницы в категории «Животные по алфавиту»</h2>'
+            f'<p>Показано {len(page)} страниц из {len(self.entries)}.</p>{navigation}'
+            '<div lang="ru" dir="ltr" class="mw-content-ltr">'
+            f'<div class="mw-category">{items}</div>'
+            f'</div>{navigation}</div></div></body></html>'
+        )
+        return 200, {'Content-Type': 'text/html; charset=UTF-8'}, body.encode('utf-8')
+
+
+class NotModifiedServer(LocalServer):
+    """Сервер, отвечающий 304 Not Modified на любой запрос, даже безусловный."""
+    
+    def respond(self, path, params):
+        return 304, {}, b""
+
+
+async def fetch_async(parser, url):
+    """Загружает URL через _fetch_async в отдельной сессии aiohttp."""
+    import aiohttp
+    async with aiohttp.ClientSession() as http:
+        return await parser._fetch_async(http, TokenBucket(rate=1000), url)
+
+
+def expected_counts(titles, alphabet):
+    """Эталонные счетчики по первой букве названия."""
+    counts = {letter: 0 for letter in alphabet}
+    for title in titles:
+        if title[0] in counts:
+            counts[title[0]] += 1
+    return counts
 
 
 class TestWikipediaAnimalsParser:
@@ -159,6 +373,490 @@ class TestWikipediaAnimalsParser:
         assert next_link is None
 
 
+class TestApiBackend:
+    """Тесты получения списка статей через MediaWiki API."""
+    
+    def setup_method(self):
+        """Подготовка для каждого теста."""
+        self.server = FixtureServer('api_categorymembers.json').start()
+        self.parser = WikipediaAnimalsParser(backend='api', base_url=self.server.url)
+        self.parser.request_delay = 0
+    
+    def teardown_method(self):
+        """Остановка сервера."""
+        self.server.stop()
+    
+    def test_full_crawl(self):
+        """Все порции категории проходятся по токенам cmcontinue."""
+        animals_count = self.parser.get_animals_count()
+        
+        assert animals_count['А'] == 3
+        assert animals_count['Б'] == 2
+        assert animals_count['Г'] == 2
+        assert animals_count['Я'] == 2
+        # Ёж и латинское название не относятся к буквам алфавита
+        assert sum(animals_count.values()) == 17
+        
+        assert len(self.server.requests) == 3
+        assert all(params['cmlimit'] == 'max' and params['list'] == 'categorymembers'
+                   for _, params in self.server.requests)
+        assert 'cmcontinue' not in self.server.requests[0][1]
+        assert self.server.requests[2][1]['cmcontinue'] == "page|d0a8d090d09ad090d09b|4407711"
+    
+    def test_max_pages(self):
+        """Количество запросов ограничивается max_pages."""
+        animals_count = self.parser.get_animals_count(max_pages=1)
+        assert sum(animals_count.values()) == 6
+        assert len(self.server.requests) == 1
+    
+    def test_api_error(self):
+        """Ошибка API прерывает обработку с сообщением."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(
+            {'error': {'code': 'badvalue', 'info': "Bad cmtitle"}}
+        ).encode('utf-8')
+        with patch.object(self.parser.session, 'get', return_value=mock_response):
+            with pytest.raises(RuntimeError, match="Bad cmtitle"):
+                self.parser._process_api_page(self.parser._api_page_url(), {})
+    
+    def test_unknown_backend(self):
+        """Неизвестный способ получения списка отклоняется."""
+        with pytest.raises(ValueError, match="backend"):
+            WikipediaAnimalsParser(backend='scrape')
+
+
+class TestAsyncCrawler:
+    """Тесты асинхронного обхода категории по диапазонам букв."""
+    
+    def setup_method(self):
+        """Подготовка для каждого теста."""
+        self.server = CategoryServer().start()
+        self.parser = WikipediaAnimalsParser(base_url=self.server.url)
+        self.parser.request_delay = 0
+        self.parser.retry_backoff = 0
+        self.expected = expected_counts(CATEGORY_TITLES, self.parser.russian_alphabet)
+    
+    def teardown_method(self):
+        """Остановка сервера."""
+        self.server.stop()
+    
+    def test_sync_crawl_skips_navigation_links(self):
+        """Последовательный обход не считает ссылки навигации статьями."""
+        assert self.parser.get_animals_count() == self.expected
+    
+    def test_per_letter_shards(self):
+        """По одному диапазону на букву: результат совпадает с полным обходом."""
+        animals_count = asyncio.run(self.parser.get_animals_count_async(rate_limit=1000))
+        assert animals_count == self.expected
+        
+        # Первый диапазон начинается с начала категории, остальные - с from=
+        starts = [params['from'] for path, params in self.server.requests if 'from' in params]
+        assert sorted(starts) == sorted(self.parser.russian_alphabet[1:])
+    
+    @pytest.mark.parametrize('shards', [1, 3, 7])
+    def test_grouped_shards(self, shards):
+        """Диапазоны из нескольких букв обходят страницы по ссылкам pagefrom."""
+        animals_count = asyncio.run(
+            self.parser.get_animals_count_async(shards=shards, rate_limit=1000)
+        )
+        assert animals_count == self.expected
+        assert sum(1 for _, params in self.server.requests if 'from' in params) == shards - 1
+    
+    @pytest.mark.parametrize('html_parser', ['bs4', 'lxml'])
+    @pytest.mark.parametrize('shards', [3, 29])
+    def test_sort_key_differs_from_title(self, html_parser, shards):
+        """Статья с ключом сортировки не по названию учитывается ровно один раз."""
+        titles = CATEGORY_TITLES + ["Ястреб"]
+        sort_keys = {"Ястреб": "Астреб", "Акула": "Якула"}
+        with CategoryServer(titles, page_size=3, sort_keys=sort_keys) as server:
+            parser = WikipediaAnimalsParser(base_url=server.url, html_parser=html_parser)
+            parser.request_delay = 0
+            expected = expected_counts(titles, parser.russian_alphabet)
+            
+            assert parser.get_animals_count(max_pages=100) == expected
+            assert asyncio.run(
+                parser.get_animals_count_async(shards=shards, rate_limit=1000)
+            ) == expected
+        assert expected['Я'] == 3 and expected['А'] == 3
+    
+    def test_api_sort_key_prefix(self):
+        """Для API буква сортировки берется из sortkeyprefix, а при пустом - из названия."""
+        parser = WikipediaAnimalsParser(backend='api')
+        data = {'query': {'categorymembers': [
+            {'ns': 0, 'title': "Ястреб", 'sortkeyprefix': "Астреб"},
+            {'ns': 0, 'title': "Аист", 'sortkeyprefix': ""},
+        ]}}
+        assert parser._parse_api_entries(data) == ([("Ястреб", "А"), ("Аист", "А")], None)
+        assert 'sortkeyprefix' in parser._api_page_url()
+    
+    def test_shard_letters(self):
+        """Алфавит делится на непрерывные диапазоны близкого размера."""
+        groups = self.parser._shard_letters(3)
+        assert groups == ["АБВГДЕЖЗИЙ", "КЛМНОПРСТУ", "ФХЦЧШЩЭЮЯ"]
+        assert "".join(self.parser._shard_letters(100)) == self.parser.russian_alphabet
+    
+    def test_transient_errors_retried(self):
+        """Временные ошибки и разрывы соединения в диапазоне повторяются."""
+        original = self.server.respond
+        # aiohttp сам повторяет запрос после разрыва соединения один раз,
+        # поэтому до повтора в _get_async доходит только второй разрыв
+        failures = {'К': 2, 'Ф': 3}
+        
+        def flaky(path, params):
+            letter = params.get('from')
+            if failures.get(letter):
+                failures[letter] -= 1
+                if letter == 'Ф':
+                    raise ConnectionResetError("connection reset")
+                return 503, {'Retry-After': '0'}, b"overloaded"
+            return original(path, params)
+        
+        self.server.respond = flaky
+        animals_count = asyncio.run(
+            self.parser.get_animals_count_async(shards=3, rate_limit=1000)
+        )
+        assert animals_count == self.expected
+        assert failures == {'К': 0, 'Ф': 0}
+    
+    def test_failed_shard_raises(self):
+        """Ошибка диапазона после всех повторов не дает заниженных счетчиков."""
+        import aiohttp
+        original = self.server.respond
+        
+        def respond(path, params):
+            if params.get('from') == 'К':
+                return 500, {}, b"error"
+            return original(path, params)
+        
+        self.server.respond = respond
+        self.parser.max_retries = 2
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            asyncio.run(self.parser.get_animals_count_async(shards=3, rate_limit=1000))
+        assert error.value.status == 500
+        assert sum(1 for _, params in self.server.requests if params.get('from') == 'К') == 3
+    
+    def test_api_backend_shards(self):
+        """Для API диапазон начинается с cmstartsortkeyprefix."""
+        parser = WikipediaAnimalsParser(backend='api', base_url=self.server.url)
+        assert "cmstartsortkeyprefix=%D0%9A" in parser._shard_start_url('К')
+    
+    def test_token_bucket_rate(self):
+        """Общий ограничитель не пропускает больше rate запросов в секунду."""
+        async def acquire_all():
+            bucket = TokenBucket(rate=50)
+            started = time.monotonic()
+            await asyncio.gather(*(bucket.acquire() for _ in range(11)))
+            return time.monotonic() - started
+        
+        # Первый токен доступен сразу, остальные 10 - по одному за 20 мс
+        assert asyncio.run(acquire_all()) >= 0.18
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestCheckpointAndRetry:
+    """Тесты контрольных точек, возобновления обхода и повторов запросов."""
+    
+    def setup_method(self):
+        """Подготовка для каждого теста."""
+        self.server = CategoryServer().start()
+        self.parser = self._make_parser()
+        self.expected = expected_counts(CATEGORY_TITLES, self.parser.russian_alphabet)
+    
+    def teardown_method(self):
+        """Остановка сервера."""
+        self.server.stop()
+    
+    def _make_parser(self, backend='html'):
+        parser = WikipediaAnimalsParser(backend=backend, base_url=self.server.url)
+        parser.request_delay = 0
+        parser.retry_backoff = 0
+        return parser
+    
+    def test_checkpoint_and_resume(self, tmp_path):
+        """Обход продолжается со страницы, следующей за контрольной точкой."""
+        checkpoint = str(tmp_path / "crawl.json")
+        partial = self.parser.get_animals_count(max_pages=3, checkpoint=checkpoint)
+        
+        with open(checkpoint, encoding='utf-8') as file:
+            state = json.load(file)
+        assert state['page_count'] == 3
+        assert state['animals_count'] == partial
+        assert "pagefrom" in state['next_url']
+        assert os.listdir(tmp_path) == ["crawl.json"]
+        
+        requests_before = len(self.server.requests)
+        resumed = self._make_parser().get_animals_count(checkpoint=checkpoint, resume=True)
+        assert resumed == self.expected
+        
+        # Первый запрос после возобновления - страница из контрольной точки
+        first_params = self.server.requests[requests_before][1]
+        assert first_params['pagefrom'] == CATEGORY_TITLES[3 * self.server.page_size]
+        pages = (len(CATEGORY_TITLES) + self.server.page_size - 1) // self.server.page_size
+        assert len(self.server.requests) == pages
+    
+    def test_resume_after_failure(self, tmp_path):
+        """После постоянной ошибки накопленное не теряется и обход продолжается."""
+        checkpoint = str(tmp_path / "crawl.json")
+        original = self.server.respond
+        
+        def failing(path, params):
+            if params.get('pagefrom', '') >= "Л":
+                return 404, {}, b"not found"
+            return original(path, params)
+        
+        self.server.respond = failing
+        partial = self.parser.get_animals_count(checkpoint=checkpoint)
+        assert 0 < sum(partial.values()) < sum(self.expected.values())
+        
+        self.server.respond = original
+        assert self._make_parser().get_animals_count(checkpoint=checkpoint, resume=True) == self.expected
+        
+        # Завершенный обход при повторном возобновлении не делает запросов
+        requests_before = len(self.server.requests)
+        assert self._make_parser().get_animals_count(checkpoint=checkpoint, resume=True) == self.expected
+        assert len(self.server.requests) == requests_before
+    
+    def test_checkpoint_of_other_backend(self, tmp_path):
+        """Контрольная точка другого backend не используется."""
+        checkpoint = str(tmp_path / "crawl.json")
+        self.parser.get_animals_count(max_pages=1, checkpoint=checkpoint)
+        with pytest.raises(ValueError, match="backend"):
+            self._make_parser('api').get_animals_count(checkpoint=checkpoint, resume=True)
+    
+    def test_retry_transient_errors(self):
+        """Временные ошибки 503 повторяются, а не прерывают обход."""
+        original = self.server.respond
+        failures = {'left': 2}
+        
+        def flaky(path, params):
+            if 'pagefrom' in params and failures['left']:
+                failures['left'] -= 1
+                return 503, {'Retry-After': '0'}, b"overloaded"
+            return original(path, params)
+        
+        self.server.respond = flaky
+        assert self.parser.get_animals_count() == self.expected
+        assert failures['left'] == 0
+    
+    def test_retries_exhausted(self):
+        """После max_retries повторов ошибка передается дальше."""
+        self.server.respond = lambda path, params: (503, {}, b"overloaded")
+        self.parser.max_retries = 2
+        assert sum(self.parser.get_animals_count().values()) == 0
+        assert len(self.server.requests) == 3
+    
+    def test_retry_delay(self):
+        """Задержка растет экспоненциально, ограничена сверху и учитывает Retry-After."""
+        parser = WikipediaAnimalsParser()
+        parser.retry_backoff = 1.0
+        parser.retry_max_delay = 10.0
+        with patch('solution.random.uniform', side_effect=lambda low, high: high):
+            assert [parser._retry_delay(attempt) for attempt in range(5)] == [1, 2, 4, 8, 10]
+            response = Mock(headers={'Retry-After': '7'})
+            assert parser._retry_delay(0, response) == 7
+        assert 0 <= parser._retry_delay(3) <= 8
+
+
+class TestResponseCache:
+    """Тесты дискового кэша ответов с условными запросами."""
+    
+    def setup_method(self):
+        """Подготовка для каждого теста."""
+        self.server = CategoryServer().start()
+        self.expected = expected_counts(CATEGORY_TITLES, "АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЭЮЯ")
+        self.caches = []
+    
+    def teardown_method(self):
+        """Остановка сервера и закрытие кэшей."""
+        self.server.stop()
+        for cache in self.caches:
+            cache.close()
+    
+    def _make_parser(self, cache_path, backend='html', max_bytes=10 ** 6):
+        cache = ResponseCache(str(cache_path), max_bytes=max_bytes)
+        self.caches.append(cache)
+        parser = WikipediaAnimalsParser(backend=backend, base_url=self.server.url, cache=cache)
+        parser.request_delay = 0
+        return parser
+    
+    def test_second_run_revalidates(self, tmp_path, capsys):
+        """Повторный обход получает 304 и разбирает страницы с диска."""
+        cache_path = tmp_path / "cache.sqlite"
+        first = self._make_parser(cache_path)
+        assert first.get_animals_count() == self.expected
+        assert first.cache.report()['hits'] == 0
+        pages = first.cache.report()['misses']
+        
+        second = self._make_parser(cache_path)
+        assert second.get_animals_count() == self.expected
+        report = second.cache.report()
+        assert report['hits'] == report['requests'] == pages
+        assert report['misses'] == 0
+        assert report['hit_rate'] == 1.0
+        assert report['bytes_saved'] == report['size'] > 0
+        assert self.server.not_modified == pages
+        assert "не изменилось (304)" in capsys.readouterr().out
+    
+    def test_changed_page_refetched(self, tmp_path):
+        """Изменившаяся страница загружается заново и обновляется в кэше."""
+        cache_path = tmp_path / "cache.sqlite"
+        self._make_parser(cache_path).get_animals_count()
+        
+        self.server.set_titles(CATEGORY_TITLES + ["Ящерица"])
+        parser = self._make_parser(cache_path)
+        animals_count = parser.get_animals_count()
+        assert animals_count['Я'] == self.expected['Я'] + 1
+        assert parser.cache.report()['misses'] >= 1
+    
+    def test_unconditional_not_modified(self, tmp_path):
+        """Ответ 304 на безусловный запрос - ошибка, а не бесконечный повтор."""
+        with NotModifiedServer() as server:
+            url = f"{server.url}/page"
+            parser = self._make_parser(tmp_path / "cache.sqlite")
+            
+            # Ответа нет в кэше - запрос без условий, 304 на него - ошибка
+            with pytest.raises(requests.HTTPError, match="304"):
+                parser._fetch(url)
+            with pytest.raises(RuntimeError, match="304"):
+                asyncio.run(fetch_async(parser, url))
+            assert len(server.requests) == 2
+            
+            # Запись вытеснена между запросом и ответом - не больше одного повтора
+            parser.cache.store(url, {'ETag': '"old"'}, b"old")
+            with patch.object(parser.cache, 'revalidated', return_value=None):
+                with pytest.raises(requests.HTTPError, match="304"):
+                    parser._fetch(url)
+                with pytest.raises(RuntimeError, match="304"):
+                    asyncio.run(fetch_async(parser, url))
+            assert len(server.requests) == 6
+            
+            # Без кэша 304 не превращается в пустое тело
+            no_cache = WikipediaAnimalsParser(base_url=server.url)
+            with pytest.raises(requests.HTTPError, match="304"):
+                no_cache._fetch(url)
+            with pytest.raises(RuntimeError, match="304"):
+                asyncio.run(fetch_async(no_cache, url))
+    
+    def test_last_modified_only(self, tmp_path):
+        """Без ETag используется If-Modified-Since."""
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+        self.caches.append(cache)
+        cache.store("http://x/a", {'Last-Modified': LocalServer.LAST_MODIFIED}, b"body")
+        assert cache.conditional_headers("http://x/a") == {
+            'If-Modified-Since': LocalServer.LAST_MODIFIED
+        }
+        cache.store("http://x/b", {}, b"no validators")
+        assert cache.conditional_headers("http://x/b") == {}
+    
+    def test_size_bounded_eviction(self, tmp_path):
+        """При превышении размера вытесняются давно не использованные записи."""
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=250)
+        self.caches.append(cache)
+        for name in "abc":
+            cache.store(f"http://x/{name}", {'ETag': f'"{name}"'}, name.encode() * 100)
+        
+        # a вытеснена при добавлении c; b использована и переживает d
+        assert cache.revalidated("http://x/a") is None
+        assert cache.revalidated("http://x/b") == b"b" * 100
+        cache.store("http://x/d", {'ETag': '"d"'}, b"d" * 100)
+        assert cache.revalidated("http://x/c") is None
+        assert cache.revalidated("http://x/b") is not None
+        assert cache.report()['evicted'] == 2
+        assert cache.size() <= 250
+        
+        # Ответ больше всего кэша не сохраняется
+        cache.store("http://x/big", {'ETag': '"big"'}, b"x" * 1000)
+        assert cache.conditional_headers("http://x/big") == {}
+    
+    def test_api_backend_and_async(self, tmp_path):
+        """Кэш работает и для API, и для асинхронного обхода."""
+        cache_path = tmp_path / "cache.sqlite"
+        asyncio.run(self._make_parser(cache_path).get_animals_count_async(shards=3, rate_limit=1000))
+        parser = self._make_parser(cache_path)
+        assert asyncio.run(parser.get_animals_count_async(shards=3, rate_limit=1000)) == self.expected
+        assert parser.cache.report()['hit_rate'] == 1.0
+        
+        with FixtureServer('api_categorymembers.json') as api_server:
+            api = WikipediaAnimalsParser(backend='api', base_url=api_server.url,
+                                         cache=parser.cache)
+            api.request_delay = 0
+            first = api.get_animals_count()
+            assert api.get_animals_count() == first
+            assert api_server.not_modified == 3
+
+
+class TestHtmlParsers:
+    """Тесты быстрого разбора страниц на lxml и микробенчмарка."""
+    
+    def test_unknown_html_parser(self):
+        """Тест отказа при неизвестном способе разбора."""
+        with pytest.raises(ValueError, match="html_parser"):
+            WikipediaAnimalsParser(html_parser='selectolax')
+    
+    def test_generated_page_same_result(self):
+        """Тест одинакового результата bs4 и lxml на полной странице категории."""
+        content = generate_category_page(seed=3)
+        titles, next_url = WikipediaAnimalsParser(html_parser='lxml')._parse_page(content)
+        
+        assert (titles, next_url) == WikipediaAnimalsParser(html_parser='bs4')._parse_page(content)
+        assert len(titles) == 200
+        assert "pagefrom=" in next_url and next_url.startswith("https://ru.wikipedia.org/w/index.php")
+    
+    def test_last_page_and_missing_container(self, capsys):
+        """Тест последней страницы без ссылки дальше и страницы без #mw-pages."""
+        parser = WikipediaAnimalsParser(html_parser='lxml')
+        last_page = ('<div id="mw-pages"><a href="/w/index.php?pageuntil=%D0%90">Предыдущая страница</a>'
+                     '<ul><li><a href="/wiki/Ёж"><b>Ёж</b> обыкновенный</a></li></ul></div>')
+        
+        assert parser._parse_page(last_page.encode('utf-8')) == (["Ёж обыкновенный"], None)
+        assert parser._parse_page(b"<html><body></body></html>") == ([], None)
+        assert parser._parse_page(b"") == ([], None)
+        assert "Не найден контейнер" in capsys.readouterr().out
+    
+    def test_crawl_with_lxml(self):
+        """Тест полного обхода категории с разбором на lxml."""
+        with CategoryServer() as server:
+            parser = WikipediaAnimalsParser(base_url=server.url, html_parser='lxml')
+            parser.request_delay = 0
+            
+            result = parser.get_animals_count(max_pages=100)
+        
+        assert result == expected_counts(CATEGORY_TITLES, parser.russian_alphabet)
+    
+    def test_benchmark_records(self):
+        """Тест записей бенчмарка и обнаружения регрессий."""
+        pages = {'page': generate_category_page(titles_count=50)}
+        records = run_benchmark(pages, ['bs4', 'lxml'], repeat=1)
+        
+        assert [(r['parser'], r['titles']) for r in records] == [('bs4', 50), ('lxml', 50)]
+        assert all(r['peak_bytes'] > 0 for r in records)
+        assert find_regressions(records, records) == []
+    
+    def test_benchmark_regressions(self):
+        """Бенчмарк замечает замедление, другое число статей и потерю ускорения lxml."""
+        baseline = [{'page': 'p1', 'parser': 'bs4', 'titles': 200, 'seconds': 0.030},
+                    {'page': 'p1', 'parser': 'lxml', 'titles': 200, 'seconds': 0.003}]
+        current = [{'page': 'p1', 'parser': 'bs4', 'titles': 199, 'seconds': 0.030},
+                   {'page': 'p1', 'parser': 'lxml', 'titles': 200, 'seconds': 0.020}]
+        
+        regressions = find_regressions(current, baseline, tolerance=1.5, min_speedup=3)
+        assert regressions == [
+            "p1 (bs4): 199 titles, baseline found 200",
+            "p1 (lxml): parse took 20.00 ms, baseline 3.00 ms",
+            "p1: lxml is only 1.5x faster than bs4, expected at least 3.0x",
+        ]
+        assert find_regressions(baseline, min_speedup=3) == []
+    
+    def test_benchmark_main_exit_code(self, capsys):
+        """Командная строка возвращает 1, если lxml потерял ускорение."""
+        argv = ['--generate', '1', '--repeat', '1']
+        assert benchmark_main(argv + ['--min-speedup', '1000']) == 1
+        assert "Разбор страниц категории ухудшился" in capsys.readouterr().out
+        assert benchmark_main(argv + ['--min-speedup', '0']) == 0
+
+
 def run_manual_tests():
     """Запуск ручных тестов без pytest."""
     print("=== Запуск тестов для парсера животных ===")
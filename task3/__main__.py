@@ -0,0 +1,11 @@
+"""
+Запуск задачи 3 как модуля: python -m task3 compute lessons.jsonl -o results.csv
+"""
+
+import sys
+
+from task3.solution import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Бенчмарк функции appearance (Задача 3).
+
+Генерирует воспроизводимые (по seed) патологические входные данные разного
+размера и замеряет время и пиковую память для каждого движка. Результаты
+можно сохранить в JSON и сравнить с ранее сохраненным эталоном, чтобы
+поймать замедление до того, как оно попадет в ночной расчет.
+
+Запуск:
+    python benchmark.py --sizes 100 1000 10000
+    python benchmark.py --json current.json --baseline baseline.json --tolerance 1.5
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from solution import appearance, appearance_batch, np, pack_lessons
+
+
+LESSON_START = 1594702800
+LESSON_LENGTH = 3600
+
+
+def generate_reconnects(size: int, seed: int = 0) -> Dict[str, List[int]]:
+    """
+    Тысячи коротких переподключений: нестабильная связь у обоих участников.
+
+    Args:
+        size: Количество интервалов у каждого участника
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        Словарь интервалов в формате appearance
+    """
+    rng = random.Random(seed)
+    step = LESSON_LENGTH / size
+    intervals = {'lesson': [LESSON_START, LESSON_START + LESSON_LENGTH]}
+    for role in ('pupil', 'tutor'):
+        flat = []
+        for i in range(size):
+            start = LESSON_START + int(i * step) + rng.randint(0, 1)
+            flat.extend([start, start + max(int(step * rng.uniform(0.3, 0.9)), 1)])
+        intervals[role] = flat
+    return intervals
+
+
+def generate_duplicates(size: int, seed: int = 0) -> Dict[str, List[int]]:
+    """
+    Сильно перекрывающиеся и повторяющиеся интервалы, как во втором
+    предоставленном тесте: участник много раз заходит с разных устройств.
+    """
+    rng = random.Random(seed)
+    intervals = {'lesson': [LESSON_START, LESSON_START + LESSON_LENGTH]}
+    for role in ('pupil', 'tutor'):
+        flat = []
+        for _ in range(size):
+            start = LESSON_START + rng.randint(-300, LESSON_LENGTH)
+            flat.extend([start, start + rng.randint(0, LESSON_LENGTH // 2)])
+        intervals[role] = flat
+    return intervals
+
+
+def generate_outside_lesson(size: int, seed: int = 0) -> Dict[str, List[int]]:
+    """Интервалы в основном до и после урока, в урок попадает около 5%."""
+    rng = random.Random(seed)
+    intervals = {'lesson': [LESSON_START, LESSON_START + LESSON_LENGTH]}
+    for role in ('pupil', 'tutor'):
+        flat = []
+        for _ in range(size):
+            if rng.random() < 0.05:
+                start = LESSON_START + rng.randint(0, LESSON_LENGTH)
+            elif rng.random() < 0.5:
+                start = LESSON_START - rng.randint(60, 10 * LESSON_LENGTH)
+            else:
+                start = LESSON_START + LESSON_LENGTH + rng.randint(0, 10 * LESSON_LENGTH)
+            flat.extend([start, start + rng.randint(1, 60)])
+        intervals[role] = flat
+    return intervals
+
+
+GENERATORS = {
+    'reconnects': generate_reconnects,
+    'duplicates': generate_duplicates,
+    'outside': generate_outside_lesson,
+}
+
+
+def _run_batch(intervals: Dict[str, List[int]]) -> int:
+    """Движок appearance_batch для одного урока (включая упаковку)."""
+    return int(appearance_batch(**pack_lessons([intervals]))[0])
+
+
+ENGINES = {
+    'sweep': lambda intervals: appearance(intervals, engine='sweep'),
+    'naive': lambda intervals: appearance(intervals, engine='naive'),
+}
+if np is not None:
+    ENGINES['batch'] = _run_batch
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """
+    Замеряет лучшее время из repeat запусков и пиковую память одного запуска.
+
+    Returns:
+        Словарь с ключами seconds и peak_bytes
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    # Память замеряем отдельно: tracemalloc заметно замедляет выполнение
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run_benchmark(sizes: List[int], engines: List[str], generators: List[str],
+                  repeat: int = 3, naive_limit: int = 2000, seed: int = 0) -> List[Dict]:
+    """
+    Запускает бенчмарк для всех сочетаний генератора, размера и движка.
+
+    Args:
+        sizes: Количество интервалов у каждого участника
+        engines: Имена движков из ENGINES
+        generators: Имена генераторов из GENERATORS
+        repeat: Количество замеров времени
+        naive_limit: Максимальный размер для движка 'naive' (он квадратичный)
+        seed: Зерно генераторов
+
+    Returns:
+        Список записей с полями generator, size, engine, result, seconds, peak_bytes
+    """
+    records = []
+    for generator in generators:
+        for size in sizes:
+            intervals = GENERATORS[generator](size, seed)
+            for engine in engines:
+                if engine == 'naive' and size > naive_limit:
+                    continue
+                run = ENGINES[engine]
+                record = {'generator': generator, 'size': size, 'engine': engine,
+                          'result': run(intervals)}
+                record.update(measure(lambda: run(intervals), repeat=repeat))
+                records.append(record)
+    return records
+
+
+def find_regressions(records: List[Dict], baseline: List[Dict],
+                     tolerance: float = 1.5) -> List[str]:
+    """
+    Сравнивает результаты и время движков с эталоном.
+
+    Args:
+        records: Текущие результаты run_benchmark
+        baseline: Эталонные результаты run_benchmark
+        tolerance: Допустимое отношение текущего времени к эталонному
+
+    Returns:
+        Описания регрессий (пустой список, если регрессий нет)
+    """
+    expected = {(r['generator'], r['size'], r['engine']): r for r in baseline}
+    regressions = []
+    for record in records:
+        reference = expected.get((record['generator'], record['size'], record['engine']))
+        if reference is None:
+            continue
+        if record['result'] != reference['result']:
+            regressions.append(
+                f"{record['engine']}/{record['generator']}/{record['size']}: "
+                f"result {record['result']} != baseline {reference['result']}"
+            )
+        elif record['seconds'] > reference['seconds'] * tolerance:
+            regressions.append(
+                f"{record['engine']}/{record['generator']}/{record['size']}: "
+                f"{record['seconds'] * 1000:.2f} ms vs baseline {reference['seconds'] * 1000:.2f} ms"
+            )
+    return regressions
+
+
+def print_report(records: List[Dict]) -> None:
+    """Выводит результат, время и пиковую память каждого движка на каждом наборе данных."""
+    print(f"{'generator':<12} {'size':>8} {'engine':<7} {'result':>8} {'time, ms':>10} {'peak, KiB':>10}")
+    for record in records:
+        print(f"{record['generator']:<12} {record['size']:>8} {record['engine']:<7} "
+              f"{record['result']:>8} {record['seconds'] * 1000:>10.3f} "
+              f"{record['peak_bytes'] / 1024:>10.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Замеряет движки appearance и сравнивает их с эталоном.
+
+    Returns:
+        1, если какой-либо движок дал результат, отличный от --baseline,
+        или замедлился больше чем в --tolerance раз, иначе 0
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк функции appearance")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--generators', nargs='+', choices=list(GENERATORS),
+                        default=list(GENERATORS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--naive-limit', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="сохранить время и результаты движков в JSON")
+    parser.add_argument('--baseline', help="JSON с эталонными замерами движков (из --json)")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="допустимое замедление движка относительно эталона, раз")
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.sizes, args.engines, args.generators, repeat=args.repeat,
+                            naive_limit=args.naive_limit, seed=args.seed)
+    print_report(records)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(records, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = find_regressions(records, json.load(file), args.tolerance)
+        if regressions:
+            print("\nДвижки appearance разошлись с эталоном:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nРезультаты и время движков в пределах эталона")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,10 +5,391 @@
 присутствовали на уроке.
 """
 
-from typing import List, Tuple, Dict
+import argparse
+import csv
+import hashlib
+import json
+import operator
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from numbers import Integral
+from typing import Callable, List, Tuple, Dict, Iterable, Iterator, Optional, Union
 
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для пакетного API
+    np = None
 
-def appearance(intervals: Dict[str, List[int]]) -> int:
+
+# Плоский список меток [start1, end1, start2, end2, ...] в любом представлении
+IntervalData = Union[List[int], array, memoryview, 'np.ndarray']
+# Индексируемый буфер int64, с которым работает движок 'sweep'
+IntervalBuffer = Union[array, memoryview]
+# Диапазон меток, которые помещаются в буфер int64
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def parse_intervals(interval_list: List[int]) -> List[Tuple[int, int]]:
+    """
+    Преобразует список временных меток в список кортежей (начало, конец).
+    
+    Args:
+        interval_list: Список временных меток [start1, end1, start2, end2, ...]
+        
+    Returns:
+        Список кортежей [(start1, end1), (start2, end2), ...]
+    """
+    intervals = []
+    for i in range(0, len(interval_list), 2):
+        start = interval_list[i]
+        end = interval_list[i + 1]
+        intervals.append((start, end))
+    return intervals
+
+
+def intersect_intervals(intervals1: List[Tuple[int, int]], 
+                        intervals2: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Находит пересечения между двумя списками интервалов.
+    
+    Наивный алгоритм за O(n·m): сравнивает каждую пару интервалов.
+    Используется движком 'naive' как эталон для проверки движка 'sweep'.
+    
+    Args:
+        intervals1: Первый список интервалов
+        intervals2: Второй список интервалов
+        
+    Returns:
+        Список пересечений интервалов
+    """
+    intersections = []
+    
+    for start1, end1 in intervals1:
+        for start2, end2 in intervals2:
+            # Находим пересечение двух интервалов
+            intersection_start = max(start1, start2)
+            intersection_end = min(end1, end2)
+            
+            # Если пересечение существует (начало меньше конца)
+            if intersection_start < intersection_end:
+                intersections.append((intersection_start, intersection_end))
+    
+    return intersections
+
+
+def merge_overlapping_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Объединяет перекрывающиеся или касающиеся интервалы.
+    
+    Args:
+        intervals: Список интервалов для объединения
+        
+    Returns:
+        Список объединенных интервалов
+    """
+    if not intervals:
+        return []
+    
+    # Сортируем интервалы по времени начала
+    sorted_intervals = sorted(intervals)
+    merged = [sorted_intervals[0]]
+    
+    for current_start, current_end in sorted_intervals[1:]:
+        last_start, last_end = merged[-1]
+        
+        # Если интервалы перекрываются или касаются друг друга
+        if current_start <= last_end:
+            # Объединяем интервалы, расширяя конец до максимального
+            merged[-1] = (last_start, max(last_end, current_end))
+        else:
+            # Интервалы не пересекаются, добавляем новый
+            merged.append((current_start, current_end))
+    
+    return merged
+
+
+def _int64_view(values: IntervalData) -> Optional[IntervalBuffer]:
+    """Возвращает values как буфер int64 без копирования или None, если это невозможно."""
+    if isinstance(values, array) and values.typecode == 'q':
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+    if (view.ndim == 1 and view.itemsize == 8
+            and view.format in ('q', 'l') and view.c_contiguous):
+        return view if view.format == 'q' else view.cast('B').cast('q')
+    return None
+
+
+def _fits_int64(values: IntervalData) -> bool:
+    """
+    Проверяет, что метки можно без потерь записать в буфер int64.
+    
+    Проверка идет проходами на уровне C (типы, min и max), без цикла
+    Python по меткам.
+    
+    Args:
+        values: Временные метки [start1, end1, start2, end2, ...]
+        
+    Returns:
+        True, если все метки целые и лежат в диапазоне int64
+    """
+    if not isinstance(values, list) and _int64_view(values) is not None:
+        return True
+    if not all(issubclass(kind, Integral) for kind in set(map(type, values))):
+        return False
+    return len(values) == 0 or INT64_MIN <= min(values) and max(values) <= INT64_MAX
+
+
+def as_interval_buffer(values: IntervalData) -> IntervalBuffer:
+    """
+    Представляет плоский список временных меток в виде буфера int64.
+    
+    Буферы с 64-битными целыми (array('q'), memoryview, массивы numpy
+    int64) используются без копирования, остальные значения копируются
+    в array('q'). Кортежи на каждый интервал не создаются. Метки должны
+    быть целыми и лежать в диапазоне int64 (см. _fits_int64).
+    
+    Args:
+        values: Временные метки [start1, end1, start2, end2, ...]
+        
+    Returns:
+        Индексируемый буфер int64 с теми же метками
+        
+    Raises:
+        ValueError: При нечетном количестве меток
+        TypeError: Если среди меток есть нецелые значения
+        OverflowError: Если метка не помещается в int64
+    """
+    buffer = _int64_view(values)
+    if buffer is None:
+        try:
+            buffer = array('q', values)
+        except TypeError as e:
+            raise TypeError(f"Timestamps must be integers to fit an int64 buffer: {e}") from e
+        except OverflowError as e:
+            raise OverflowError(f"Timestamps must lie within the int64 range: {e}") from e
+    
+    if len(buffer) % 2:
+        raise ValueError("Interval list must contain an even number of timestamps")
+    return buffer
+
+
+def normalize_buffer(buffer: IntervalBuffer) -> array:
+    """
+    Приводит плоский буфер интервалов к нормальной форме: отсортированные,
+    непересекающиеся интервалы без интервалов нулевой длины.
+    
+    Журналы подключений обычно уже упорядочены по времени начала, поэтому
+    сортировка перестановкой индексов выполняется только при необходимости.
+    
+    Args:
+        buffer: Буфер [start1, end1, start2, end2, ...] в произвольном порядке
+        
+    Returns:
+        Буфер array('q') объединенных интервалов, отсортированных по началу
+    """
+    starts = buffer[0::2]
+    ends = buffer[1::2]
+    
+    if all(map(operator.le, starts, islice(starts, 1, None))):
+        order = range(len(starts))
+    else:
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+    
+    merged = array('q')
+    for index in order:
+        start = starts[index]
+        end = ends[index]
+        if start >= end:
+            continue
+        
+        # Перекрывающиеся и касающиеся интервалы объединяем
+        if merged and start <= merged[-1]:
+            if end > merged[-1]:
+                merged[-1] = end
+        else:
+            merged.append(start)
+            merged.append(end)
+    
+    return merged
+
+
+def intersect_sorted_buffers(buffer1: IntervalBuffer, buffer2: IntervalBuffer) -> array:
+    """
+    Находит пересечение двух нормализованных буферов интервалов
+    одним проходом двумя указателями за O(n + m).
+    
+    Args:
+        buffer1: Первый буфер (результат normalize_buffer)
+        buffer2: Второй буфер (результат normalize_buffer)
+        
+    Returns:
+        Нормализованный буфер array('q') пересечений
+    """
+    intersections = array('q')
+    i, j = 0, 0
+    
+    while i < len(buffer1) and j < len(buffer2):
+        end1 = buffer1[i + 1]
+        end2 = buffer2[j + 1]
+        
+        intersection_start = max(buffer1[i], buffer2[j])
+        intersection_end = min(end1, end2)
+        if intersection_start < intersection_end:
+            intersections.append(intersection_start)
+            intersections.append(intersection_end)
+        
+        # Сдвигаем указатель интервала, который заканчивается раньше
+        if end1 < end2:
+            i += 2
+        else:
+            j += 2
+    
+    return intersections
+
+
+def buffer_total_time(buffer: IntervalBuffer) -> int:
+    """Вычисляет общее время для плоского буфера непересекающихся интервалов."""
+    return sum(buffer[1::2]) - sum(buffer[0::2])
+
+
+def calculate_total_time(intervals: List[Tuple[int, int]]) -> int:
+    """
+    Вычисляет общее время для списка интервалов.
+    
+    Args:
+        intervals: Список интервалов
+        
+    Returns:
+        Общее время в секундах
+    """
+    return sum(end - start for start, end in intervals)
+
+
+def _interval_count(value: Union[IntervalBuffer, List[Tuple[int, int]]]) -> int:
+    """Возвращает количество интервалов в буфере или списке кортежей."""
+    if isinstance(value, (array, memoryview)):
+        return len(value) // 2
+    return len(value)
+
+
+def _stage(trace: Optional[Dict], name: str, func: Callable, *args):
+    """
+    Выполняет этап вычисления и, если передан trace, записывает в него
+    результат этапа, время выполнения и количество интервалов.
+    
+    Без trace это обычный вызов func(*args), поэтому отладочные замеры
+    ничего не стоят рабочим вызовам.
+    """
+    if trace is None:
+        return func(*args)
+    
+    started = time.perf_counter()
+    result = func(*args)
+    trace.setdefault('timings', {})[name] = time.perf_counter() - started
+    trace.setdefault('counts', {})[name] = _interval_count(result)
+    trace[name] = result
+    return result
+
+
+def _naive_appearance(intervals: Dict[str, IntervalData], trace: Optional[Dict] = None) -> int:
+    """Исходный алгоритм на вложенных циклах (эталон для тестов)."""
+    # Парсим интервалы из входных данных
+    lesson_intervals = _stage(trace, 'lesson_intervals', parse_intervals, intervals['lesson'])
+    pupil_intervals = _stage(trace, 'pupil_intervals', parse_intervals, intervals['pupil'])
+    tutor_intervals = _stage(trace, 'tutor_intervals', parse_intervals, intervals['tutor'])
+    
+    # Ограничиваем интервалы ученика и учителя временем урока
+    # (убираем время до начала и после окончания урока)
+    pupil_in_lesson = _stage(trace, 'pupil_in_lesson', intersect_intervals,
+                             pupil_intervals, lesson_intervals)
+    tutor_in_lesson = _stage(trace, 'tutor_in_lesson', intersect_intervals,
+                             tutor_intervals, lesson_intervals)
+    
+    # Находим пересечения между присутствием ученика и учителя
+    common_intervals = _stage(trace, 'common_intervals', intersect_intervals,
+                              pupil_in_lesson, tutor_in_lesson)
+    
+    # Объединяем перекрывающиеся интервалы общего присутствия
+    merged_common = _stage(trace, 'merged_common', merge_overlapping_intervals, common_intervals)
+    
+    # Вычисляем общее время присутствия
+    return calculate_total_time(merged_common)
+
+
+def _load_buffer(values: IntervalData) -> array:
+    """Загружает интервалы роли в нормализованный буфер."""
+    return normalize_buffer(as_interval_buffer(values))
+
+
+def common_presence(intervals: Dict[str, IntervalData], trace: Optional[Dict] = None) -> array:
+    """
+    Находит интервалы общего присутствия ученика и учителя на уроке.
+    
+    Args:
+        intervals: Словарь с интервалами времени (см. appearance)
+        trace: Словарь для записи промежуточных этапов (см. debug_appearance)
+        
+    Returns:
+        Нормализованный буфер array('q') [start1, end1, ...] общего присутствия
+    """
+    lesson_intervals = _stage(trace, 'lesson_intervals', _load_buffer, intervals['lesson'])
+    pupil_intervals = _stage(trace, 'pupil_intervals', _load_buffer, intervals['pupil'])
+    tutor_intervals = _stage(trace, 'tutor_intervals', _load_buffer, intervals['tutor'])
+    
+    pupil_in_lesson = _stage(trace, 'pupil_in_lesson', intersect_sorted_buffers,
+                             pupil_intervals, lesson_intervals)
+    tutor_in_lesson = _stage(trace, 'tutor_in_lesson', intersect_sorted_buffers,
+                             tutor_intervals, lesson_intervals)
+    common_intervals = _stage(trace, 'common_intervals', intersect_sorted_buffers,
+                              pupil_in_lesson, tutor_in_lesson)
+    
+    # Пересечение нормализованных буферов уже объединено, поэтому этап
+    # слияния тождественный; в trace он записывается наравне с остальными
+    if trace is not None:
+        _stage(trace, 'merged_common', lambda buffer: buffer, common_intervals)
+    return common_intervals
+
+
+def _sweep_appearance(intervals: Dict[str, IntervalData], trace: Optional[Dict] = None) -> int:
+    """
+    Нормализация интервалов и проход двумя указателями за O((n+m) log(n+m)).
+    
+    Все этапы работают с плоскими буферами array('q') без кортежей.
+    Дробные метки и целые вне диапазона int64 в такие буферы не
+    помещаются, поэтому для них используется исходный алгоритм на кортежах.
+    """
+    if not all(_fits_int64(intervals[role]) for role in ('lesson', 'pupil', 'tutor')):
+        return _naive_appearance(intervals, trace)
+    return buffer_total_time(common_presence(intervals, trace))
+
+
+ENGINES = {
+    'sweep': _sweep_appearance,
+    'naive': _naive_appearance,
+}
+
+
+def _check_engine(engine: str) -> None:
+    """Проверяет, что движок с именем engine существует."""
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}"
+        )
+
+
+def appearance(intervals: Dict[str, IntervalData], engine: str = 'sweep',
+               trace: Optional[Dict] = None) -> int:
     """
     Вычисляет время общего присутствия ученика и учителя на уроке.
     
@@ -17,180 +398,796 @@ def appearance(intervals: Dict[str, List[int]]) -> int:
             - lesson: [start, end] - время урока
             - pupil: [start1, end1, start2, end2, ...] - интервалы ученика
             - tutor: [start1, end1, start2, end2, ...] - интервалы учителя
+            Значения могут быть списками, array('q'), memoryview
+            или массивами numpy int64. Дробные метки и целые вне
+            диапазона int64 движок 'sweep' считает исходным алгоритмом
+            за O(n·m), а кэш и пакетный расчет принимают лишь int64
+        engine: Алгоритм вычисления:
+            - 'sweep' - нормализация и проход двумя указателями (по умолчанию)
+            - 'naive' - исходный алгоритм за O(n·m), эталон для проверки
+        trace: Необязательный словарь, в который записываются промежуточные
+            этапы, а также их время (timings) и размеры (counts)
     
     Returns:
         Время общего присутствия в секундах
+        
+    Raises:
+        ValueError: При неизвестном значении engine
     """
+    _check_engine(engine)
+    return ENGINES[engine](intervals, trace)
+
+
+class AppearanceCache:
+    """
+    Ограниченный LRU-кэш результатов appearance с вытеснением по времени жизни.
+    
+    Словари интервалов содержат списки и не подходят для functools.lru_cache,
+    поэтому ключом служит хэш BLAKE2b от канонического представления
+    lesson/pupil/tutor в виде int64 байтов. Одинаковые данные в списках,
+    array('q') или массивах numpy дают один и тот же ключ.
+    """
+    
+    ROLES = ('lesson', 'pupil', 'tutor')
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: Максимальное количество хранимых результатов
+            ttl: Время жизни записи в секундах; None - без ограничения
+            clock: Источник времени (для тестов)
+            
+        Raises:
+            ValueError: При неположительном maxsize
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
     
-    def parse_intervals(interval_list: List[int]) -> List[Tuple[int, int]]:
+    def _key(self, intervals: Dict[str, IntervalData], engine: str) -> bytes:
+        """Вычисляет ключ кэша по содержимому интервалов."""
+        digest = hashlib.blake2b(engine.encode(), digest_size=16)
+        for role in self.ROLES:
+            buffer = as_interval_buffer(intervals[role])
+            # Длина отделяет роли друг от друга, чтобы ключи не совпадали
+            # при переносе меток между соседними списками
+            digest.update(len(buffer).to_bytes(8, 'little'))
+            digest.update(buffer.tobytes())
+        return digest.digest()
+    
+    def appearance(self, intervals: Dict[str, IntervalData], engine: str = 'sweep') -> int:
         """
-        Преобразует список временных меток в список кортежей (начало, конец).
+        Возвращает appearance(intervals, engine) из кэша или вычисляет его.
         
         Args:
-            interval_list: Список временных меток [start1, end1, start2, end2, ...]
+            intervals: Словарь с интервалами времени (см. appearance)
+            engine: Алгоритм вычисления
             
         Returns:
-            Список кортежей [(start1, end1), (start2, end2), ...]
+            Время общего присутствия в секундах
         """
-        intervals = []
-        for i in range(0, len(interval_list), 2):
-            start = interval_list[i]
-            end = interval_list[i + 1]
-            intervals.append((start, end))
-        return intervals
+        key = self._key(intervals, engine)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at is None or self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return result
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+        
+        result = appearance(intervals, engine=engine)
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        
+        return result
+    
+    def clear(self) -> None:
+        """Очищает кэш и статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
     
-    def intersect_intervals(intervals1: List[Tuple[int, int]], 
-                          intervals2: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    def stats(self) -> Dict[str, Union[int, float]]:
         """
-        Находит пересечения между двумя списками интервалов.
+        Возвращает статистику использования кэша.
         
+        Returns:
+            Словарь с ключами hits, misses, hit_rate, evictions,
+            expirations, size, maxsize
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / requests if requests else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+class PresenceIndex:
+    """
+    Индекс интервалов общего присутствия по архиву уроков.
+    
+    Для каждого урока вычисляются объединенные интервалы, когда ученик
+    и учитель были на уроке одновременно; все интервалы хранятся в массивах
+    array('q'), отсортированных по началу. Над массивом концов построено
+    дерево максимумов, поэтому запрос "кто присутствовал в момент T" или
+    "в промежутке [start, end)" выполняется бинарным поиском по началам
+    и спуском только в поддеревья, где есть подходящий интервал:
+    O(log n + k·log(n/k)) для k найденных интервалов.
+    """
+    
+    MAGIC = b'PRESENCE-INDEX 1\n'
+    _EMPTY = -2 ** 63
+    
+    def __init__(self, starts: array, ends: array, lesson_index: array, lesson_ids: List[str]):
+        """
         Args:
-            intervals1: Первый список интервалов
-            intervals2: Второй список интервалов
+            starts: Начала интервалов, отсортированные по возрастанию
+            ends: Концы интервалов в том же порядке
+            lesson_index: Номер урока в lesson_ids для каждого интервала
+            lesson_ids: Идентификаторы уроков
+        """
+        self.starts = starts
+        self.ends = ends
+        self.lesson_index = lesson_index
+        self.lesson_ids = lesson_ids
+        self._size = 1 << max(len(starts) - 1, 0).bit_length()
+        self._tree = self._build_tree()
+    
+    def _build_tree(self) -> array:
+        """Строит дерево максимумов концов интервалов снизу вверх."""
+        tree = array('q', [self._EMPTY]) * (2 * self._size)
+        tree[self._size:self._size + len(self.ends)] = self.ends
+        for node in range(self._size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        return tree
+    
+    @classmethod
+    def build(cls, lessons: Iterable[Tuple[str, Dict[str, IntervalData]]]) -> 'PresenceIndex':
+        """
+        Строит индекс по архиву уроков.
+        
+        Args:
+            lessons: Пары (идентификатор урока, словарь интервалов),
+                например результат read_lessons
+                
+        Returns:
+            Построенный индекс
+        """
+        lesson_ids = []
+        starts, ends, lesson_index = array('q'), array('q'), array('q')
+        
+        for lesson_id, intervals in lessons:
+            common = common_presence(intervals)
+            starts.extend(common[0::2])
+            ends.extend(common[1::2])
+            lesson_index.extend([len(lesson_ids)] * (len(common) // 2))
+            lesson_ids.append(str(lesson_id))
+        
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        return cls(array('q', (starts[i] for i in order)),
+                   array('q', (ends[i] for i in order)),
+                   array('q', (lesson_index[i] for i in order)),
+                   lesson_ids)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def overlapping(self, start: int, end: int) -> List[Tuple[str, int, int]]:
+        """
+        Находит интервалы общего присутствия, пересекающиеся с [start, end).
+        
+        Args:
+            start: Начало промежутка
+            end: Конец промежутка (не включительно)
             
         Returns:
-            Список пересечений интервалов
+            Список (идентификатор урока, начало, конец), отсортированный по началу
         """
-        intersections = []
+        # Кандидаты - интервалы с началом до end, то есть префикс [0, limit)
+        limit = bisect_left(self.starts, end)
+        found = []
+        stack = [(1, 0, self._size)]
         
-        for start1, end1 in intervals1:
-            for start2, end2 in intervals2:
-                # Находим пересечение двух интервалов
-                intersection_start = max(start1, start2)
-                intersection_end = min(end1, end2)
-                
-                # Если пересечение существует (начало меньше конца)
-                if intersection_start < intersection_end:
-                    intersections.append((intersection_start, intersection_end))
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self._tree[node] <= start:
+                continue
+            if high - low == 1:
+                found.append(low)
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        
+        return [(self.lesson_ids[self.lesson_index[i]], self.starts[i], self.ends[i])
+                for i in found]
+    
+    def at(self, timestamp: int) -> List[Tuple[str, int, int]]:
+        """Находит интервалы общего присутствия, содержащие момент timestamp."""
+        return self.overlapping(timestamp, timestamp + 1)
+    
+    def lessons_between(self, start: int, end: int) -> List[str]:
+        """
+        Находит уроки, где ученик и учитель были вместе в промежутке [start, end).
+        
+        Returns:
+            Идентификаторы уроков в порядке первого общего интервала
+        """
+        return list(dict.fromkeys(lesson_id for lesson_id, _, _ in self.overlapping(start, end)))
+    
+    def save(self, path: str) -> None:
+        """
+        Сохраняет индекс в файл: заголовок JSON и массивы int64 как есть.
         
-        return intersections
+        Args:
+            path: Путь к файлу индекса
+        """
+        header = json.dumps({
+            'count': len(self.starts),
+            'byteorder': sys.byteorder,
+            'lesson_ids': self.lesson_ids,
+        }, ensure_ascii=False).encode('utf-8')
+        
+        with open(path, 'wb') as file:
+            file.write(self.MAGIC)
+            file.write(len(header).to_bytes(8, 'little'))
+            file.write(header)
+            for values in (self.starts, self.ends, self.lesson_index):
+                values.tofile(file)
     
-    def merge_overlapping_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    @classmethod
+    def load(cls, path: str) -> 'PresenceIndex':
         """
-        Объединяет перекрывающиеся или касающиеся интервалы.
+        Загружает индекс, сохраненный методом save.
         
         Args:
-            intervals: Список интервалов для объединения
+            path: Путь к файлу индекса
             
         Returns:
-            Список объединенных интервалов
+            Загруженный индекс
+            
+        Raises:
+            ValueError: Если файл не является индексом
         """
-        if not intervals:
-            return []
+        with open(path, 'rb') as file:
+            if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a presence index file")
+            header_length = int.from_bytes(file.read(8), 'little')
+            header = json.loads(file.read(header_length).decode('utf-8'))
+            
+            columns = []
+            for _ in range(3):
+                values = array('q')
+                values.fromfile(file, header['count'])
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()
+                columns.append(values)
         
-        # Сортируем интервалы по времени начала
-        sorted_intervals = sorted(intervals)
-        merged = [sorted_intervals[0]]
+        return cls(*columns, header['lesson_ids'])
+
+
+def group_appearance(lesson: IntervalData, participants: Dict[str, IntervalData],
+                     tutors: Iterable[str]) -> Dict:
+    """
+    Вычисляет присутствие на групповом уроке с произвольным числом участников.
+    
+    Все границы интервалов всех участников обрабатываются одним проходом
+    по отсортированным событиям за O(E log E). Во время прохода
+    накапливается время, когда присутствует хотя бы один учитель; время
+    участника вместе с учителями равно приросту этого счетчика между его
+    входом и выходом, поэтому ни на одном шаге не нужно перебирать участников.
+    
+    Args:
+        lesson: Время урока [start, end, ...]
+        participants: Словарь участник -> [start1, end1, start2, end2, ...]
+        tutors: Имена участников, которые являются учителями
         
-        for current_start, current_end in sorted_intervals[1:]:
-            last_start, last_end = merged[-1]
+    Returns:
+        Словарь с результатами:
+            - overlap: участник -> время присутствия вместе хотя бы с одним
+              учителем (для самого учителя - его собственное время на уроке)
+            - coverage: k -> время, когда на уроке было не менее k участников
             
-            # Если интервалы перекрываются или касаются друг друга
-            if current_start <= last_end:
-                # Объединяем интервалы, расширяя конец до максимального
-                merged[-1] = (last_start, max(last_end, current_end))
-            else:
-                # Интервалы не пересекаются, добавляем новый
-                merged.append((current_start, current_end))
+    Raises:
+        ValueError: Если учитель отсутствует в participants
+    """
+    tutors = set(tutors)
+    unknown = tutors.difference(participants)
+    if unknown:
+        raise ValueError(f"Unknown tutors: {', '.join(sorted(unknown))}")
+    
+    names = list(participants)
+    is_tutor = [name in tutors for name in names]
+    lesson_intervals = normalize_buffer(as_interval_buffer(lesson))
+    
+    # События входа (+1) и выхода (-1) по нормализованным интервалам,
+    # поэтому интервалы одного участника не перекрываются
+    events = []
+    for index, name in enumerate(names):
+        own_intervals = normalize_buffer(as_interval_buffer(participants[name]))
+        in_lesson = intersect_sorted_buffers(own_intervals, lesson_intervals)
+        for i in range(0, len(in_lesson), 2):
+            events.append((in_lesson[i], 1, index))
+            events.append((in_lesson[i + 1], -1, index))
+    events.sort()
+    
+    present_count = 0
+    tutors_present = 0
+    tutor_time = 0
+    previous_time = None
+    time_by_count = [0] * (len(names) + 1)
+    joined_at = [0] * len(names)
+    overlap = [0] * len(names)
+    
+    for moment, delta, index in events:
+        if previous_time is not None and moment > previous_time:
+            duration = moment - previous_time
+            time_by_count[present_count] += duration
+            if tutors_present:
+                tutor_time += duration
+        previous_time = moment
+        
+        present_count += delta
+        if is_tutor[index]:
+            tutors_present += delta
+        
+        if delta > 0:
+            joined_at[index] = tutor_time
+        else:
+            overlap[index] += tutor_time - joined_at[index]
+    
+    # Время "не менее k участников" - суффиксные суммы по числу присутствующих
+    coverage = {}
+    at_least = 0
+    for count in range(len(names), 0, -1):
+        at_least += time_by_count[count]
+        coverage[count] = at_least
+    
+    return {
+        'overlap': dict(zip(names, overlap)),
+        'coverage': dict(sorted(coverage.items())),
+    }
+
+
+class AppearanceAccumulator:
+    """
+    Инкрементальный расчет времени общего присутствия по потоку событий.
+    
+    События входа и выхода подаются по одному в порядке неубывания времени.
+    Для каждой роли хранится число открытых подключений (ученик может
+    зайти с нескольких устройств), а время обрезается окном урока, поэтому
+    запрос текущего значения выполняется за O(1) без пересчета с нуля.
+    """
+    
+    ROLES = ('pupil', 'tutor')
+    EVENTS = ('join', 'leave')
+    
+    def __init__(self, lesson: List[int]):
+        """
+        Args:
+            lesson: Время урока [start, end]
+            
+        Raises:
+            ValueError: Если lesson не состоит из одного окна [start, end]
+        """
+        if len(lesson) != 2:
+            raise ValueError("Lesson must be a single [start, end] window")
+        self.lesson_start, self.lesson_end = lesson
+        self._open = {role: 0 for role in self.ROLES}
+        self._last_time = None
+        self._together_since = None
+        self._total = 0
+    
+    def _clip(self, timestamp: int) -> int:
+        """Ограничивает момент времени окном урока."""
+        return min(max(timestamp, self.lesson_start), self.lesson_end)
+    
+    def is_together(self) -> bool:
+        """Возвращает True, если ученик и учитель сейчас оба подключены."""
+        return all(self._open.values())
+    
+    def feed(self, role: str, event: str, timestamp: int) -> None:
+        """
+        Обрабатывает одно событие потока.
+        
+        Args:
+            role: Роль участника ('pupil' или 'tutor')
+            event: Тип события ('join' или 'leave')
+            timestamp: Время события
+            
+        Raises:
+            ValueError: При неизвестной роли или событии, событии из прошлого
+                или выходе без предшествующего входа
+        """
+        if role not in self._open:
+            raise ValueError(f"Unknown role '{role}', expected one of: {', '.join(self.ROLES)}")
+        if event not in self.EVENTS:
+            raise ValueError(f"Unknown event '{event}', expected one of: {', '.join(self.EVENTS)}")
+        if self._last_time is not None and timestamp < self._last_time:
+            raise ValueError(
+                f"Events must be ordered by time: got {timestamp} after {self._last_time}"
+            )
+        if event == 'leave' and not self._open[role]:
+            raise ValueError(f"Role '{role}' leaves at {timestamp} without joining")
+        
+        was_together = self.is_together()
+        self._open[role] += 1 if event == 'join' else -1
+        self._last_time = timestamp
+        is_together = self.is_together()
         
-        return merged
+        if is_together and not was_together:
+            self._together_since = self._clip(timestamp)
+        elif was_together and not is_together:
+            self._total += self._clip(timestamp) - self._together_since
+            self._together_since = None
     
-    def calculate_total_time(intervals: List[Tuple[int, int]]) -> int:
+    def join(self, role: str, timestamp: int) -> None:
+        """Обрабатывает вход участника с ролью role."""
+        self.feed(role, 'join', timestamp)
+    
+    def leave(self, role: str, timestamp: int) -> None:
+        """Обрабатывает выход участника с ролью role."""
+        self.feed(role, 'leave', timestamp)
+    
+    def overlap(self, now: Optional[int] = None) -> int:
         """
-        Вычисляет общее время для списка интервалов.
+        Возвращает время общего присутствия на момент now.
         
         Args:
-            intervals: Список интервалов
+            now: Текущее время; по умолчанию - время последнего события
             
         Returns:
-            Общее время в секундах
+            Время общего присутствия в секундах
         """
-        return sum(end - start for start, end in intervals)
+        if self._together_since is None:
+            return self._total
+        if now is None:
+            now = self._last_time
+        return self._total + max(self._clip(now) - self._together_since, 0)
+
+
+def _require_numpy() -> None:
+    """Проверяет, что numpy установлен (нужен для пакетного API)."""
+    if np is None:
+        raise ImportError("appearance_batch requires numpy: pip install numpy")
+
+
+def pack_lessons(lessons: Iterable[Dict[str, List[int]]]) -> Dict[str, 'np.ndarray']:
+    """
+    Упаковывает список уроков в плоские массивы для appearance_batch.
     
-    # Парсим интервалы из входных данных
-    lesson_intervals = parse_intervals(intervals['lesson'])
-    pupil_intervals = parse_intervals(intervals['pupil'])
-    tutor_intervals = parse_intervals(intervals['tutor'])
+    Интервалы каждой роли хранятся в формате CSR: массивы начал и концов
+    всех интервалов подряд и массив смещений длины L + 1, где интервалы
+    урока i занимают срез offsets[i]:offsets[i + 1].
     
-    # Ограничиваем интервалы ученика и учителя временем урока
-    # (убираем время до начала и после окончания урока)
-    pupil_in_lesson = intersect_intervals(pupil_intervals, lesson_intervals)
-    tutor_in_lesson = intersect_intervals(tutor_intervals, lesson_intervals)
+    Args:
+        lessons: Последовательность словарей в формате appearance
+        
+    Returns:
+        Словарь с ключами lesson, pupil_starts, pupil_ends, pupil_offsets,
+        tutor_starts, tutor_ends, tutor_offsets
+        
+    Raises:
+        ValueError: Если у урока задано не одно окно [start, end]
+    """
+    _require_numpy()
     
-    # Находим п��ресечения между присутствием ученика и учителя
-    common_intervals = intersect_intervals(pupil_in_lesson, tutor_in_lesson)
+    lesson_bounds = []
+    flat = {'pupil': [], 'tutor': []}
+    offsets = {'pupil': [0], 'tutor': [0]}
     
-    # Объединяем перекрывающиеся интервалы общего присутствия
-    merged_common = merge_overlapping_intervals(common_intervals)
+    for index, intervals in enumerate(lessons):
+        if len(intervals['lesson']) != 2:
+            raise ValueError(f"Lesson {index} must have exactly one [start, end] window")
+        lesson_bounds.extend(intervals['lesson'])
+        for role in ('pupil', 'tutor'):
+            flat[role].extend(intervals[role])
+            offsets[role].append(len(flat[role]) // 2)
     
-    # Вычисляем общее время присутствия
-    return calculate_total_time(merged_common)
+    packed = {'lesson': np.array(lesson_bounds, dtype=np.int64).reshape(-1, 2)}
+    for role in ('pupil', 'tutor'):
+        bounds = np.array(flat[role], dtype=np.int64).reshape(-1, 2)
+        packed[f'{role}_starts'] = bounds[:, 0].copy()
+        packed[f'{role}_ends'] = bounds[:, 1].copy()
+        packed[f'{role}_offsets'] = np.array(offsets[role], dtype=np.int64)
+    return packed
 
 
-def debug_appearance(intervals: Dict[str, List[int]]) -> Dict:
+def _clip_to_lessons(starts, ends, offsets, lesson):
+    """
+    Обрезает интервалы роли окнами уроков и отбрасывает пустые.
+    
+    Returns:
+        Кортеж (starts, ends, lesson_ids) обрезанных интервалов
+    """
+    lesson_count = len(lesson)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    
+    if (len(offsets) != lesson_count + 1 or offsets[0] != 0
+            or offsets[-1] != len(starts) or len(starts) != len(ends)):
+        raise ValueError("Offsets must have L + 1 entries from 0 to the number of intervals")
+    
+    lesson_ids = np.repeat(np.arange(lesson_count, dtype=np.int64), np.diff(offsets))
+    clipped_starts = np.maximum(starts, lesson[lesson_ids, 0])
+    clipped_ends = np.minimum(ends, lesson[lesson_ids, 1])
+    
+    mask = clipped_starts < clipped_ends
+    return clipped_starts[mask], clipped_ends[mask], lesson_ids[mask]
+
+
+def _merge_by_lesson(starts, ends, lesson_ids, lesson):
+    """
+    Объединяет перекрывающиеся интервалы внутри каждого урока без циклов Python.
+    
+    Интервалы сортируются по (урок, начало), после чего концы переводятся
+    в общую шкалу lesson_id * span + (end - lesson_start), где каждый урок
+    занимает свой непересекающийся диапазон. Накопленный максимум по этой
+    шкале дает конец текущей объединенной группы, и новая группа начинается
+    там, где начало интервала больше всех предыдущих концов.
+    
+    Returns:
+        Кортеж (starts, ends, lesson_ids) объединенных интервалов,
+        отсортированных по уроку и времени начала
+    """
+    count = len(starts)
+    if count == 0:
+        return starts, ends, lesson_ids
+    
+    order = np.lexsort((starts, lesson_ids))
+    starts, ends, lesson_ids = starts[order], ends[order], lesson_ids[order]
+    
+    lesson_start = lesson[lesson_ids, 0]
+    span = int((lesson[:, 1] - lesson[:, 0]).max()) + 1
+    offset = lesson_ids * span - lesson_start
+    
+    running_end = np.maximum.accumulate(ends + offset)
+    new_group = np.empty(count, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] + offset[1:] > running_end[:-1]
+    
+    group_first = np.flatnonzero(new_group)
+    group_last = np.append(group_first[1:] - 1, count - 1)
+    
+    return (starts[group_first],
+            running_end[group_last] - offset[group_first],
+            lesson_ids[group_first])
+
+
+def _sum_by_lesson(starts, ends, lesson_ids, lesson_count):
+    """Суммирует длины отсортированных по уроку интервалов через cumsum."""
+    cumulative = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(ends - starts, out=cumulative[1:])
+    bounds = np.searchsorted(lesson_ids, np.arange(lesson_count + 1))
+    return cumulative[bounds[1:]] - cumulative[bounds[:-1]]
+
+
+def appearance_batch(lesson, pupil_starts, pupil_ends, pupil_offsets,
+                     tutor_starts, tutor_ends, tutor_offsets) -> 'np.ndarray':
+    """
+    Вычисляет время общего присутствия для множества уроков за один вызов.
+    
+    Все этапы (обрезка окном урока, сортировка, объединение, суммирование)
+    выполняются векторно в numpy. Время общего присутствия вычисляется
+    как |P ∩ T| = |P| + |T| - |P ∪ T| по объединенным интервалам ученика P
+    и учителя T. Входные данные удобно готовить через pack_lessons:
+    appearance_batch(**pack_lessons(lessons)).
+    
+    Args:
+        lesson: Массив формы (L, 2) с окнами уроков [start, end]
+        pupil_starts: Начала всех интервалов учеников
+        pupil_ends: Концы всех интервалов учеников
+        pupil_offsets: Смещения интервалов учеников по урокам, длина L + 1
+        tutor_starts: Начала всех интервалов учителей
+        tutor_ends: Концы всех интервалов учителей
+        tutor_offsets: Смещения интервалов учителей по урокам, длина L + 1
+        
+    Returns:
+        Массив int64 длины L со временем общего присутствия в секундах
+        
+    Raises:
+        ValueError: При несогласованных размерах массивов
+    """
+    _require_numpy()
+    
+    lesson = np.asarray(lesson, dtype=np.int64).reshape(-1, 2)
+    lesson_count = len(lesson)
+    
+    pupil = _merge_by_lesson(*_clip_to_lessons(pupil_starts, pupil_ends, pupil_offsets, lesson),
+                             lesson)
+    tutor = _merge_by_lesson(*_clip_to_lessons(tutor_starts, tutor_ends, tutor_offsets, lesson),
+                             lesson)
+    union = _merge_by_lesson(*(np.concatenate(parts) for parts in zip(pupil, tutor)), lesson)
+    
+    return (_sum_by_lesson(*pupil, lesson_count)
+            + _sum_by_lesson(*tutor, lesson_count)
+            - _sum_by_lesson(*union, lesson_count))
+
+
+def debug_appearance(intervals: Dict[str, IntervalData], engine: str = 'sweep') -> Dict:
     """
     Отладочная версия функции appearance с подробным выводом.
     
+    Выполняет тот же конвейер, что и appearance, записывая промежуточные
+    этапы с временем выполнения и количеством интервалов.
+    
     Args:
         intervals: Словарь с интервалами времени
+        engine: Алгоритм вычисления (см. appearance)
         
     Returns:
-        Словарь с результатами и промежуточными данными
-    """
-    def parse_intervals(interval_list):
-        intervals = []
-        for i in range(0, len(interval_list), 2):
-            intervals.append((interval_list[i], interval_list[i + 1]))
-        return intervals
-    
-    def intersect_intervals(intervals1, intervals2):
-        intersections = []
-        for start1, end1 in intervals1:
-            for start2, end2 in intervals2:
-                intersection_start = max(start1, start2)
-                intersection_end = min(end1, end2)
-                if intersection_start < intersection_end:
-                    intersections.append((intersection_start, intersection_end))
-        return intersections
-    
-    def merge_overlapping_intervals(intervals):
-        if not intervals:
-            return []
-        sorted_intervals = sorted(intervals)
-        merged = [sorted_intervals[0]]
-        for current_start, current_end in sorted_intervals[1:]:
-            last_start, last_end = merged[-1]
-            if current_start <= last_end:
-                merged[-1] = (last_start, max(last_end, current_end))
-            else:
-                merged.append((current_start, current_end))
-        return merged
+        Словарь с результатами и промежуточными данными: этапы в виде
+        списков кортежей (начало, конец), total_time, timings и counts
+    """
+    trace = {}
+    total_time = appearance(intervals, engine=engine, trace=trace)
+    
+    timings = trace.pop('timings')
+    counts = trace.pop('counts')
+    
+    debug_info = {}
+    for name, value in trace.items():
+        if isinstance(value, (array, memoryview)):
+            value = list(zip(value[0::2], value[1::2]))
+        debug_info[name] = value
+    debug_info['total_time'] = total_time
+    debug_info['timings'] = timings
+    debug_info['counts'] = counts
+    return debug_info
+
+
+def read_lessons(path: str) -> Iterator[Tuple[str, Dict[str, List[int]]]]:
+    """
+    Построчно читает уроки из файла JSONL или CSV, не загружая его целиком.
     
-    def calculate_total_time(intervals):
-        return sum(end - start for start, end in intervals)
+    Формат JSONL: по одному объекту на строку с полями id (необязательно),
+    lesson, pupil, tutor или с полями id и intervals. Формат CSV: заголовок
+    id,lesson,pupil,tutor, метки в ячейках разделены пробелами.
     
-    # Парсим интервалы
-    lesson_intervals = parse_intervals(intervals['lesson'])
-    pupil_intervals = parse_intervals(intervals['pupil'])
-    tutor_intervals = parse_intervals(intervals['tutor'])
+    Args:
+        path: Путь к файлу; формат определяется по расширению .csv
+        
+    Yields:
+        Пары (идентификатор урока, словарь интервалов)
+        
+    Raises:
+        ValueError: При некорректной записи (с номером строки)
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if path.endswith('.csv'):
+            for line_number, row in enumerate(csv.DictReader(file), start=2):
+                try:
+                    intervals = {role: [int(value) for value in row[role].split()]
+                                 for role in ('lesson', 'pupil', 'tutor')}
+                except (KeyError, AttributeError, ValueError) as e:
+                    raise ValueError(f"{path}:{line_number}: invalid lesson row: {e}") from e
+                yield row.get('id') or str(line_number - 1), intervals
+            return
+        
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                source = record.get('intervals', record)
+                intervals = {role: source[role] for role in ('lesson', 'pupil', 'tutor')}
+            except (KeyError, AttributeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid lesson record: {e}") from e
+            yield str(record.get('id', line_number)), intervals
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Разбивает поток на списки длиной не более size."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _appearance_chunk(chunk: List[Tuple[str, Dict[str, List[int]]]],
+                      engine: str = 'sweep') -> List[Tuple[str, int]]:
+    """Вычисляет appearance для пачки уроков (выполняется в рабочем процессе)."""
+    return [(lesson_id, appearance(intervals, engine=engine)) for lesson_id, intervals in chunk]
+
+
+def _ordered_map(executor: Executor, func: Callable, items: Iterable,
+                 max_pending: int) -> Iterator:
+    """
+    Аналог executor.map, который держит в работе не более max_pending задач.
+    
+    Executor.map сразу отправляет все задачи, то есть читает входной поток
+    целиком; здесь задачи отправляются по мере получения результатов,
+    а результаты возвращаются в порядке входных данных.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def compute_file(input_path: str, output_path: str, workers: Optional[int] = None,
+                 chunk_size: int = 1000, engine: str = 'sweep') -> int:
+    """
+    Вычисляет appearance для всех уроков файла и записывает результаты в CSV.
     
-    # Промежуточные вычисления
-    pupil_in_lesson = intersect_intervals(pupil_intervals, lesson_intervals)
-    tutor_in_lesson = intersect_intervals(tutor_intervals, lesson_intervals)
-    common_intervals = intersect_intervals(pupil_in_lesson, tutor_in_lesson)
-    merged_common = merge_overlapping_intervals(common_intervals)
-    total_time = calculate_total_time(merged_common)
+    Уроки читаются потоково и пачками по chunk_size распределяются
+    по процессам ProcessPoolExecutor; результаты записываются в порядке
+    входного файла в формате id,appearance.
     
-    return {
-        'lesson_intervals': lesson_intervals,
-        'pupil_intervals': pupil_intervals,
-        'tutor_intervals': tutor_intervals,
-        'pupil_in_lesson': pupil_in_lesson,
-        'tutor_in_lesson': tutor_in_lesson,
-        'common_intervals': common_intervals,
-        'merged_common': merged_common,
-        'total_time': total_time
-    }
+    Args:
+        input_path: Входной файл JSONL или CSV (см. read_lessons)
+        output_path: Выходной CSV файл
+        workers: Количество процессов; None - по числу ядер, 1 - без пула
+        chunk_size: Количество уроков в одной задаче
+        engine: Алгоритм appearance
+        
+    Returns:
+        Количество обработанных уроков
+        
+    Raises:
+        ValueError: При неизвестном engine, chunk_size < 1 или workers < 1
+    """
+    _check_engine(engine)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked(read_lessons(input_path), chunk_size)
+    worker = partial(_appearance_chunk, engine=engine)
+    processed = 0
+    
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.writer(output)
+        writer.writerow(['id', 'appearance'])
+        
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if executor is None:
+                results = map(worker, chunks)
+            else:
+                results = _ordered_map(executor, worker, chunks, max_pending=workers * 2)
+            
+            for rows in results:
+                writer.writerows(rows)
+                processed += len(rows)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    
+    return processed
 
 
 def run_provided_tests():
@@ -236,5 +1233,45 @@ def run_provided_tests():
     print("Проверка завершена")
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки: python -m task3 <команда>.
+    
+    Команды:
+        compute INPUT -o OUTPUT [--workers N] - массовый расчет по файлу уроков
+        test - запуск предоставленных тестовых случаев
+    """
+    parser = argparse.ArgumentParser(prog='python -m task3',
+                                     description="Расчет времени общего присутствия на уроках")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    compute = commands.add_parser('compute', help="рассчитать appearance для файла JSONL/CSV")
+    compute.add_argument('input', help="файл с уроками (.jsonl или .csv)")
+    compute.add_argument('-o', '--output', required=True, help="выходной CSV файл")
+    compute.add_argument('--workers', type=int, default=None,
+                         help="количество процессов (по умолчанию - число ядер)")
+    compute.add_argument('--chunk-size', type=int, default=1000,
+                         help="количество уроков в одной задаче")
+    compute.add_argument('--engine', choices=list(ENGINES), default='sweep')
+    
+    commands.add_parser('test', help="запустить предоставленные тесты")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'test':
+        run_provided_tests()
+        return 0
+    
+    if args.chunk_size < 1:
+        compute.error("--chunk-size must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        compute.error("--workers must be at least 1")
+    
+    processed = compute_file(args.input, args.output, workers=args.workers,
+                             chunk_size=args.chunk_size, engine=args.engine)
+    print(f"Обработано уроков: {processed}, результаты сохранены в файл: {args.output}")
+    return 0
+
+
 if __name__ == '__main__':
     run_provided_tests()
@@ -2,8 +2,17 @@
 Тесты для функции appearance (Задача 3).
 """
 
+import csv
+import json
+import random
+from array import array
+
 import pytest
-from solution import appearance, debug_appearance
+from benchmark import GENERATORS, find_regressions, run_benchmark
+from benchmark import main as benchmark_main
+from solution import (AppearanceAccumulator, AppearanceCache, PresenceIndex, appearance,
+                      appearance_batch, as_interval_buffer, common_presence, compute_file,
+                      debug_appearance, group_appearance, main, pack_lessons, read_lessons)
 
 
 class TestAppearanceFunction:
@@ -177,6 +186,551 @@ class TestAppearanceFunction:
         assert result == expected
 
 
+def _random_intervals(rng, count, low, high, max_length):
+    """Генерирует плоский список из count случайных интервалов."""
+    result = []
+    for _ in range(count):
+        start = rng.randint(low, high)
+        result.extend([start, start + rng.randint(0, max_length)])
+    return result
+
+
+class TestDebugAppearance:
+    """Тесты отладочной версии debug_appearance."""
+    
+    INTERVALS = {
+        'lesson': [100, 300],
+        'pupil': [110, 150, 140, 180, 250, 350],
+        'tutor': [50, 160, 170, 270]
+    }
+    STAGES = ['lesson_intervals', 'pupil_intervals', 'tutor_intervals', 'pupil_in_lesson',
+              'tutor_in_lesson', 'common_intervals', 'merged_common']
+    
+    @pytest.mark.parametrize('engine', ['sweep', 'naive'])
+    def test_stages_and_result(self, engine):
+        """Тест промежуточных этапов, времени и размеров."""
+        debug_info = debug_appearance(self.INTERVALS, engine=engine)
+        
+        assert debug_info['total_time'] == appearance(self.INTERVALS) == 80
+        assert debug_info['merged_common'] == [(110, 160), (170, 180), (250, 270)]
+        for stage in self.STAGES:
+            assert stage in debug_info
+        assert set(debug_info['timings']) == set(debug_info['counts']) == set(self.STAGES)
+        assert debug_info['counts']['merged_common'] == 3
+        assert debug_info['counts']['pupil_in_lesson'] == len(debug_info['pupil_in_lesson'])
+    
+    def test_trace_hook(self):
+        """Тест, что trace заполняется только по запросу."""
+        trace = {}
+        assert appearance(self.INTERVALS, trace=trace) == 80
+        assert trace['counts']['common_intervals'] == 3
+        assert all(seconds >= 0 for seconds in trace['timings'].values())
+
+
+class TestSweepEngine:
+    """Тесты движка 'sweep' против эталонного движка 'naive'."""
+    
+    def test_engines_agree_on_random_inputs(self):
+        """Свойство: оба движка дают одинаковый результат."""
+        rng = random.Random(42)
+        for _ in range(300):
+            lesson_start = rng.randint(0, 500)
+            intervals = {
+                'lesson': [lesson_start, lesson_start + rng.randint(0, 500)],
+                'pupil': _random_intervals(rng, rng.randint(0, 15), 0, 1000, 200),
+                'tutor': _random_intervals(rng, rng.randint(0, 15), 0, 1000, 200),
+            }
+            assert appearance(intervals, engine='sweep') == \
+                appearance(intervals, engine='naive'), intervals
+    
+    def test_default_engine_is_sweep(self):
+        """Тест, что по умолчанию используется движок 'sweep'."""
+        intervals = {
+            'lesson': [100, 200],
+            'pupil': [100, 150, 120, 180],
+            'tutor': [90, 210]
+        }
+        assert appearance(intervals) == appearance(intervals, engine='sweep') == 80
+    
+    def test_many_reconnects(self):
+        """Тест большого количества переподключений."""
+        intervals = {
+            'lesson': [0, 100000],
+            'pupil': [value for i in range(0, 100000, 10) for value in (i, i + 5)],
+            'tutor': [value for i in range(0, 100000, 10) for value in (i + 3, i + 8)]
+        }
+        assert appearance(intervals) == 20000
+    
+    def test_unknown_engine(self):
+        """Тест неизвестного движка."""
+        with pytest.raises(ValueError, match="Unknown engine"):
+            appearance({'lesson': [0, 1], 'pupil': [], 'tutor': []}, engine='fast')
+
+
+class TestIntervalBuffers:
+    """Тесты работы с плоскими типизированными буферами."""
+    
+    INTERVALS = {
+        'lesson': [1594702800, 1594706400],
+        'pupil': [1594702789, 1594704500, 1594702807, 1594704542, 1594704512, 1594704513,
+                  1594704564, 1594705150, 1594704581, 1594704582, 1594704734, 1594705009,
+                  1594705095, 1594705096, 1594705106, 1594706480, 1594705158, 1594705773,
+                  1594705849, 1594706480, 1594706500, 1594706875, 1594706502, 1594706503,
+                  1594706524, 1594706524, 1594706579, 1594706641],
+        'tutor': [1594700035, 1594700364, 1594702749, 1594705148, 1594705149, 1594706463]
+    }
+    
+    @pytest.mark.parametrize('engine', ['sweep', 'naive'])
+    def test_array_and_memoryview_input(self, engine):
+        """Тест входных данных в виде array('q') и memoryview."""
+        as_arrays = {key: array('q', value) for key, value in self.INTERVALS.items()}
+        as_views = {key: memoryview(value) for key, value in as_arrays.items()}
+        assert appearance(as_arrays, engine=engine) == 3577
+        assert appearance(as_views, engine=engine) == 3577
+    
+    @pytest.mark.parametrize('engine', ['sweep', 'naive'])
+    def test_numpy_input(self, engine):
+        """Тест входных данных в виде массивов numpy разных типов."""
+        np = pytest.importorskip('numpy')
+        as_int64 = {key: np.array(value, dtype=np.int64) for key, value in self.INTERVALS.items()}
+        as_uint32 = {key: np.array(value, dtype=np.uint32) for key, value in self.INTERVALS.items()}
+        assert appearance(as_int64, engine=engine) == 3577
+        assert appearance(as_uint32, engine=engine) == 3577
+    
+    def test_odd_number_of_timestamps(self):
+        """Тест списка с нечетным количеством меток."""
+        with pytest.raises(ValueError, match="even number"):
+            appearance({'lesson': [100, 200], 'pupil': [110], 'tutor': [100, 200]})
+    
+    @pytest.mark.parametrize('engine', ['sweep', 'naive'])
+    def test_float_timestamps(self, engine):
+        """Тест дробных меток: движок 'sweep' считает их исходным алгоритмом."""
+        intervals = {'lesson': [0, 10], 'pupil': [1.5, 5.0], 'tutor': [0, 10]}
+        assert appearance(intervals, engine=engine) == 3.5
+        with pytest.raises(TypeError, match="must be integers"):
+            as_interval_buffer(intervals['pupil'])
+    
+    @pytest.mark.parametrize('engine', ['sweep', 'naive'])
+    def test_timestamps_outside_int64(self, engine):
+        """Тест целых меток вне int64: движок 'sweep' считает их исходным алгоритмом."""
+        big = 2 ** 63
+        intervals = {'lesson': [0, 2 * big], 'pupil': [big - 5, big + 10], 'tutor': [big, 2 * big]}
+        assert appearance(intervals, engine=engine) == 10
+        negative = {'lesson': [-big - 10, 0], 'pupil': [-big - 10, -big + 5], 'tutor': [-big - 3, 0]}
+        assert appearance(negative, engine=engine) == 8
+        with pytest.raises(OverflowError, match="int64 range"):
+            as_interval_buffer(intervals['pupil'])
+
+
+class TestAppearanceCache:
+    """Тесты кэша AppearanceCache."""
+    
+    INTERVALS = {
+        'lesson': [1594692000, 1594695600],
+        'pupil': [1594692033, 1594696347],
+        'tutor': [1594692017, 1594692066, 1594692068, 1594696341]
+    }
+    
+    def test_hits_and_misses(self):
+        """Тест повторных запросов с тем же содержимым."""
+        cache = AppearanceCache()
+        assert cache.appearance(self.INTERVALS) == 3565
+        assert cache.appearance({key: list(value) for key, value in self.INTERVALS.items()}) == 3565
+        assert cache.appearance({key: array('q', value)
+                                 for key, value in self.INTERVALS.items()}) == 3565
+        
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
+    
+    def test_key_depends_on_roles(self):
+        """Тест, что перенос меток между ролями меняет ключ."""
+        cache = AppearanceCache()
+        assert cache.appearance({'lesson': [0, 100], 'pupil': [0, 50], 'tutor': []}) == 0
+        assert cache.appearance({'lesson': [0, 100], 'pupil': [], 'tutor': [0, 50]}) == 0
+        assert cache.stats()['misses'] == 2
+    
+    def test_lru_eviction(self):
+        """Тест вытеснения самой давно использованной записи."""
+        cache = AppearanceCache(maxsize=2)
+        lessons = [{'lesson': [0, 100], 'pupil': [0, i], 'tutor': [0, 100]} for i in (10, 20, 30)]
+        cache.appearance(lessons[0])
+        cache.appearance(lessons[1])
+        cache.appearance(lessons[0])
+        cache.appearance(lessons[2])
+        
+        assert cache.stats()['evictions'] == 1
+        assert cache.appearance(lessons[0]) == 10
+        assert cache.stats()['hits'] == 2
+    
+    def test_ttl_expiration(self):
+        """Тест вытеснения по времени жизни."""
+        now = [0.0]
+        cache = AppearanceCache(ttl=10, clock=lambda: now[0])
+        cache.appearance(self.INTERVALS)
+        now[0] = 5.0
+        cache.appearance(self.INTERVALS)
+        now[0] = 15.0
+        cache.appearance(self.INTERVALS)
+        
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 2, 1)
+
+
+class TestPresenceIndex:
+    """Тесты индекса PresenceIndex."""
+    
+    def _archive(self):
+        rng = random.Random(17)
+        archive = []
+        for index in range(100):
+            lesson_start = rng.randint(0, 5000)
+            archive.append((f'lesson-{index}', {
+                'lesson': [lesson_start, lesson_start + 600],
+                'pupil': _random_intervals(rng, 6, lesson_start - 50, lesson_start + 600, 150),
+                'tutor': _random_intervals(rng, 4, lesson_start - 50, lesson_start + 600, 300),
+            }))
+        return archive
+    
+    def _brute_force(self, archive, start, end):
+        found = []
+        for lesson_id, intervals in archive:
+            common = common_presence(intervals)
+            for i in range(0, len(common), 2):
+                if common[i] < end and common[i + 1] > start:
+                    found.append((lesson_id, common[i], common[i + 1]))
+        return sorted(found, key=lambda item: item[1])
+    
+    def test_queries_match_brute_force(self):
+        """Тест запросов против полного перебора."""
+        archive = self._archive()
+        index = PresenceIndex.build(archive)
+        rng = random.Random(19)
+        
+        for _ in range(100):
+            start = rng.randint(-100, 6000)
+            end = start + rng.randint(1, 300)
+            assert sorted(index.overlapping(start, end), key=lambda item: item[1]) == \
+                self._brute_force(archive, start, end)
+            assert sorted(index.at(start), key=lambda item: item[1]) == \
+                self._brute_force(archive, start, start + 1)
+    
+    def test_lessons_between(self):
+        """Тест поиска уроков с общим присутствием в промежутке."""
+        index = PresenceIndex.build([
+            ('a', {'lesson': [0, 100], 'pupil': [10, 50], 'tutor': [0, 100]}),
+            ('b', {'lesson': [0, 100], 'pupil': [40, 90], 'tutor': [0, 60, 70, 80]}),
+            ('c', {'lesson': [0, 100], 'pupil': [0, 100], 'tutor': []}),
+        ])
+        assert index.lessons_between(45, 75) == ['a', 'b']
+        assert index.lessons_between(60, 70) == []
+        assert index.at(75) == [('b', 70, 80)]
+    
+    def test_save_and_load(self, tmp_path):
+        """Тест сохранения и загрузки индекса."""
+        archive = self._archive()
+        index = PresenceIndex.build(archive)
+        path = str(tmp_path / 'presence.idx')
+        
+        index.save(path)
+        loaded = PresenceIndex.load(path)
+        
+        assert len(loaded) == len(index)
+        assert loaded.overlapping(1000, 2000) == index.overlapping(1000, 2000)
+    
+    def test_empty_index(self, tmp_path):
+        """Тест пустого индекса и некорректного файла."""
+        index = PresenceIndex.build([])
+        assert index.at(100) == []
+        
+        path = tmp_path / 'broken.idx'
+        path.write_bytes(b'not an index')
+        with pytest.raises(ValueError, match="not a presence index"):
+            PresenceIndex.load(str(path))
+
+
+class TestAppearanceBatch:
+    """Тесты пакетного API appearance_batch."""
+    
+    def test_batch_matches_single_calls(self):
+        """Тест совпадения с поштучными вызовами appearance."""
+        np = pytest.importorskip('numpy')
+        rng = random.Random(7)
+        lessons = []
+        for _ in range(200):
+            lesson_start = rng.randint(0, 500)
+            lessons.append({
+                'lesson': [lesson_start, lesson_start + rng.randint(0, 500)],
+                'pupil': _random_intervals(rng, rng.randint(0, 15), 0, 1000, 200),
+                'tutor': _random_intervals(rng, rng.randint(0, 15), 0, 1000, 200),
+            })
+        
+        result = appearance_batch(**pack_lessons(lessons))
+        
+        assert result.dtype == np.int64
+        assert result.tolist() == [appearance(lesson) for lesson in lessons]
+    
+    def test_batch_provided_cases(self):
+        """Тест предоставленных случаев одним вызовом."""
+        pytest.importorskip('numpy')
+        lessons = [
+            {'lesson': [1594663200, 1594666800],
+             'pupil': [1594663340, 1594663389, 1594663390, 1594663395, 1594663396, 1594666472],
+             'tutor': [1594663290, 1594663430, 1594663443, 1594666473]},
+            {'lesson': [1594692000, 1594695600],
+             'pupil': [1594692033, 1594696347],
+             'tutor': [1594692017, 1594692066, 1594692068, 1594696341]},
+            {'lesson': [100, 200], 'pupil': [], 'tutor': [110, 150]},
+        ]
+        assert appearance_batch(**pack_lessons(lessons)).tolist() == [3117, 3565, 0]
+    
+    def test_batch_invalid_offsets(self):
+        """Тест несогласованных смещений."""
+        pytest.importorskip('numpy')
+        with pytest.raises(ValueError, match="Offsets"):
+            appearance_batch([[0, 10]], [1], [5], [0, 2], [1], [5], [0, 1])
+
+
+class TestGroupAppearance:
+    """Тесты группового движка group_appearance."""
+    
+    def test_matches_appearance_for_two_participants(self):
+        """Тест совпадения с appearance для одного ученика и учителя."""
+        intervals = {
+            'lesson': [1594702800, 1594706400],
+            'pupil': [1594702789, 1594704500, 1594702807, 1594704542, 1594704512, 1594704513,
+                      1594704564, 1594705150, 1594704581, 1594704582, 1594704734, 1594705009],
+            'tutor': [1594700035, 1594700364, 1594702749, 1594705148, 1594705149, 1594706463]
+        }
+        result = group_appearance(
+            intervals['lesson'],
+            {'pupil': intervals['pupil'], 'tutor': intervals['tutor']},
+            tutors=['tutor']
+        )
+        assert result['overlap']['pupil'] == appearance(intervals)
+        assert result['coverage'][2] == appearance(intervals)
+    
+    def test_many_pupils_and_tutors(self):
+        """Тест 30 учеников и 2 учителей против попарных вызовов appearance."""
+        rng = random.Random(3)
+        lesson = [0, 3600]
+        participants = {f'tutor{i}': _random_intervals(rng, 5, -100, 3600, 900) for i in range(2)}
+        participants.update(
+            {f'pupil{i}': _random_intervals(rng, 10, -100, 3600, 400) for i in range(30)}
+        )
+        
+        result = group_appearance(lesson, participants, tutors=['tutor0', 'tutor1'])
+        
+        tutor_union = participants['tutor0'] + participants['tutor1']
+        for i in range(30):
+            expected = appearance({'lesson': lesson, 'pupil': participants[f'pupil{i}'],
+                                   'tutor': tutor_union})
+            assert result['overlap'][f'pupil{i}'] == expected
+    
+    def test_coverage(self):
+        """Тест кривой "не менее k участников" против подсчета по секундам."""
+        rng = random.Random(5)
+        lesson = [0, 500]
+        participants = {f'p{i}': _random_intervals(rng, 4, -50, 500, 150) for i in range(6)}
+        
+        result = group_appearance(lesson, participants, tutors=['p0'])
+        
+        present = [0] * 500
+        for flat in participants.values():
+            covered = set()
+            for i in range(0, len(flat), 2):
+                covered.update(range(max(flat[i], 0), min(flat[i + 1], 500)))
+            for second in covered:
+                present[second] += 1
+        for k in range(1, 7):
+            assert result['coverage'][k] == sum(1 for count in present if count >= k)
+    
+    def test_unknown_tutor(self):
+        """Тест учителя, отсутствующего среди участников."""
+        with pytest.raises(ValueError, match="Unknown tutors"):
+            group_appearance([0, 10], {'pupil': [0, 5]}, tutors=['tutor'])
+
+
+def _events_from_intervals(intervals):
+    """Превращает словарь интервалов в упорядоченный поток событий."""
+    events = []
+    for role in ('pupil', 'tutor'):
+        flat = intervals[role]
+        for i in range(0, len(flat), 2):
+            events.append((flat[i], 0, role, 'join'))
+            events.append((flat[i + 1], 1, role, 'leave'))
+    events.sort()
+    return [(role, event, timestamp) for timestamp, _, role, event in events]
+
+
+class TestAppearanceAccumulator:
+    """Тесты потокового калькулятора AppearanceAccumulator."""
+    
+    def test_stream_matches_appearance(self):
+        """Тест совпадения итога с appearance на случайных данных."""
+        rng = random.Random(11)
+        for _ in range(200):
+            lesson_start = rng.randint(0, 500)
+            intervals = {
+                'lesson': [lesson_start, lesson_start + rng.randint(0, 500)],
+                'pupil': _random_intervals(rng, rng.randint(0, 10), 0, 1000, 200),
+                'tutor': _random_intervals(rng, rng.randint(0, 10), 0, 1000, 200),
+            }
+            accumulator = AppearanceAccumulator(intervals['lesson'])
+            for role, event, timestamp in _events_from_intervals(intervals):
+                accumulator.feed(role, event, timestamp)
+            assert accumulator.overlap() == appearance(intervals), intervals
+    
+    def test_live_counter(self):
+        """Тест промежуточных значений во время урока."""
+        accumulator = AppearanceAccumulator([100, 200])
+        accumulator.join('tutor', 90)
+        accumulator.join('pupil', 120)
+        assert accumulator.overlap(now=130) == 10
+        assert accumulator.overlap(now=250) == 80
+        accumulator.leave('pupil', 150)
+        assert accumulator.overlap(now=190) == 30
+        accumulator.join('pupil', 180)
+        assert accumulator.overlap(now=185) == 35
+    
+    def test_invalid_events(self):
+        """Тест некорректных событий."""
+        accumulator = AppearanceAccumulator([100, 200])
+        accumulator.join('pupil', 150)
+        with pytest.raises(ValueError, match="ordered by time"):
+            accumulator.join('tutor', 140)
+        with pytest.raises(ValueError, match="without joining"):
+            accumulator.leave('tutor', 160)
+        with pytest.raises(ValueError, match="Unknown role"):
+            accumulator.join('parent', 160)
+
+
+class TestBulkCompute:
+    """Тесты массового расчета по файлу уроков."""
+    
+    def _write_jsonl(self, path, lessons):
+        with open(path, 'w', encoding='utf-8') as file:
+            for index, intervals in enumerate(lessons):
+                file.write(json.dumps({'id': f'lesson-{index}', 'intervals': intervals}) + '\n')
+    
+    def _read_results(self, path):
+        with open(path, newline='', encoding='utf-8') as file:
+            return list(csv.reader(file))
+    
+    def _lessons(self, count):
+        rng = random.Random(13)
+        return [{'lesson': [0, 1000],
+                 'pupil': _random_intervals(rng, 5, 0, 1000, 300),
+                 'tutor': _random_intervals(rng, 5, 0, 1000, 300)} for _ in range(count)]
+    
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_jsonl_results_in_input_order(self, tmp_path, workers):
+        """Тест порядка результатов при параллельной обработке."""
+        lessons = self._lessons(50)
+        input_path = str(tmp_path / 'lessons.jsonl')
+        output_path = str(tmp_path / 'results.csv')
+        self._write_jsonl(input_path, lessons)
+        
+        processed = compute_file(input_path, output_path, workers=workers, chunk_size=7)
+        
+        expected = [['id', 'appearance']] + [
+            [f'lesson-{index}', str(appearance(intervals))]
+            for index, intervals in enumerate(lessons)
+        ]
+        assert processed == 50
+        assert self._read_results(output_path) == expected
+    
+    def test_csv_input(self, tmp_path):
+        """Тест входного файла в формате CSV."""
+        input_path = tmp_path / 'lessons.csv'
+        input_path.write_text(
+            'id,lesson,pupil,tutor\n'
+            'a,100 200,150 250,50 175\n'
+            'b,100 200,,110 150\n',
+            encoding='utf-8'
+        )
+        
+        assert list(read_lessons(str(input_path))) == [
+            ('a', {'lesson': [100, 200], 'pupil': [150, 250], 'tutor': [50, 175]}),
+            ('b', {'lesson': [100, 200], 'pupil': [], 'tutor': [110, 150]}),
+        ]
+    
+    def test_invalid_record(self, tmp_path):
+        """Тест некорректной записи во входном файле."""
+        input_path = tmp_path / 'lessons.jsonl'
+        input_path.write_text('{"lesson": [0, 1], "pupil": []}\n', encoding='utf-8')
+        
+        with pytest.raises(ValueError, match="lessons.jsonl:1"):
+            list(read_lessons(str(input_path)))
+    
+    def test_command_line(self, tmp_path, capsys):
+        """Тест команды compute."""
+        input_path = str(tmp_path / 'lessons.jsonl')
+        output_path = str(tmp_path / 'results.csv')
+        self._write_jsonl(input_path, self._lessons(3))
+        
+        assert main(['compute', input_path, '-o', output_path, '--workers', '1']) == 0
+        assert "Обработано уроков: 3" in capsys.readouterr().out
+        assert len(self._read_results(output_path)) == 4
+    
+    @pytest.mark.parametrize('option, value', [('--chunk-size', '0'), ('--chunk-size', '-5'),
+                                               ('--workers', '0')])
+    def test_invalid_chunk_size_and_workers(self, tmp_path, capsys, option, value):
+        """Тест отказа при неположительных chunk_size и workers."""
+        input_path = str(tmp_path / 'lessons.jsonl')
+        output_path = tmp_path / 'results.csv'
+        self._write_jsonl(input_path, self._lessons(3))
+        
+        with pytest.raises(SystemExit):
+            main(['compute', input_path, '-o', str(output_path), option, value])
+        assert f"{option} must be at least 1" in capsys.readouterr().err
+        assert not output_path.exists()
+    
+    def test_compute_file_rejects_invalid_sizes(self, tmp_path):
+        """Тест ValueError при chunk_size < 1 и workers < 1."""
+        input_path = str(tmp_path / 'lessons.jsonl')
+        self._write_jsonl(input_path, self._lessons(1))
+        
+        with pytest.raises(ValueError, match="chunk_size"):
+            compute_file(input_path, str(tmp_path / 'results.csv'), workers=1, chunk_size=0)
+        with pytest.raises(ValueError, match="workers"):
+            compute_file(input_path, str(tmp_path / 'results.csv'), workers=0)
+
+
+class TestBenchmark:
+    """Тесты генераторов и сравнения результатов бенчмарка."""
+    
+    @pytest.mark.parametrize('generator', list(GENERATORS))
+    def test_generators_are_reproducible(self, generator):
+        """Тест воспроизводимости генераторов по seed."""
+        first = GENERATORS[generator](200, seed=1)
+        assert first == GENERATORS[generator](200, seed=1)
+        assert len(first['pupil']) == len(first['tutor']) == 400
+        assert appearance(first, engine='sweep') == appearance(first, engine='naive')
+    
+    def test_regression_detection(self):
+        """Тест обнаружения замедления и расхождения результатов."""
+        records = run_benchmark([50], ['sweep'], ['reconnects'], repeat=1)
+        assert find_regressions(records, records) == []
+        
+        slower = [dict(records[0], seconds=records[0]['seconds'] * 2)]
+        wrong = [dict(records[0], result=records[0]['result'] + 1)]
+        assert len(find_regressions(slower, records, tolerance=1.5)) == 1
+        assert "result" in find_regressions(wrong, records)[0]
+    
+    def test_main_exit_code(self, tmp_path, capsys):
+        """Командная строка возвращает 1, если движок разошелся с эталоном."""
+        baseline = str(tmp_path / "baseline.json")
+        argv = ['--sizes', '50', '--engines', 'sweep', '--generators', 'reconnects',
+                '--repeat', '1']
+        assert benchmark_main(argv + ['--json', baseline]) == 0
+        with open(baseline, encoding='utf-8') as file:
+            records = json.load(file)
+        with open(baseline, 'w', encoding='utf-8') as file:
+            json.dump([dict(records[0], result=records[0]['result'] + 1)], file)
+        assert benchmark_main(argv + ['--baseline', baseline]) == 1
+        assert "Движки appearance разошлись с эталоном" in capsys.readouterr().out
+
+
 def run_manual_tests():
     """Запуск ручных тестов без pytest."""
     print("=== Запуск тестов для функции appearance ===")